@@ -1,8 +1,12 @@
+import argparse
 import pandas as pd
 import random
 from datetime import datetime, timedelta
 import numpy as np
 from faker import Faker
+from geo import em_zona, em_zonas
+from dados_asa_sul import (adicionar_pii, colunas_pii, colunas_saida, data_fim, data_inicio, gerar_pool_pii,
+                            sortear_categorias, sortear_enderecos, tabela_enderecos, tipos_dia)
 
 fake = Faker('pt_BR')
 
@@ -163,109 +167,220 @@ pesos_tipos = {
     'feriado': [20, 15, 20, 25, 15, 5]
 }
 
-# Geração dos dados
-num_registros = 30000
-data = []
-for _ in range(num_registros):
-    data_hora = random_datetime()
-    data_str = data_hora.strftime('%Y-%m-%d')
-    hora = data_hora.hour
-
-    # Tipo de dia
-    if data_hora.weekday() in [4, 5]:
-        tipo_dia = 'final_semana'
-    elif data_str in feriados:
-        tipo_dia = 'feriado'
-    else:
-        tipo_dia = 'dia_normal'
+# Geração dos dados (linha a linha)
+def gerar_registros(num_registros):
+    data = []
+    for _ in range(num_registros):
+        data_hora = random_datetime()
+        data_str = data_hora.strftime('%Y-%m-%d')
+        hora = data_hora.hour
 
-    # Escolher tipo de crime com base no tipo de dia
-    base_pesos = pesos_tipos[tipo_dia]
-    tipo = random.choices(tipos_crime, weights=base_pesos, k=1)[0]
+        # Tipo de dia
+        if data_hora.weekday() in [4, 5]:
+            tipo_dia = 'final_semana'
+        elif data_str in feriados:
+            tipo_dia = 'feriado'
+        else:
+            tipo_dia = 'dia_normal'
 
-    # Priorizar região com base no tipo de crime
-    regioes_prioritarias = crimes_regioes_prioritarias.get(tipo, list(setores_asa_sul.keys()))
-    via_aleatoria = random.choice(regioes_prioritarias)
+        # Escolher tipo de crime com base no tipo de dia
+        base_pesos = pesos_tipos[tipo_dia]
+        tipo = random.choices(tipos_crime, weights=base_pesos, k=1)[0]
 
-    # Reforço noturno: aumentar chance de crime em regiões prioritárias
-    if 21 <= hora or hora <= 3:
-        regioes_prioritarias = crimes_regioes_prioritarias.get(tipo, list(setores_asa_sul.keys())) * 3 + list(setores_asa_sul.keys())
+        # Priorizar região com base no tipo de crime
+        regioes_prioritarias = crimes_regioes_prioritarias.get(tipo, list(setores_asa_sul.keys()))
         via_aleatoria = random.choice(regioes_prioritarias)
 
-    # Gerar coordenadas
-    lat_base, lon_base = random.choice(setores_asa_sul[via_aleatoria])
-    lat, lon = gerar_variacao(lat_base, lon_base)
+        # Reforço noturno: aumentar chance de crime em regiões prioritárias
+        if 21 <= hora or hora <= 3:
+            regioes_prioritarias = crimes_regioes_prioritarias.get(tipo, list(setores_asa_sul.keys())) * 3 + list(setores_asa_sul.keys())
+            via_aleatoria = random.choice(regioes_prioritarias)
 
-    # Verificar zonas proibidas
-    tentativas = 0
-    while tentativas < 10:
-        tentativas += 1
+        # Gerar coordenadas
         lat_base, lon_base = random.choice(setores_asa_sul[via_aleatoria])
         lat, lon = gerar_variacao(lat_base, lon_base)
-        proibido = False
-        for (lat_p, lon_p, raio) in zonas_proibidas:
-            distancia = ((lat - lat_p)**2 + (lon - lon_p)**2)**0.5
-            if distancia < raio:
-                proibido = True
+
+        # Verificar zonas proibidas
+        tentativas = 0
+        while tentativas < 10:
+            tentativas += 1
+            lat_base, lon_base = random.choice(setores_asa_sul[via_aleatoria])
+            lat, lon = gerar_variacao(lat_base, lon_base)
+            proibido = em_zona(lat, lon, zonas_proibidas)
+            if not proibido:
                 break
-        if not proibido:
+
+        # Obter peso da região e ajustar tipo de crime
+        regiao_pesos = crime_pesos_por_regiao.get(via_aleatoria, [1] * 6)
+        combined_pesos = [b * r for b, r in zip(base_pesos, regiao_pesos)]
+        tipo = random.choices(tipos_crime, weights=combined_pesos, k=1)[0]
+
+        # Gerar idade
+        idade = gerar_idade(via_aleatoria, tipo)
+
+        # Gerar endereço
+        formato = random.choice(enderecos_asa_sul)
+        if "{bloco}" in formato:
+            endereco = formato.format(rua=via_aleatoria, bloco=random.choice(blocos), num=random.randint(100, 999))
+        elif "{lote}" in formato:
+            endereco = formato.format(rua=via_aleatoria, lote=random.choice(lotes), sala=random.choice(salas))
+        elif "{edificio}" in formato:
+            endereco = formato.format(rua=via_aleatoria, edificio=random.choice(edificios), unidade=random.choice(unidades))
+
+        # Gerar outros dados
+        nome = fake.name()
+        cpf_formatado = fake.cpf()
+        email = fake.email()
+        telefone = fake.phone_number()
+
+        # Inserir NaN esporadicamente
+        if random.random() < 0.03: nome = np.nan
+        if random.random() < 0.08: idade = np.nan
+        if random.random() < 0.01: tipo = np.nan
+        if random.random() < 0.2: email = np.nan
+        if random.random() < 0.07: telefone = np.nan
+        if random.random() < 0.09: endereco = np.nan
+
+        risco = risco_mapa.get(via_aleatoria, 2)
+
+        data.append({
+            'latitude': lat,
+            'longitude': lon,
+            'data': data_str,
+            'hora': data_hora.strftime('%H:%M'),
+            'tipo_crime': tipo,
+            'bairro': 'Asa Sul',
+            'rua': via_aleatoria,
+            'tipo_dia': tipo_dia,
+            'ano': data_hora.year,
+            'nome': nome,
+            'cpf': cpf_formatado,
+            'idade': idade,
+            'email': email,
+            'telefone': telefone,
+            'endereco': endereco,
+            'risco': risco
+        })
+
+    return data
+
+# Modo em lote (vetorizado), com as mesmas regras de gerar_registros.
+# Reaproveita os utilitários do gerador da Asa Sul (dados_asa_sul.py).
+setores_lista = list(setores_asa_sul.keys())
+padroes_idade = {
+    "W3 Sul": {"idade_min": 14, "idade_max": 25, "crimes": ["tráfico", "homicídio"]},
+    "W5 Sul": {"idade_min": 14, "idade_max": 30, "crimes": ["tráfico", "roubo"]},
+    "Eixo L Sul": {"idade_min": 50, "idade_max": 70, "crimes": ["furto", "vandalismo"]},
+    "L2 Sul": {"idade_min": 20, "idade_max": 40, "crimes": ["homicídio", "roubo"]},
+    "Novo Setor 1": {"idade_min": 14, "idade_max": 25, "crimes": ["roubo", "vandalismo"]}
+}
+
+def gerar_lote(num_registros, seed=None, pii=True, pool_pii=None):
+    rng = np.random.default_rng(seed)
+    n = num_registros
+    n_setores = len(setores_lista)
+
+    # Data e hora
+    total_dias = (data_fim - data_inicio).astype(int) + 1
+    dias = rng.integers(0, total_dias, n)
+    horas = np.trunc(rng.normal(23, 5, n)).astype(np.int64) % 24
+    minutos = rng.integers(0, 60, n)
+    datas_texto = np.datetime_as_string(data_inicio + np.arange(total_dias))
+    dia_semana = ((data_inicio + dias).astype(np.int64) + 3) % 7  # 1970-01-01 foi quinta-feira
+    feriado = np.isin(datas_texto, feriados)[dias]  # comparação por texto, como no laço
+    tipo_dia = np.where(np.isin(dia_semana, [4, 5]), 1, np.where(feriado, 2, 0))
+
+    # Tipo inicial e região priorizada (de dia e com reforço noturno)
+    pesos_dia = np.array([pesos_tipos[t] for t in tipos_dia])
+    tipo_inicial = sortear_categorias(rng, pesos_dia, tipo_dia)
+    prior_dia = np.array([[crimes_regioes_prioritarias[t].count(s) for s in setores_lista] for t in tipos_crime])
+    prior_noite = prior_dia * 3 + 1
+    noite = (horas >= 21) | (horas <= 3)
+    rua = sortear_categorias(rng, np.concatenate([prior_dia, prior_noite]), tipo_inicial + noite * len(tipos_crime))
+
+    # Coordenadas: até 10 tentativas fora das zonas proibidas (a última é mantida)
+    pontos = np.concatenate([np.array(setores_asa_sul[s]) for s in setores_lista])
+    n_pontos = np.array([len(setores_asa_sul[s]) for s in setores_lista])
+    inicio_pontos = np.concatenate([[0], np.cumsum(n_pontos)[:-1]])
+    lat = np.empty(n)
+    lon = np.empty(n)
+    pendentes = np.arange(n)
+    for _ in range(10):
+        if len(pendentes) == 0:
             break
+        r = rua[pendentes]
+        k = inicio_pontos[r] + (rng.random(len(pendentes)) * n_pontos[r]).astype(np.int64)
+        lat[pendentes] = pontos[k, 0] + rng.uniform(-0.005, 0.005, len(pendentes))
+        lon[pendentes] = pontos[k, 1] + rng.uniform(-0.005, 0.005, len(pendentes))
+        pendentes = pendentes[em_zonas(lat[pendentes], lon[pendentes], zonas_proibidas)]
+
+    # Tipo final com pesos do dia × pesos da região
+    pesos_regiao = np.array([crime_pesos_por_regiao.get(s, [1] * 6) for s in setores_lista])
+    combinados = (pesos_dia[:, None, :] * pesos_regiao[None, :, :]).reshape(-1, len(tipos_crime))
+    tipo = sortear_categorias(rng, combinados, tipo_dia * n_setores + rua)
+
+    # Idade (mesma regra de gerar_idade)
+    prioritario = np.array([[t in padroes_idade[s]["crimes"] for t in tipos_crime] for s in setores_lista])
+    idade_min = np.array([padroes_idade[s]["idade_min"] for s in setores_lista])
+    idade_max = np.array([padroes_idade[s]["idade_max"] for s in setores_lista])
+    jovem = rng.random(n) < 0.4
+    idoso = ~jovem & (rng.random(n) < 0.1)
+    idade_livre = np.where(jovem, np.trunc(rng.normal(23, 5, n)),
+                           np.where(idoso, np.trunc(rng.normal(65, 3, n)), rng.integers(9, 91, n)))
+    idade_prioritaria = rng.integers(idade_min[rua], idade_max[rua] + 1)
+    idade = np.clip(np.where(prioritario[rua, tipo], idade_prioritaria, idade_livre), 7, 90).astype(float)
+
+    endereco = sortear_enderecos(rng, rua)
 
-    # Obter peso da região e ajustar tipo de crime
-    regiao_pesos = crime_pesos_por_regiao.get(via_aleatoria, [1] * 6)
-    combined_pesos = [b * r for b, r in zip(base_pesos, regiao_pesos)]
-    tipo = random.choices(tipos_crime, weights=combined_pesos, k=1)[0]
-
-    # Gerar idade
-    idade = gerar_idade(via_aleatoria, tipo)
-
-    # Gerar endereço
-    formato = random.choice(enderecos_asa_sul)
-    if "{bloco}" in formato:
-        endereco = formato.format(rua=via_aleatoria, bloco=random.choice(blocos), num=random.randint(100, 999))
-    elif "{lote}" in formato:
-        endereco = formato.format(rua=via_aleatoria, lote=random.choice(lotes), sala=random.choice(salas))
-    elif "{edificio}" in formato:
-        endereco = formato.format(rua=via_aleatoria, edificio=random.choice(edificios), unidade=random.choice(unidades))
-
-    # Gerar outros dados
-    nome = fake.name()
-    cpf_formatado = fake.cpf()
-    email = fake.email()
-    telefone = fake.phone_number()
-
-    # Inserir NaN esporadicamente
-    if random.random() < 0.03: nome = np.nan
-    if random.random() < 0.08: idade = np.nan
-    if random.random() < 0.01: tipo = np.nan
-    if random.random() < 0.2: email = np.nan
-    if random.random() < 0.07: telefone = np.nan
-    if random.random() < 0.09: endereco = np.nan
-
-    risco = risco_mapa.get(via_aleatoria, 2)
-
-    data.append({
+    # NaN esporádicos
+    nan_nome = rng.random(n) < 0.03
+    idade[rng.random(n) < 0.08] = np.nan
+    tipo[rng.random(n) < 0.01] = -1
+    nan_email = rng.random(n) < 0.2
+    nan_telefone = rng.random(n) < 0.07
+    endereco[rng.random(n) < 0.09] = -1
+
+    horas_texto = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)]
+    risco = np.array([risco_mapa.get(s, 2) for s in setores_lista])
+    df = pd.DataFrame({
         'latitude': lat,
         'longitude': lon,
-        'data': data_str,
-        'hora': data_hora.strftime('%H:%M'),
-        'tipo_crime': tipo,
+        'data': pd.Categorical.from_codes(dias, datas_texto),
+        'hora': pd.Categorical.from_codes(horas * 60 + minutos, horas_texto),
+        'tipo_crime': pd.Categorical.from_codes(tipo, tipos_crime),
         'bairro': 'Asa Sul',
-        'rua': via_aleatoria,
-        'tipo_dia': tipo_dia,
-        'ano': data_hora.year,
-        'nome': nome,
-        'cpf': cpf_formatado,
+        'rua': pd.Categorical.from_codes(rua, setores_lista),
+        'tipo_dia': pd.Categorical.from_codes(tipo_dia, tipos_dia),
+        'ano': (data_inicio + dias).astype('datetime64[Y]').astype(np.int64) + 1970,
         'idade': idade,
-        'email': email,
-        'telefone': telefone,
-        'endereco': endereco,
-        'risco': risco
+        'endereco': pd.Categorical.from_codes(endereco, tabela_enderecos(setores_lista)),
+        'risco': risco[rua],
     })
 
-# Criar DataFrame e salvar CSV
-df = pd.DataFrame(data)
-df["__ERRO__"] = "ERRO_404"
-df["null"] = np.nan
-df.to_csv('crime_segunda_area.csv', index=False)
-print("✅ Arquivo 'crime_segunda_area.csv' criado com sucesso!")
\ No newline at end of file
+    if pii:
+        pool = pool_pii if pool_pii is not None else gerar_pool_pii(seed=seed)
+        adicionar_pii(df, rng, pool, {'nome': nan_nome, 'email': nan_email, 'telefone': nan_telefone})
+
+    return df[[c for c in colunas_saida if c in df.columns]]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera o dataset sintético de crimes (geral)")
+    parser.add_argument('--registros', type=int, default=30000, help="quantidade de registros")
+    parser.add_argument('--lote', action='store_true', help="usa o gerador vetorizado (NumPy) em vez do laço")
+    parser.add_argument('--seed', type=int, default=None, help="semente do modo em lote")
+    parser.add_argument('--sem-pii', action='store_true', help="não gera nome, cpf, email e telefone")
+    parser.add_argument('--saida', default='crime_segunda_area.csv', help="arquivo CSV de saída")
+    args = parser.parse_args()
+
+    if args.lote:
+        df = gerar_lote(args.registros, seed=args.seed, pii=not args.sem_pii)
+    else:
+        df = pd.DataFrame(gerar_registros(args.registros))
+        if args.sem_pii:
+            df = df.drop(columns=colunas_pii)
+
+    # Criar DataFrame e salvar CSV
+    df["__ERRO__"] = "ERRO_404"
+    df["null"] = np.nan
+    df.to_csv(args.saida, index=False)
+    print(f"✅ Arquivo '{args.saida}' criado com sucesso!")
@@ -0,0 +1,154 @@
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import train_test_split
+
+from modelos import (alvos, arquivo_hiperparametros, classes_modelo, criar_preprocessor, features,
+                     hash_dados, hiperparametros)
+
+# Busca de hiperparâmetros por successive halving, no lugar dos RandomizedSearchCV
+# comentados no notebook (células 59 e 63).
+# Rodada 0: `configuracoes` sorteadas treinam numa fração pequena do treino; a cada
+# rodada fica só 1/eta das melhores (MSE na validação) e a fração cresce eta vezes,
+# até a última rodada usar o treino inteiro. No Random Forest o número de árvores
+# também cresce com a fração; no XGBoost ele é um teto, com early stopping na validação.
+# Cada rodada roda num pool de processos. Todo resultado é gravado numa linha de
+# `ajuste_<modelo>.jsonl`; ao rodar de novo (mesmos dados e semente), o que já foi
+# avaliado é lido do arquivo e a busca continua de onde parou.
+# A melhor configuração vai para hiperparametros.json, lido por modelos.py (e pelo app).
+
+eta_padrao = 3
+rodadas_early_stopping = 20
+
+def sortear_configuracoes(nome, n, seed):
+    rng = np.random.default_rng(seed)
+    configuracoes = []
+    for _ in range(n):
+        if nome == "XGBoost":
+            params = {
+                'n_estimators': int(rng.integers(100, 500)),
+                'max_depth': int(rng.integers(3, 15)),
+                'learning_rate': round(float(rng.uniform(0.01, 0.31)), 4),
+                'subsample': round(float(rng.uniform(0.6, 1.0)), 4),
+                'colsample_bytree': round(float(rng.uniform(0.6, 1.0)), 4),
+            }
+        else:
+            params = {
+                'n_estimators': int(rng.integers(50, 300)),
+                'max_depth': [None, 10, 20, 30][int(rng.integers(0, 4))],
+                'min_samples_split': int(rng.integers(2, 10)),
+                'min_samples_leaf': int(rng.integers(1, 4)),
+            }
+        params['random_state'] = 42
+        configuracoes.append(params)
+    return configuracoes
+
+_dados = {}
+
+# Inicializador do processo: matriz já pré-processada do treino e da validação
+def _receber(X_ajuste, y_ajuste, X_validacao, y_validacao, ordem):
+    _dados.update(X_ajuste=X_ajuste, y_ajuste=y_ajuste, X_validacao=X_validacao,
+                  y_validacao=y_validacao, ordem=ordem)
+
+def avaliar(nome, indice, params, fracao):
+    # Subconjuntos aninhados: a fração maior sempre contém a menor
+    amostras = _dados['ordem'][:max(1, int(round(fracao * len(_dados['ordem']))))]
+    X, y = _dados['X_ajuste'][amostras], _dados['y_ajuste'][amostras]
+    ajustados = dict(params)
+    inicio = time.perf_counter()
+    if nome == "XGBoost":
+        model = classes_modelo[nome](**ajustados, early_stopping_rounds=rodadas_early_stopping)
+        model.fit(X, y, eval_set=[(_dados['X_validacao'], _dados['y_validacao'])], verbose=False)
+        ajustados['n_estimators'] = int(model.best_iteration) + 1
+    else:
+        ajustados['n_estimators'] = max(10, int(round(params['n_estimators'] * fracao)))
+        model = classes_modelo[nome](**ajustados)
+        model.fit(X, y)
+    mse = mean_squared_error(_dados['y_validacao'], model.predict(_dados['X_validacao']))
+    return {'configuracao': indice, 'fracao': fracao, 'amostras': len(amostras), 'params': params,
+            'params_efetivos': ajustados, 'mse': float(mse), 'segundos': time.perf_counter() - inicio}
+
+def _ler_checkpoint(caminho, hash_df, seed):
+    feitos = {}
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                if not linha.strip():
+                    continue
+                resultado = json.loads(linha)
+                if resultado.get('hash_dados') == hash_df and resultado.get('seed') == seed:
+                    feitos[(resultado['configuracao'], resultado['fracao'])] = resultado
+    return feitos
+
+def buscar(df, nome, configuracoes=27, eta=eta_padrao, seed=42, processos=None, checkpoint=None,
+           destino=arquivo_hiperparametros):
+    hash_df = hash_dados(df)
+    checkpoint = checkpoint or f"ajuste_{nome.lower().replace(' ', '_')}.jsonl"
+    feitos = _ler_checkpoint(checkpoint, hash_df, seed)
+
+    # Mesma divisão treino/teste da aba 3; o teste não é visto pela busca
+    X = criar_preprocessor().fit_transform(df[features])
+    y = df[alvos].to_numpy()
+    X_treino, _, y_treino, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_ajuste, X_validacao, y_ajuste, y_validacao = train_test_split(X_treino, y_treino, test_size=0.2,
+                                                                    random_state=seed)
+    ordem = np.random.default_rng(seed).permutation(X_ajuste.shape[0])
+
+    candidatos = list(enumerate(sortear_configuracoes(nome, configuracoes, seed)))
+    rodadas = max(1, int(math.floor(math.log(configuracoes, eta) + 1e-9)))
+    with ProcessPoolExecutor(max_workers=processos, initializer=_receber,
+                             initargs=(X_ajuste, y_ajuste, X_validacao, y_validacao, ordem)) as executor, \
+            open(checkpoint, 'a', encoding='utf-8') as registro:
+        for rodada in range(rodadas):
+            fracao = round(eta ** (rodada - rodadas + 1), 6)
+            resultados = [feitos[(i, fracao)] for i, _ in candidatos if (i, fracao) in feitos]
+            pendentes = [(i, p) for i, p in candidatos if (i, fracao) not in feitos]
+            tarefas = [executor.submit(avaliar, nome, i, p, fracao) for i, p in pendentes]
+            for tarefa in as_completed(tarefas):
+                resultado = dict(tarefa.result(), hash_dados=hash_df, seed=seed)
+                registro.write(json.dumps(resultado) + '\n')
+                registro.flush()
+                resultados.append(resultado)
+            resultados.sort(key=lambda r: r['mse'])
+            print(f"rodada {rodada + 1}/{rodadas}: {len(resultados)} configurações com {resultados[0]['amostras']} "
+                  f"amostras ({len(resultados) - len(pendentes)} do checkpoint), melhor MSE {resultados[0]['mse']:.8f}")
+            if rodada < rodadas - 1:
+                manter = {r['configuracao'] for r in resultados[:max(1, len(resultados) // eta)]}
+                candidatos = [(i, p) for i, p in candidatos if i in manter]
+
+    melhor = resultados[0]['params_efetivos']
+    salvar_hiperparametros(nome, melhor, destino)
+    print(f"✅ {nome}: {melhor} gravado em '{destino}'")
+    return melhor
+
+def salvar_hiperparametros(nome, params, destino=arquivo_hiperparametros):
+    todos = {}
+    if os.path.exists(destino):
+        with open(destino, encoding='utf-8') as arquivo:
+            todos = json.load(arquivo)
+    todos[nome] = params
+    temporario = f"{destino}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(todos, arquivo, indent=2, ensure_ascii=False)
+    os.replace(temporario, destino)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros por successive halving (retomável)")
+    parser.add_argument('--modelo', choices=sorted(hiperparametros), default="XGBoost", help="modelo a ajustar")
+    parser.add_argument('--configuracoes', type=int, default=27, help="configurações sorteadas na primeira rodada")
+    parser.add_argument('--eta', type=int, default=eta_padrao, help="fator de corte e de crescimento por rodada")
+    parser.add_argument('--seed', type=int, default=42, help="semente do sorteio e das divisões")
+    parser.add_argument('--processos', type=int, default=None, help="processos no pool (padrão: núcleos da máquina)")
+    parser.add_argument('--checkpoint', default=None, help="arquivo .jsonl dos resultados (padrão: ajuste_<modelo>.jsonl)")
+    parser.add_argument('--destino', default=arquivo_hiperparametros, help="arquivo JSON com os hiperparâmetros vencedores")
+    args = parser.parse_args()
+
+    from dados import carregar_compacto
+    buscar(carregar_compacto(), args.modelo, args.configuracoes, args.eta, args.seed, args.processos,
+           args.checkpoint, args.destino)
@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+# Cache dos gráficos já renderizados (PNG da tela e PNG de exportação).
+# A chave é (versão dos dados, tipos selecionados, hora selecionada, id do gráfico);
+# quando o total de bytes passa do limite, os gráficos menos usados saem primeiro.
+# Um mesmo estado de filtros é então servido sem passar pelo matplotlib (nem importá-lo).
+# `desenhar` devolve a sua própria matplotlib.figure.Figure (fora do pyplot): as sessões são threads
+# do mesmo processo e, com a figura atual do pyplot, uma falta podia rasterizar o gráfico de outra.
+
+# DPI do st.pyplot, para a imagem na tela ficar igual à de antes
+dpi_tela = 200
+
+def _png(fig, **kwargs):
+    buf = BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight', **kwargs)
+    return buf.getvalue()
+
+class CacheGraficos:
+    def __init__(self, limite_bytes=64 * 1024 * 1024):
+        self.limite_bytes = limite_bytes
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.faltas = 0
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+
+    # Devolve {'tela': png, 'arquivo': png}; `desenhar` só roda se a chave não estiver no cache
+    def obter(self, chave, desenhar):
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.faltas += 1
+
+        fig = desenhar()
+        imagem = {'tela': _png(fig, dpi=dpi_tela), 'arquivo': _png(fig)}
+
+        tamanho = len(imagem['tela']) + len(imagem['arquivo'])
+        with self._trava:
+            if chave not in self._itens:
+                self._itens[chave] = imagem
+                self.bytes_usados += tamanho
+            while self.bytes_usados > self.limite_bytes and len(self._itens) > 1:
+                _, antigo = self._itens.popitem(last=False)
+                self.bytes_usados -= len(antigo['tela']) + len(antigo['arquivo'])
+        return imagem
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+            self.bytes_usados = 0
@@ -0,0 +1,67 @@
+import argparse
+import json
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+# Teste de carga do endpoint de previsao.py: vários clientes simultâneos enviam lotes
+# de consultas sintéticas por um tempo fixo; no fim mostra consultas/s e a latência
+# por requisição (p50, p95, p99).
+#   python previsao.py --servir &
+#   python carga_previsao.py --clientes 8 --lote 256 --segundos 30
+
+tipos_crime = ["furto", "roubo", "homicídio", "tráfico", "vandalismo", "feminicídio"]
+tipos_dia = ['dia_normal', 'final_semana', 'feriado']
+
+def gerar_consultas(n, rng):
+    return [[int(h), float(i), int(r), tipos_crime[t], tipos_dia[d]] for h, i, r, t, d in zip(
+        rng.integers(0, 24, n), rng.integers(7, 91, n), rng.integers(1, 6, n),
+        rng.integers(0, len(tipos_crime), n), rng.integers(0, len(tipos_dia), n))]
+
+def cliente(url, corpo, fim, latencias, erros):
+    while time.perf_counter() < fim:
+        requisicao = urllib.request.Request(url, data=corpo, headers={'Content-Type': 'application/json'})
+        inicio = time.perf_counter()
+        try:
+            with urllib.request.urlopen(requisicao) as resposta:
+                resposta.read()
+        except OSError:
+            erros.append(1)
+            continue
+        latencias.append(time.perf_counter() - inicio)
+
+def testar_carga(url, clientes=8, lote=256, segundos=30, seed=42):
+    corpo = json.dumps(gerar_consultas(lote, np.random.default_rng(seed))).encode('utf-8')
+    latencias, erros = [], []
+    fim = time.perf_counter() + segundos
+    threads = [threading.Thread(target=cliente, args=(url, corpo, fim, latencias, erros)) for _ in range(clientes)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    latencias_ms = np.array(latencias) * 1000
+    resultado = {
+        'requisicoes': len(latencias),
+        'erros': len(erros),
+        'consultas_por_segundo': len(latencias) * lote / duracao,
+        'p50_ms': float(np.percentile(latencias_ms, 50)) if len(latencias) else None,
+        'p95_ms': float(np.percentile(latencias_ms, 95)) if len(latencias) else None,
+        'p99_ms': float(np.percentile(latencias_ms, 99)) if len(latencias) else None,
+    }
+    print(json.dumps(resultado, indent=2))
+    return resultado
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Teste de carga do endpoint de previsão")
+    parser.add_argument('--url', default='http://127.0.0.1:8600/prever', help="endereço do endpoint")
+    parser.add_argument('--clientes', type=int, default=8, help="clientes simultâneos")
+    parser.add_argument('--lote', type=int, default=256, help="consultas por requisição")
+    parser.add_argument('--segundos', type=int, default=30, help="duração do teste")
+    args = parser.parse_args()
+
+    testar_carga(args.url, args.clientes, args.lote, args.segundos)
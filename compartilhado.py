@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+# Dados compartilhados entre as sessões do dashboard, somente leitura.
+# A tabela e o cubo ficam num único objeto por processo (st.cache_resource, ver painel_dados.py),
+# sem a cópia que st.cache_data entrega a cada chamada. Os arrays de cada coluna são views somente
+# leitura, então uma escrita no lugar (df.loc[...] = ..., fillna(inplace=True)) falha em vez de
+# alterar os dados de todas as sessões. Travar o array que to_numpy() devolve não basta: com
+# copy-on-write ele pode ser uma view, e o bloco do DataFrame continua gravável. E um único objeto
+# DataFrame também não: se alguma Series ainda aponta para a coluna, o pandas copia o bloco e a
+# escrita passa, trocando a coluna do objeto que todas as sessões têm. Por isso Tabela.df monta um
+# DataFrame novo (sem copiar dados) a cada leitura. Quem precisa de uma coluna nova cria um DataFrame novo.
+# O filtro da barra lateral vira uma Visao: a tabela compartilhada + a máscara da sessão
+# (um byte por linha). Só as colunas pedidas são materializadas, e só quando alguém as lê.
+
+def _somente_leitura(vetor):
+    vista = vetor.view()
+    vista.flags.writeable = False
+    return vista
+
+# Views somente leitura dos arrays de cada coluna (nas categóricas, dos códigos), sem cópia;
+# colunas de extensão sem array NumPy ficam como estão
+def _colunas_somente_leitura(df):
+    colunas = {}
+    for coluna in df.columns:
+        serie = df[coluna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            colunas[coluna] = pd.Categorical.from_codes(_somente_leitura(serie.array.codes), dtype=serie.dtype,
+                                                        validate=False)
+        elif isinstance(serie.dtype, np.dtype):
+            colunas[coluna] = _somente_leitura(serie.to_numpy(copy=False))
+        else:
+            colunas[coluna] = serie.array
+    return colunas
+
+# DataFrame novo sobre os mesmos arrays, somente leitura
+def congelar(df):
+    return pd.DataFrame(_colunas_somente_leitura(df), index=df.index, copy=False)
+
+def congelar_cubo(cubo):
+    for medida in ('contagem', 'peso'):
+        cubo[medida].flags.writeable = False
+    return cubo
+
+# Tabela que só cresce (ingestão incremental): cada coluna num array com folga no fim, como uma list
+# do Python. acrescentar() escreve as linhas novas depois das atuais e só realoca (com `folga`) quando
+# falta espaço, então o custo é proporcional às linhas novas e não à tabela inteira.
+# `df` é a cada leitura um DataFrame novo sobre as primeiras n posições, com views somente leitura;
+# os DataFrames anteriores (ainda nas sessões) continuam válidos, porque nada antes de n é reescrito.
+class Tabela:
+    folga = 0.5
+
+    def __init__(self, df):
+        self.colunas = _colunas_somente_leitura(df)
+        self.n = len(df)
+        self.categorias = {}
+        self.vetores = {}
+        for coluna in df.columns:
+            serie = df[coluna]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                self.categorias[coluna] = serie.cat.categories
+                self.vetores[coluna] = serie.array.codes
+            else:
+                self.vetores[coluna] = serie.to_numpy(copy=False)
+
+    @property
+    def df(self):
+        return pd.DataFrame(self.colunas, copy=False)
+
+    # Array da coluna com espaço para n linhas e tipo que comporta `tipo`; os da base nunca são escritos
+    def _reservar(self, coluna, tipo, n):
+        vetor = self.vetores[coluna]
+        tipo = np.result_type(vetor.dtype, tipo)
+        if len(vetor) < n or tipo != vetor.dtype:
+            novo = np.empty(max(n, int(len(vetor) * (1 + self.folga))), tipo)
+            novo[:self.n] = vetor[:self.n]
+            self.vetores[coluna] = vetor = novo
+        return vetor
+
+    # Códigos do lote nas categorias da tabela; as que faltam entram no fim, sem mudar os códigos antigos.
+    # As categorias ficam num Index, cuja tabela hash é reaproveitada enquanto não surgem categorias novas
+    def _codigos(self, coluna, serie):
+        categorias = self.categorias[coluna]
+        do_lote = serie.cat.categories
+        posicoes = categorias.get_indexer(do_lote)
+        if (posicoes < 0).any():
+            categorias = self.categorias[coluna] = categorias.append(do_lote[posicoes < 0])
+            posicoes = categorias.get_indexer(do_lote)
+        codigos = serie.cat.codes.to_numpy()
+        tipo = np.promote_types(np.min_scalar_type(-len(categorias)), np.int8)
+        return np.where(codigos >= 0, posicoes[codigos], -1).astype(tipo)
+
+    # `lote` no mesmo esquema (dados.preparar)
+    def acrescentar(self, lote):
+        if lote.empty:
+            return self.df
+        n = self.n + len(lote)
+        colunas = {}
+        for coluna in self.vetores:
+            if coluna in self.categorias:
+                if coluna in lote.columns:
+                    novos = self._codigos(coluna, lote[coluna].astype('category'))
+                else:
+                    novos = np.full(len(lote), -1, np.int8)
+            else:
+                novos = lote[coluna].to_numpy() if coluna in lote.columns else np.full(len(lote), np.nan)
+            vetor = self._reservar(coluna, novos.dtype, n)
+            vetor[self.n:n] = novos
+            vista = vetor[:n]
+            vista.flags.writeable = False
+            if coluna in self.categorias:
+                vista = pd.Categorical.from_codes(vista, dtype=pd.CategoricalDtype(self.categorias[coluna]),
+                                                  validate=False)
+            colunas[coluna] = vista
+        self.colunas = colunas
+        self.n = n
+        return self.df
+
+def mascara_filtros(df, tipos, hora):
+    mascara = df['tipo_crime'].isin(tipos).to_numpy()
+    if hora != "Geral":
+        mascara = mascara & (df['hora'].to_numpy() == int(hora))
+    return mascara
+
+# Linhas da tabela compartilhada que passam no filtro de uma sessão, sem copiá-las.
+# Tem o pedaço da interface de DataFrame que o dashboard usa (colunas, len, empty, sample)
+class Visao:
+    def __init__(self, df, mascara):
+        self.df = df
+        self.mascara = mascara
+        self._posicoes = None
+
+    @property
+    def posicoes(self):
+        if self._posicoes is None:
+            self._posicoes = np.flatnonzero(self.mascara)
+        return self._posicoes
+
+    def __len__(self):
+        return len(self.posicoes)
+
+    @property
+    def empty(self):
+        return not self.mascara.any()
+
+    # Coluna (ou lista de colunas) filtrada: um array novo só com as linhas da sessão
+    def __getitem__(self, coluna):
+        return self.df[coluna].iloc[self.posicoes]
+
+    # Mesmo sorteio de DataFrame.sample (RandomState.choice sobre as posições), só das linhas sorteadas
+    def sample(self, n, random_state=None):
+        escolhidas = np.random.RandomState(random_state).choice(len(self), size=n, replace=False)
+        return self.df.iloc[self.posicoes[escolhidas]]
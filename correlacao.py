@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+# Correlação mista entre colunas numéricas e categóricas (mapa de calor da EDA).
+# Cada coluna é fatorada uma única vez; depois, por par de colunas (só o triângulo
+# superior, a matriz é simétrica):
+#   numérica × numérica     → Pearson, todas de uma vez com np.corrcoef
+#   categórica × numérica   → correlation ratio (SS_entre / SS_total) com somas via bincount
+#   categórica × categórica → Cramér's V a partir de um único bincount conjunto
+# Os valores são os mesmos de `mixed_correlation` (notebook, célula 33).
+
+def _categorica(serie):
+    return isinstance(serie.dtype, pd.CategoricalDtype) or serie.dtype == 'object'
+
+# Códigos 0..k-1 por categoria presente (categorias sem ocorrência não entram)
+def _fatorar(serie):
+    codigos, niveis = pd.factorize(serie, sort=True)
+    return codigos.astype(np.int64), len(niveis)
+
+# SS_entre / SS_total, como correlation_ratio (0 se houver menos de dois grupos)
+def razao_correlacao(codigos, k, medidas):
+    if k < 2:
+        return 0.0
+    n = np.bincount(codigos, minlength=k)
+    soma = np.bincount(codigos, weights=medidas, minlength=k)
+    media = medidas.mean()
+    presentes = n > 0
+    ss_entre = np.sum(n[presentes] * (soma[presentes] / n[presentes] - media) ** 2)
+    ss_total = np.sum((medidas - media) ** 2)
+    return ss_entre / ss_total
+
+# Cramér's V com a mesma correção de Yates do chi2_contingency (tabelas 2×2)
+def cramers_v(codigos_a, k_a, codigos_b, k_b):
+    tabela = np.bincount(codigos_a * k_b + codigos_b, minlength=k_a * k_b).reshape(k_a, k_b).astype(np.float64)
+    n = tabela.sum()
+    linhas = tabela.sum(axis=1)
+    colunas = tabela.sum(axis=0)
+    esperado = np.outer(linhas, colunas) / n
+    diferenca = tabela - esperado
+    if (k_a - 1) * (k_b - 1) == 1:
+        diferenca = np.sign(diferenca) * np.minimum(0.5, np.abs(diferenca))
+        diferenca = tabela - esperado - diferenca
+    chi2 = np.sum(diferenca ** 2 / esperado)
+    menor = min(k_a - 1, k_b - 1)
+    if menor == 0:
+        return np.nan
+    return np.sqrt(chi2 / n / menor)
+
+def correlacao_mista(df):
+    colunas = list(df.columns)
+    df = df.dropna()
+    categoricas = {c: _fatorar(df[c]) for c in colunas if _categorica(df[c])}
+    numericas = [c for c in colunas if c not in categoricas]
+    valores = {c: df[c].to_numpy(np.float64) for c in numericas}
+
+    resultado = np.full((len(colunas), len(colunas)), np.nan)
+    if numericas:
+        pearson = np.corrcoef(np.vstack([valores[c] for c in numericas]))
+        posicoes = [colunas.index(c) for c in numericas]
+        resultado[np.ix_(posicoes, posicoes)] = np.atleast_2d(pearson)
+
+    for i, col1 in enumerate(colunas):
+        for j in range(i, len(colunas)):
+            col2 = colunas[j]
+            if col1 in categoricas and col2 in categoricas:
+                valor = cramers_v(*categoricas[col1], *categoricas[col2])
+            elif col1 in categoricas:
+                valor = razao_correlacao(*categoricas[col1], valores[col2])
+            elif col2 in categoricas:
+                valor = razao_correlacao(*categoricas[col2], valores[col1])
+            else:
+                continue
+            resultado[i, j] = resultado[j, i] = valor
+    return pd.DataFrame(resultado, index=colunas, columns=colunas)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# Cubo OLAP pré-agregado: contagem e soma de `peso` em
+# tipo_crime × hora × rua × tipo_dia × ano.
+# É montado uma vez por versão dos dados; os gráficos da EDA são respondidos
+# fatiando e somando o cubo, sem varrer as linhas do DataFrame a cada filtro.
+
+eixos = ['tipo_crime', 'hora', 'rua', 'tipo_dia', 'ano']
+
+# Códigos de cada eixo. Nas categóricas, NaN (código -1) vai para uma última posição extra.
+def _codigos(df, coluna, rotulos):
+    if coluna in ('tipo_crime', 'rua', 'tipo_dia'):
+        codigos = df[coluna].cat.codes.to_numpy().astype(np.int64)
+        return np.where(codigos < 0, len(rotulos) - 1, codigos)
+    return df[coluna].to_numpy().astype(np.int64) - rotulos[0]
+
+def _rotulos(df, coluna):
+    if coluna in ('tipo_crime', 'rua', 'tipo_dia'):
+        return list(df[coluna].cat.categories) + [np.nan]
+    if coluna == 'hora':
+        return list(range(24))
+    return list(range(int(df[coluna].min()), int(df[coluna].max()) + 1))
+
+def montar_cubo(df):
+    rotulos = {eixo: _rotulos(df, eixo) for eixo in eixos}
+    forma = tuple(len(rotulos[eixo]) for eixo in eixos)
+    indice = np.ravel_multi_index([_codigos(df, eixo, rotulos[eixo]) for eixo in eixos], forma)
+    return {
+        'rotulos': rotulos,
+        'contagem': np.bincount(indice, minlength=np.prod(forma)).reshape(forma),
+        'peso': np.bincount(indice, weights=df['peso'].to_numpy(np.float64), minlength=np.prod(forma)).reshape(forma),
+    }
+
+# Posições no eixo para uma lista de rótulos (NaN aceito nas categóricas)
+def _posicoes(rotulos, valores):
+    posicoes = []
+    for valor in valores:
+        if pd.isna(valor):
+            posicoes.append(len(rotulos) - 1)
+        elif valor in rotulos:
+            posicoes.append(rotulos.index(valor))
+    return posicoes
+
+# Soma de dois cubos (ex.: o dos dados já carregados + o de um lote novo), alinhando os rótulos:
+# categorias novas entram antes do NaN e o eixo `ano` vira a união dos intervalos.
+# O custo depende só do tamanho dos cubos, não do número de linhas.
+def somar_cubos(a, b):
+    rotulos = {}
+    for eixo in eixos:
+        rotulos_a, rotulos_b = a['rotulos'][eixo], b['rotulos'][eixo]
+        if eixo == 'ano':
+            rotulos[eixo] = list(range(min(rotulos_a[0], rotulos_b[0]), max(rotulos_a[-1], rotulos_b[-1]) + 1))
+        elif eixo == 'hora':
+            rotulos[eixo] = rotulos_a
+        else:
+            extras = [r for r in rotulos_b[:-1] if r not in rotulos_a[:-1]]
+            rotulos[eixo] = rotulos_a[:-1] + extras + [np.nan]
+    forma = tuple(len(rotulos[eixo]) for eixo in eixos)
+    resultado = {'rotulos': rotulos}
+    for medida in ('contagem', 'peso'):
+        soma = np.zeros(forma, dtype=np.result_type(a[medida], b[medida]))
+        for cubo in (a, b):
+            soma[np.ix_(*[_posicoes(rotulos[eixo], cubo['rotulos'][eixo]) for eixo in eixos])] += cubo[medida]
+        resultado[medida] = soma
+    return resultado
+
+# Soma do cubo agrupada por `por`, depois de filtrar os eixos passados em `filtros`
+# (ex.: consultar(cubo, 'rua', tipo_crime=['furto'], hora=[21, 22])).
+def consultar(cubo, por, medida='contagem', **filtros):
+    valores = cubo[medida]
+    rotulos = cubo['rotulos'][por]
+    for eixo, selecionados in filtros.items():
+        if selecionados is None:
+            continue
+        posicoes = _posicoes(cubo['rotulos'][eixo], selecionados)
+        valores = np.take(valores, posicoes, axis=eixos.index(eixo))
+        if eixo == por:
+            rotulos = [cubo['rotulos'][eixo][i] for i in posicoes]
+    manter = eixos.index(por)
+    valores = valores.sum(axis=tuple(i for i in range(len(eixos)) if i != manter))
+    return pd.Series(valores, index=rotulos, name=medida)
+
+# Mesma saída de value_counts(): sem NaN, sem zeros e em ordem decrescente
+def contagem_por(cubo, por, **filtros):
+    contagem = consultar(cubo, por, **filtros)
+    contagem = contagem[contagem.index.notna() & (contagem > 0)]
+    return contagem.sort_values(ascending=False, kind='stable')
+
+def total(cubo, **filtros):
+    return int(consultar(cubo, 'tipo_crime', **filtros).sum())
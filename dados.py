@@ -0,0 +1,183 @@
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Formato colunar (Parquet) do dataset de crimes e leitura tipada para o dashboard.
+# No arquivo: `hora` é um inteiro pequeno (só a hora, 0–23), as colunas de texto
+# repetitivo são dictionary-encoded e `data` é uma data de verdade.
+
+arquivo_csv = 'crime_segunda_area.csv'
+arquivo_parquet = 'crime_segunda_area.parquet'
+
+# Colunas que o dashboard usa (sem nome, cpf, email e telefone; `ano` já substitui `data`)
+colunas_dashboard = ['latitude', 'longitude', 'hora', 'tipo_crime', 'rua', 'tipo_dia', 'ano',
+                     'idade', 'endereco', 'risco']
+
+colunas_texto = ['tipo_crime', 'bairro', 'rua', 'tipo_dia', 'endereco']
+
+esquema = pa.schema([
+    ('latitude', pa.float64()),
+    ('longitude', pa.float64()),
+    ('data', pa.date32()),
+    ('hora', pa.int8()),
+    ('tipo_crime', pa.dictionary(pa.int32(), pa.string())),
+    ('bairro', pa.dictionary(pa.int32(), pa.string())),
+    ('rua', pa.dictionary(pa.int32(), pa.string())),
+    ('tipo_dia', pa.dictionary(pa.int32(), pa.string())),
+    ('ano', pa.int16()),
+    ('nome', pa.string()),
+    ('cpf', pa.string()),
+    ('idade', pa.float32()),
+    ('email', pa.string()),
+    ('telefone', pa.string()),
+    ('endereco', pa.dictionary(pa.int32(), pa.string())),
+    ('risco', pa.int8()),
+    ('__ERRO__', pa.dictionary(pa.int32(), pa.string())),
+    ('null', pa.float32()),
+])
+
+# Converte um bloco lido do CSV para os tipos do esquema
+def tipar_bloco(df):
+    # "HH:MM" → hora inteira, sem passar por pd.to_datetime
+    df['hora'] = pd.to_numeric(df['hora'].astype('string').str.slice(0, 2), errors='coerce').astype('Int8')
+    df['data'] = pd.to_datetime(df['data'], format='%Y-%m-%d', errors='coerce').dt.date
+    for coluna in colunas_texto + ['__ERRO__']:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype('category')
+    return df
+
+def ler_csv(caminho=arquivo_csv, colunas=None, tamanho_bloco=None):
+    return pd.read_csv(caminho, usecols=colunas, chunksize=tamanho_bloco)
+
+# Conversão única: CSV (arquivo ou pasta com partições) → um único arquivo Parquet
+def converter_csv(origem=arquivo_csv, destino=arquivo_parquet, tamanho_bloco=1_000_000):
+    if os.path.isdir(origem):
+        arquivos = sorted(glob.glob(os.path.join(origem, '**', '*.csv'), recursive=True))
+    else:
+        arquivos = [origem]
+
+    escritor = None
+    total = 0
+    try:
+        for arquivo in arquivos:
+            for bloco in ler_csv(arquivo, tamanho_bloco=tamanho_bloco):
+                bloco = tipar_bloco(bloco)
+                campos = [esquema.field(c) for c in esquema.names if c in bloco.columns]
+                tabela = pa.Table.from_pandas(bloco[[c.name for c in campos]], schema=pa.schema(campos),
+                                              preserve_index=False).replace_schema_metadata(None)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(destino, tabela.schema, compression='zstd')
+                escritor.write_table(tabela)
+                total += len(bloco)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    print(f"✅ {total} registros convertidos para '{destino}'")
+    return total
+
+# Lê só as colunas pedidas. Com categorias=False as colunas de dicionário
+# voltam como texto (mesmo comportamento do CSV).
+def carregar_parquet(caminho=arquivo_parquet, colunas=colunas_dashboard, categorias=False):
+    disponiveis = pq.read_schema(caminho).names
+    tabela = pq.read_table(caminho, columns=[c for c in colunas if c in disponiveis])
+    if not categorias:
+        for i, campo in enumerate(tabela.schema):
+            if pa.types.is_dictionary(campo.type):
+                tabela = tabela.set_column(i, campo.name, tabela.column(i).cast(pa.string()))
+    df = tabela.to_pandas(ignore_metadata=True)
+    if 'data' in df.columns:
+        df['data'] = pd.to_datetime(df['data'])
+    return df
+
+# Mesmas colunas e tipos a partir do CSV (quando ainda não há Parquet)
+def carregar_csv(caminho=arquivo_csv, colunas=colunas_dashboard, categorias=False):
+    disponiveis = pd.read_csv(caminho, nrows=0).columns
+    usadas = [c for c in colunas if c in disponiveis]
+    tipos = {c: 'category' for c in colunas_texto if c in usadas} if categorias else None
+    df = pd.read_csv(caminho, usecols=usadas, dtype=tipos)
+    if 'hora' in df.columns:
+        df['hora'] = pd.to_numeric(df['hora'].str.slice(0, 2), errors='coerce')
+        if not df['hora'].isna().any():
+            df['hora'] = df['hora'].astype(np.int8)
+    if 'data' in df.columns:
+        df['data'] = pd.to_datetime(df['data'], format='%Y-%m-%d', errors='coerce')
+    return df
+
+# Versão dos dados: muda sempre que o arquivo usado pelo dashboard é regravado
+def versao_dados():
+    caminho = arquivo_parquet if os.path.exists(arquivo_parquet) else arquivo_csv
+    info = os.stat(caminho)
+    return f"{caminho}:{info.st_size}:{info.st_mtime_ns}"
+
+def carregar_tabela(colunas=colunas_dashboard, categorias=False):
+    if os.path.exists(arquivo_parquet):
+        return carregar_parquet(arquivo_parquet, colunas, categorias)
+    return carregar_csv(arquivo_csv, colunas, categorias)
+
+# Esquema compacto em memória (é o objeto guardado pelo @st.cache_data):
+# coordenadas em float32, campos de tempo em int8/int16 e categóricas com ordem
+# fixa, para que códigos e filtros sejam os mesmos em qualquer versão dos dados.
+categorias_fixas = {
+    'tipo_crime': ["furto", "roubo", "homicídio", "tráfico", "vandalismo", "feminicídio"],
+    'rua': ["Eixo L Sul", "W3 Sul", "W4 Sul", "W5 Sul", "L2 Sul", "Novo Setor 1",
+            "Nova Região 1", "Nova Região 2", "Nova Região 3"],
+    'tipo_dia': ['dia_normal', 'final_semana', 'feriado'],
+}
+tipos_compactos = {
+    'latitude': 'float32',
+    'longitude': 'float32',
+    'hora': 'int8',
+    'ano': 'int16',
+    'risco': 'int8',
+    'idade': 'float32',
+    'peso': 'float32',
+}
+
+def compactar(df):
+    for coluna, tipo in tipos_compactos.items():
+        if coluna not in df.columns:
+            continue
+        if tipo.startswith('int') and df[coluna].isna().any():
+            tipo = 'float32'
+        df[coluna] = df[coluna].astype(tipo)
+    for coluna, categorias in categorias_fixas.items():
+        if coluna in df.columns:
+            # Valores fora da lista (outro gerador) entram no fim, em ordem alfabética
+            extras = sorted(set(df[coluna].dropna().unique()) - set(categorias))
+            df[coluna] = pd.Categorical(df[coluna], categories=categorias + extras)
+    if 'endereco' in df.columns:
+        df['endereco'] = df['endereco'].astype('category')
+    return df
+
+# Gravidade de cada tipo de crime (`peso`), usada nos gráficos de risco e nos focos
+pesos_crime = {
+    'furto': 2,
+    'roubo': 3,
+    'vandalismo': 1,
+    'tráfico': 4,
+    'homicídio': 5,
+    'feminicídio': 5
+}
+
+# Acrescenta `peso` e passa para o esquema compacto
+def preparar(df):
+    df['peso'] = df['tipo_crime'].map(pesos_crime).astype(float).fillna(1)
+    return compactar(df)
+
+# Tabela do dashboard já com `peso` e no esquema compacto (o que o app guarda em cache)
+def carregar_compacto(colunas=colunas_dashboard):
+    return preparar(carregar_tabela(colunas, categorias=True))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Converte o CSV de crimes para Parquet (colunar e tipado)")
+    parser.add_argument('--origem', default=arquivo_csv, help="arquivo CSV ou pasta com partições CSV")
+    parser.add_argument('--destino', default=arquivo_parquet, help="arquivo Parquet de saída")
+    parser.add_argument('--tamanho-bloco', type=int, default=1_000_000, help="linhas lidas por vez do CSV")
+    args = parser.parse_args()
+
+    converter_csv(args.origem, args.destino, args.tamanho_bloco)
@@ -1,8 +1,10 @@
+import argparse
 import pandas as pd
 import random
 from datetime import datetime, timedelta
 import numpy as np
 from faker import Faker
+from geo import em_zona, em_zonas
 
 fake = Faker('pt_BR')
 
@@ -128,135 +130,313 @@ crimes_regioes_prioritarias = {
     "homicídio": ["W3 Sul", "L2 Sul", "Nova Região 3"]
 }
 
-# Geração dos dados
-num_registros = 30000
-data = []
+# Geração dos dados (linha a linha)
+def gerar_registros(num_registros):
+    data = []
 
-for _ in range(num_registros):
-    data_hora = random_datetime()
-    data_str = data_hora.strftime('%Y-%m-%d')
-    hora = data_hora.hour
+    for _ in range(num_registros):
+        data_hora = random_datetime()
+        data_str = data_hora.strftime('%Y-%m-%d')
+        hora = data_hora.hour
 
-    # Verificar tipo de dia
-    if data_hora.weekday() in [4, 5]:  # sexta (4), sábado (5)
-        tipo_dia = 'final_semana'
-    elif data_str in feriados:
-        tipo_dia = 'feriado'
-    else:
-        tipo_dia = 'dia_normal'
-
-    # Obter peso baseado no tipo de dia
-    base_pesos = pesos_tipos[tipo_dia]
-
-    # Primeiro gerar tipo de crime
-    tipo = random.choices(tipos_crime, weights=base_pesos, k=1)[0]
+        # Verificar tipo de dia
+        if data_hora.weekday() in [4, 5]:  # sexta (4), sábado (5)
+            tipo_dia = 'final_semana'
+        elif data_str in feriados:
+            tipo_dia = 'feriado'
+        else:
+            tipo_dia = 'dia_normal'
 
-    # Priorizar região com base no tipo de crime
-    if tipo in crimes_regioes_prioritarias:
-        regioes_prioritarias = crimes_regioes_prioritarias[tipo] * 5 + list(setores_asa_sul.keys())
-    else:
-        regioes_prioritarias = list(setores_asa_sul.keys())
-
-    # Garantir que a região existe
-    via_aleatoria = None
-    tentativas = 0
-    while tentativas < 10:
-        tentativas += 1
-        via_aleatoria = random.choice(regioes_prioritarias)
-        if via_aleatoria in setores_asa_sul:
-            break
-    if via_aleatoria not in setores_asa_sul:
-        via_aleatoria = random.choice(list(setores_asa_sul.keys()))
+        # Obter peso baseado no tipo de dia
+        base_pesos = pesos_tipos[tipo_dia]
 
-    # Obter coordenadas base
-    lat_base, lon_base = random.choice(setores_asa_sul[via_aleatoria])
+        # Primeiro gerar tipo de crime
+        tipo = random.choices(tipos_crime, weights=base_pesos, k=1)[0]
 
-    # Gerar variação com base no tipo de crime
-    lat, lon = gerar_variacao(lat_base, lon_base, tipo)
+        # Priorizar região com base no tipo de crime
+        if tipo in crimes_regioes_prioritarias:
+            regioes_prioritarias = crimes_regioes_prioritarias[tipo] * 5 + list(setores_asa_sul.keys())
+        else:
+            regioes_prioritarias = list(setores_asa_sul.keys())
+
+        # Garantir que a região existe
+        via_aleatoria = None
+        tentativas = 0
+        while tentativas < 10:
+            tentativas += 1
+            via_aleatoria = random.choice(regioes_prioritarias)
+            if via_aleatoria in setores_asa_sul:
+                break
+        if via_aleatoria not in setores_asa_sul:
+            via_aleatoria = random.choice(list(setores_asa_sul.keys()))
 
-    # Verificar zonas proibidas
-    proibido = True
-    tentativas = 0
-    while proibido and tentativas < 10:
-        tentativas += 1
+        # Obter coordenadas base
         lat_base, lon_base = random.choice(setores_asa_sul[via_aleatoria])
+
+        # Gerar variação com base no tipo de crime
         lat, lon = gerar_variacao(lat_base, lon_base, tipo)
-        proibido = False
-        for (lat_p, lon_p, raio) in zonas_proibidas:
-            distancia = ((lat - lat_p)**2 + (lon - lon_p)**2)**0.5
-            if distancia < raio:
-                proibido = True
-                break
-    if proibido:
-        continue  # Ignorar pontos nas zonas proibidas
-
-    rua = via_aleatoria
-    regiao_pesos = crime_pesos_por_regiao.get(rua, [1]*6)
-    combined_pesos = [b * r for b, r in zip(base_pesos, regiao_pesos)]
-    tipo = random.choices(tipos_crime, weights=combined_pesos, k=1)[0]
-
-    # Ajuste de horário: aumentar chance de crime entre 21h e 3h
-    if 21 <= hora or hora <= 3:
-        padrao = padroes_por_regiao.get(rua, {})
-        if tipo in padrao.get("crimes_prioritarios", []):
-            tipo = random.choice([tipo] * 5 + random.choices(tipos_crime, weights=combined_pesos, k=2))
-
-    # Gerar idade com base na região e tipo de crime
-    idade = gerar_idade(rua, tipo)
-
-    # Gerar endereço
-    formato = random.choice(enderecos_asa_sul)
-    if "{bloco}" in formato:
-        endereco = formato.format(rua=rua, bloco=random.choice(blocos), num=random.randint(100, 999))
-    elif "{lote}" in formato:
-        endereco = formato.format(rua=rua, lote=random.choice(lotes), sala=random.choice(salas))
-    elif "{edificio}" in formato:
-        endereco = formato.format(rua=rua, edificio=random.choice(edificios), unidade=random.choice(unidades))
-
-    # Gerar outros dados
-    nome = fake.name()
-    cpf_formatado = fake.cpf()
-    email = fake.email()
-    telefone = fake.phone_number()
-
-    # Inserir NaN esporadicamente
-    if random.random() < 0.03:
-        nome = np.nan
-    if random.random() < 0.08:
-        idade = np.nan
-    if random.random() < 0.01:
-        tipo = np.nan
-    if random.random() < 0.2:
-        email = np.nan
-    if random.random() < 0.07:
-        telefone = np.nan
-    if random.random() < 0.09:
-        endereco = np.nan
-
-    risco = risco_mapa.get(rua, 2)
-
-    data.append({
+
+        # Verificar zonas proibidas
+        proibido = True
+        tentativas = 0
+        while proibido and tentativas < 10:
+            tentativas += 1
+            lat_base, lon_base = random.choice(setores_asa_sul[via_aleatoria])
+            lat, lon = gerar_variacao(lat_base, lon_base, tipo)
+            proibido = em_zona(lat, lon, zonas_proibidas)
+        if proibido:
+            continue  # Ignorar pontos nas zonas proibidas
+
+        rua = via_aleatoria
+        regiao_pesos = crime_pesos_por_regiao.get(rua, [1]*6)
+        combined_pesos = [b * r for b, r in zip(base_pesos, regiao_pesos)]
+        tipo = random.choices(tipos_crime, weights=combined_pesos, k=1)[0]
+
+        # Ajuste de horário: aumentar chance de crime entre 21h e 3h
+        if 21 <= hora or hora <= 3:
+            padrao = padroes_por_regiao.get(rua, {})
+            if tipo in padrao.get("crimes_prioritarios", []):
+                tipo = random.choice([tipo] * 5 + random.choices(tipos_crime, weights=combined_pesos, k=2))
+
+        # Gerar idade com base na região e tipo de crime
+        idade = gerar_idade(rua, tipo)
+
+        # Gerar endereço
+        formato = random.choice(enderecos_asa_sul)
+        if "{bloco}" in formato:
+            endereco = formato.format(rua=rua, bloco=random.choice(blocos), num=random.randint(100, 999))
+        elif "{lote}" in formato:
+            endereco = formato.format(rua=rua, lote=random.choice(lotes), sala=random.choice(salas))
+        elif "{edificio}" in formato:
+            endereco = formato.format(rua=rua, edificio=random.choice(edificios), unidade=random.choice(unidades))
+
+        # Gerar outros dados
+        nome = fake.name()
+        cpf_formatado = fake.cpf()
+        email = fake.email()
+        telefone = fake.phone_number()
+
+        # Inserir NaN esporadicamente
+        if random.random() < 0.03:
+            nome = np.nan
+        if random.random() < 0.08:
+            idade = np.nan
+        if random.random() < 0.01:
+            tipo = np.nan
+        if random.random() < 0.2:
+            email = np.nan
+        if random.random() < 0.07:
+            telefone = np.nan
+        if random.random() < 0.09:
+            endereco = np.nan
+
+        risco = risco_mapa.get(rua, 2)
+
+        data.append({
+            'latitude': lat,
+            'longitude': lon,
+            'data': data_str,
+            'hora': data_hora.strftime('%H:%M'),
+            'tipo_crime': tipo,
+            'bairro': 'Asa Sul',
+            'rua': rua,
+            'tipo_dia': tipo_dia,
+            'ano': data_hora.year,
+            'nome': nome,
+            'cpf': cpf_formatado,
+            'idade': idade,
+            'email': email,
+            'telefone': telefone,
+            'endereco': endereco,
+            'risco': risco
+        })
+
+    return data
+
+# Modo em lote: mesmas distribuições de gerar_registros, mas sorteadas como
+# arrays NumPy de uma só vez. Os dados pessoais saem de um pool pré-gerado pelo
+# Faker (ou são desligados com pii=False) em vez de uma chamada por linha.
+setores_lista = list(setores_asa_sul.keys())
+tipos_dia = ['dia_normal', 'final_semana', 'feriado']
+colunas_pii = ['nome', 'cpf', 'email', 'telefone']
+colunas_saida = ['latitude', 'longitude', 'data', 'hora', 'tipo_crime', 'bairro', 'rua', 'tipo_dia', 'ano',
+                 'nome', 'cpf', 'idade', 'email', 'telefone', 'endereco', 'risco']
+data_inicio = np.datetime64('2020-01-01')
+data_fim = np.datetime64('2025-12-31')
+
+# Sorteio categórico vetorizado: cada linha usa a linha `grupos[i]` da matriz de pesos
+def sortear_categorias(rng, pesos, grupos):
+    pesos = np.asarray(pesos, dtype=float)
+    acumulada = np.cumsum(pesos / pesos.sum(axis=1, keepdims=True), axis=1)
+    u = rng.random(len(grupos))
+    escolha = (u[:, None] >= acumulada[grupos]).sum(axis=1)
+    return np.minimum(escolha, pesos.shape[1] - 1)
+
+# Probabilidade de cada setor dado o primeiro tipo sorteado. Reproduz a escolha
+# com até 10 tentativas do laço original (regiões fora de setores_asa_sul são
+# descartadas e, se todas falharem, cai num setor uniforme).
+def probabilidades_regiao():
+    uniforme = np.full(len(setores_lista), 1 / len(setores_lista))
+    probs = np.zeros((len(tipos_crime), len(setores_lista)))
+    for i, tipo in enumerate(tipos_crime):
+        candidatas = crimes_regioes_prioritarias.get(tipo, []) * 5 + setores_lista
+        contagem = np.array([candidatas.count(s) for s in setores_lista], dtype=float)
+        p_falha = (1 - contagem.sum() / len(candidatas)) ** 10
+        probs[i] = (1 - p_falha) * contagem / contagem.sum() + p_falha * uniforme
+    return probs
+
+# Tabela com todos os endereços possíveis de cada setor (mesmos formatos de enderecos_asa_sul)
+def tabela_enderecos(setores):
+    tabela = []
+    for rua in setores:
+        tabela += [enderecos_asa_sul[0].format(rua=rua, bloco=b, num=n) for b in blocos for n in range(100, 1000)]
+        tabela += [enderecos_asa_sul[1].format(rua=rua, lote=l, sala=s) for l in lotes for s in salas]
+        tabela += [enderecos_asa_sul[2].format(rua=rua, edificio=e, unidade=u) for e in edificios for u in unidades]
+    return tabela
+
+# Endereço: formato uniforme e depois uniforme dentro do formato (códigos de tabela_enderecos)
+def sortear_enderecos(rng, rua):
+    tamanhos = np.array([len(blocos) * 900, len(lotes) * len(salas), len(edificios) * len(unidades)])
+    formato = rng.integers(0, 3, len(rua))
+    local = (rng.random(len(rua)) * tamanhos[formato]).astype(np.int64)
+    return rua * tamanhos.sum() + np.concatenate([[0], np.cumsum(tamanhos)[:-1]])[formato] + local
+
+# Pool de dados pessoais gerado uma única vez e reaproveitado por índice
+def gerar_pool_pii(tamanho=5000, seed=None):
+    gerador = Faker('pt_BR')
+    if seed is not None:
+        gerador.seed_instance(seed)
+    return {
+        'nome': pd.unique(np.array([gerador.name() for _ in range(tamanho)], dtype=object)),
+        'cpf': pd.unique(np.array([gerador.cpf() for _ in range(tamanho)], dtype=object)),
+        'email': pd.unique(np.array([gerador.email() for _ in range(tamanho)], dtype=object)),
+        'telefone': pd.unique(np.array([gerador.phone_number() for _ in range(tamanho)], dtype=object)),
+    }
+
+# Colunas pessoais sorteadas do pool, com NaN onde a máscara indicar
+def adicionar_pii(df, rng, pool, mascaras_nan):
+    for coluna in colunas_pii:
+        codigos = rng.integers(0, len(pool[coluna]), len(df))
+        if coluna in mascaras_nan:
+            codigos[mascaras_nan[coluna]] = -1
+        df[coluna] = pd.Categorical.from_codes(codigos, pool[coluna])
+
+def gerar_lote(num_registros, seed=None, pii=True, pool_pii=None):
+    rng = np.random.default_rng(seed)
+    n = num_registros
+    n_setores = len(setores_lista)
+
+    # Data e hora (hora noturna ~ N(23, 5) truncada, como em random_datetime)
+    dias = rng.integers(0, (data_fim - data_inicio).astype(int) + 1, n)
+    horas = np.trunc(rng.normal(23, 5, n)).astype(np.int64) % 24
+    minutos = rng.integers(0, 60, n)
+    datas = data_inicio + dias
+    dia_semana = (datas.astype(np.int64) + 3) % 7  # 1970-01-01 foi quinta-feira
+    feriado = np.isin(datas, np.array(feriados, dtype='datetime64[D]'))
+    tipo_dia = np.where(np.isin(dia_semana, [4, 5]), 1, np.where(feriado, 2, 0))
+
+    # Primeiro tipo de crime e região priorizada por ele
+    pesos_dia = np.array([pesos_tipos[t] for t in tipos_dia])
+    tipo_inicial = sortear_categorias(rng, pesos_dia, tipo_dia)
+    rua = sortear_categorias(rng, probabilidades_regiao(), tipo_inicial)
+
+    # Coordenadas base + variação, sorteando de novo até 10 vezes fora das zonas proibidas
+    pontos = np.concatenate([np.array(setores_asa_sul[s]) for s in setores_lista])
+    n_pontos = np.array([len(setores_asa_sul[s]) for s in setores_lista])
+    inicio_pontos = np.concatenate([[0], np.cumsum(n_pontos)[:-1]])
+    graves = np.isin(tipo_inicial, [tipos_crime.index('tráfico'), tipos_crime.index('homicídio')])
+    amplitude = np.where(graves, 0.003, 0.004)
+    lat = np.empty(n)
+    lon = np.empty(n)
+    pendentes = np.arange(n)
+    for _ in range(10):
+        if len(pendentes) == 0:
+            break
+        r = rua[pendentes]
+        k = inicio_pontos[r] + (rng.random(len(pendentes)) * n_pontos[r]).astype(np.int64)
+        lat[pendentes] = pontos[k, 0] + rng.uniform(-1, 1, len(pendentes)) * amplitude[pendentes]
+        lon[pendentes] = pontos[k, 1] + rng.uniform(-1, 1, len(pendentes)) * amplitude[pendentes]
+        pendentes = pendentes[em_zonas(lat[pendentes], lon[pendentes], zonas_proibidas)]
+    valido = np.ones(n, dtype=bool)
+    valido[pendentes] = False
+
+    # Tipo final com pesos do dia × pesos da região
+    pesos_regiao = np.array([crime_pesos_por_regiao.get(s, [1] * 6) for s in setores_lista])
+    combinados = (pesos_dia[:, None, :] * pesos_regiao[None, :, :]).reshape(-1, len(tipos_crime))
+    grupo = tipo_dia * n_setores + rua
+    tipo = sortear_categorias(rng, combinados, grupo)
+
+    # Reforço noturno: crime prioritário da região é mantido com chance 5/7
+    prioritario = np.array([[t in padroes_por_regiao.get(s, {}).get("crimes_prioritarios", []) for t in tipos_crime]
+                            for s in setores_lista])
+    noite = (horas >= 21) | (horas <= 3)
+    trocar = np.flatnonzero(noite & prioritario[rua, tipo] & (rng.random(n) < 2 / 7))
+    tipo[trocar] = sortear_categorias(rng, combinados, grupo[trocar])
+
+    # Idade (mesma regra de gerar_idade)
+    idade_min = np.array([padroes_por_regiao.get(s, {"idade_min": 14})["idade_min"] for s in setores_lista])
+    idade_max = np.array([padroes_por_regiao.get(s, {"idade_max": 70})["idade_max"] for s in setores_lista])
+    jovem = rng.random(n) < 0.4
+    idoso = ~jovem & (rng.random(n) < 0.2)
+    idade_livre = np.where(jovem, np.trunc(rng.normal(20, 5, n)),
+                           np.where(idoso, np.trunc(rng.normal(65, 5, n)), rng.integers(7, 91, n)))
+    idade_prioritaria = rng.integers(idade_min[rua], idade_max[rua] + 1)
+    idade = np.clip(np.where(prioritario[rua, tipo], idade_prioritaria, idade_livre), 7, 90).astype(float)
+
+    endereco = sortear_enderecos(rng, rua)
+
+    # NaN esporádicos (mesmas taxas do laço original)
+    nan_nome = rng.random(n) < 0.03
+    idade[rng.random(n) < 0.08] = np.nan
+    tipo[rng.random(n) < 0.01] = -1
+    nan_email = rng.random(n) < 0.2
+    nan_telefone = rng.random(n) < 0.07
+    endereco[rng.random(n) < 0.09] = -1
+
+    # Textos repetidos como categóricos (no CSV o resultado é idêntico)
+    datas_texto = np.datetime_as_string(data_inicio + np.arange((data_fim - data_inicio).astype(int) + 1))
+    horas_texto = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)]
+    risco = np.array([risco_mapa.get(s, 2) for s in setores_lista])
+    df = pd.DataFrame({
         'latitude': lat,
         'longitude': lon,
-        'data': data_str,
-        'hora': data_hora.strftime('%H:%M'),
-        'tipo_crime': tipo,
+        'data': pd.Categorical.from_codes(dias, datas_texto),
+        'hora': pd.Categorical.from_codes(horas * 60 + minutos, horas_texto),
+        'tipo_crime': pd.Categorical.from_codes(tipo, tipos_crime),
         'bairro': 'Asa Sul',
-        'rua': rua,
-        'tipo_dia': tipo_dia,
-        'ano': data_hora.year,
-        'nome': nome,
-        'cpf': cpf_formatado,
+        'rua': pd.Categorical.from_codes(rua, setores_lista),
+        'tipo_dia': pd.Categorical.from_codes(tipo_dia, tipos_dia),
+        'ano': datas.astype('datetime64[Y]').astype(np.int64) + 1970,
         'idade': idade,
-        'email': email,
-        'telefone': telefone,
-        'endereco': endereco,
-        'risco': risco
+        'endereco': pd.Categorical.from_codes(endereco, tabela_enderecos(setores_lista)),
+        'risco': risco[rua],
     })
 
-# Criar DataFrame e salvar CSV
-df = pd.DataFrame(data)
-df["__ERRO__"] = "ERRO_404"
-df["null"] = np.nan
-df.to_csv('crime_segunda_area.csv', index=False)
-print("✅ Arquivo 'crime_segunda_area.csv' criado com sucesso!")
\ No newline at end of file
+    if pii:
+        pool = pool_pii if pool_pii is not None else gerar_pool_pii(seed=seed)
+        adicionar_pii(df, rng, pool, {'nome': nan_nome, 'email': nan_email, 'telefone': nan_telefone})
+
+    df = df[valido].reset_index(drop=True)  # Ignorar pontos nas zonas proibidas
+    return df[[c for c in colunas_saida if c in df.columns]]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera o dataset sintético de crimes da Asa Sul")
+    parser.add_argument('--registros', type=int, default=30000, help="quantidade de registros")
+    parser.add_argument('--lote', action='store_true', help="usa o gerador vetorizado (NumPy) em vez do laço")
+    parser.add_argument('--seed', type=int, default=None, help="semente do modo em lote")
+    parser.add_argument('--sem-pii', action='store_true', help="não gera nome, cpf, email e telefone")
+    parser.add_argument('--saida', default='crime_segunda_area.csv', help="arquivo CSV de saída")
+    args = parser.parse_args()
+
+    if args.lote:
+        df = gerar_lote(args.registros, seed=args.seed, pii=not args.sem_pii)
+    else:
+        df = pd.DataFrame(gerar_registros(args.registros))
+        if args.sem_pii:
+            df = df.drop(columns=colunas_pii)
+
+    # Criar DataFrame e salvar CSV
+    df["__ERRO__"] = "ERRO_404"
+    df["null"] = np.nan
+    df.to_csv(args.saida, index=False)
+    print(f"✅ Arquivo '{args.saida}' criado com sucesso!")
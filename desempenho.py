@@ -0,0 +1,279 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+# Suíte de desempenho do dashboard: tempo e memória de pico de cada etapa pesada,
+# com dados sintéticos dos geradores do projeto em vários tamanhos (30 mil, 300 mil e 3 milhões).
+# As etapas são as mesmas chamadas do app (carga, filtros, agregados da EDA, correlação,
+# focos do mapa, pré-processamento, modelos e exportação PNG).
+# O tempo é medido sem nenhum rastreamento ligado. A memória de pico vem de outra execução, num
+# processo novo por etapa: a RSS que a etapa acrescenta à das dependências (inclui a memória nativa
+# do Arrow e do XGBoost). `--sem-memoria` pula esses processos, que repetem as dependências.
+#   python desempenho.py rodar --saida atual.json
+#   python desempenho.py comparar desempenho_base.json atual.json --tolerancia 0.2
+
+pasta_dados = 'dados_desempenho'
+arquivo_base = 'desempenho_base.json'
+tamanhos_padrao = [30_000, 300_000, 3_000_000]
+
+# Dataset do tamanho pedido (CSV e Parquet), gerado uma vez e reaproveitado nas rodadas seguintes
+def preparar_dataset(registros, pasta=pasta_dados, seed=42):
+    from dados import converter_csv
+    from geracao_paralela import carregar_gerador
+
+    os.makedirs(pasta, exist_ok=True)
+    csv = os.path.join(pasta, f"crimes_{registros}.csv")
+    parquet = os.path.join(pasta, f"crimes_{registros}.parquet")
+    if not os.path.exists(parquet):
+        df = carregar_gerador('asa_sul').gerar_lote(registros, seed=seed, pii=False)
+        df.to_csv(csv, index=False)
+        converter_csv(csv, parquet)
+    return csv, parquet
+
+def medir(funcao, repeticoes=1):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, {'segundos': melhor}
+
+def _maxrss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# Roda no processo filho (subcomando `memoria`): as dependências primeiro, depois a etapa com a RSS
+# amostrada a cada `intervalo` s; se a etapa bateu o recorde do processo, o ru_maxrss é o pico exato
+def pico_etapa(csv, parquet, etapa, intervalo=0.005):
+    from metricas import memoria_rss
+
+    lista = _etapas(csv, parquet)
+    necessarias = _necessarias(lista, [etapa])
+    ctx = {}
+    for nome, funcao, _ in lista:
+        if nome in necessarias and nome != etapa:
+            ctx[nome] = funcao(ctx)
+    funcao = next(funcao for nome, funcao, _ in lista if nome == etapa)
+
+    gc.collect()
+    base, recorde = memoria_rss(), _maxrss()
+    amostras = [base]
+    fim = threading.Event()
+
+    def amostrar():
+        while not fim.wait(intervalo):
+            amostras.append(memoria_rss())
+
+    amostrador = threading.Thread(target=amostrar, daemon=True)
+    amostrador.start()
+    resultado = funcao(ctx)
+    fim.set()
+    amostrador.join()
+    pico = max(max(amostras), memoria_rss())
+    if _maxrss() > recorde:
+        pico = max(pico, _maxrss())
+    del resultado
+    return (pico - base) / 2 ** 20
+
+def medir_memoria(csv, parquet, etapa):
+    saida = subprocess.run([sys.executable, os.path.abspath(__file__), 'memoria', csv, parquet, etapa],
+                           capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+# Etapas em ordem (nome, função, dependências); cada uma recebe o contexto com os resultados
+# das anteriores e devolve o seu resultado
+def _etapas(csv, parquet):
+    from cubo import consultar, contagem_por, montar_cubo, total
+    from dados import carregar_csv, carregar_parquet, colunas_dashboard, preparar
+
+    def carregar(ctx):
+        return preparar(carregar_parquet(parquet, colunas_dashboard, categorias=True))
+
+    def carregar_do_csv(ctx):
+        return preparar(carregar_csv(csv, colunas_dashboard, categorias=True))
+
+    # Mesmo filtro da barra lateral: metade dos tipos e uma hora
+    def filtrar(ctx):
+        from compartilhado import Visao, mascara_filtros
+        df = ctx['carregar_dados']
+        tipos = list(df['tipo_crime'].cat.categories[:3])
+        return Visao(df, mascara_filtros(df, tipos, 22))
+
+    def eda(consulta):
+        return lambda ctx: consulta(ctx['eda_cubo'])
+
+    noturnas = list(range(19, 24)) + list(range(0, 5))
+
+    def correlacao(ctx):
+        from correlacao import correlacao_mista
+        colunas = ["latitude", "longitude", 'tipo_crime', 'rua', 'tipo_dia', 'idade', 'ano', "hora"]
+        return correlacao_mista(ctx['carregar_dados'][colunas])
+
+    # Mesmo caminho do mapa (painel_dados.carregar_focos), com todos os tipos e horas
+    def focos(ctx):
+        from grade import agregar_grade
+        from hotspots import hotspots_grade, hotspots_pontos, limite_pontos
+        df = ctx['carregar_dados']
+        if len(df) > limite_pontos:
+            return hotspots_grade(agregar_grade(df['latitude'], df['longitude'], df['peso']))
+        return hotspots_pontos(df['latitude'], df['longitude'], df['peso'])
+
+    def preprocessar(ctx):
+        from sklearn.model_selection import train_test_split
+        from modelos import alvos, criar_preprocessor, features
+        df = ctx['carregar_dados']
+        X = criar_preprocessor().fit_transform(df[features])
+        return train_test_split(X, df[alvos], test_size=0.2, random_state=42)
+
+    def treinar(nome):
+        def etapa(ctx):
+            from modelos import classes_modelo, hiperparametros
+            X_train, _, y_train, _ = ctx['column_transformer']
+            return classes_modelo[nome](**hiperparametros[nome]).fit(X_train, y_train)
+        return etapa
+
+    def prever(treino):
+        return lambda ctx: ctx[treino].predict(ctx['column_transformer'][1])
+
+    def exportar_png(ctx):
+        from cache_graficos import CacheGraficos
+
+        def desenhar():
+            import seaborn as sns
+            from matplotlib.figure import Figure
+            crimes = contagem_por(ctx['eda_cubo'], 'tipo_crime').reset_index()
+            crimes.columns = ['tipo_crime', 'quantidade']
+            fig = Figure(figsize=(8, 4))
+            sns.barplot(data=crimes, x='quantidade', y='tipo_crime', palette='viridis', dodge=False,
+                        ax=fig.add_subplot())
+            fig.tight_layout()
+            return fig
+        return CacheGraficos().obter('grafico_tipo', desenhar)
+
+    return [
+        ('carregar_dados', carregar, []),
+        ('carregar_csv', carregar_do_csv, []),
+        ('filtros', filtrar, ['carregar_dados']),
+        ('eda_cubo', lambda ctx: montar_cubo(ctx['carregar_dados']), ['carregar_dados']),
+        ('eda_tipo', eda(lambda c: contagem_por(c, 'tipo_crime')), ['eda_cubo']),
+        ('eda_hora', eda(lambda c: consultar(c, 'hora')), ['eda_cubo']),
+        ('eda_regiao', eda(lambda c: contagem_por(c, 'rua')), ['eda_cubo']),
+        ('eda_risco', eda(lambda c: consultar(c, 'rua', medida='peso')), ['eda_cubo']),
+        ('eda_graves', eda(lambda c: consultar(c, 'hora', tipo_crime=['homicídio', 'tráfico'])), ['eda_cubo']),
+        ('eda_noturnos', eda(lambda c: (contagem_por(c, 'tipo_crime', hora=noturnas), total(c, hora=noturnas))),
+         ['eda_cubo']),
+        ('eda_ano', eda(lambda c: consultar(c, 'ano')), ['eda_cubo']),
+        ('eda_idade', lambda ctx: ctx['filtros']['idade'].dropna().astype(int), ['filtros']),
+        ('correlacao_mista', correlacao, ['carregar_dados']),
+        ('mapa_focos', focos, ['carregar_dados']),
+        ('column_transformer', preprocessar, ['carregar_dados']),
+        ('rf_treino', treinar("Random Forest"), ['column_transformer']),
+        ('rf_previsao', prever('rf_treino'), ['rf_treino']),
+        ('xgb_treino', treinar("XGBoost"), ['column_transformer']),
+        ('xgb_previsao', prever('xgb_treino'), ['xgb_treino']),
+        ('exportar_png', exportar_png, ['eda_cubo']),
+    ]
+
+# Etapas pedidas + as que elas precisam (transitivamente)
+def _necessarias(lista, etapas):
+    dependencias = {nome: deps for nome, _, deps in lista}
+    necessarias = set()
+    pendentes = list(etapas or dependencias)
+    while pendentes:
+        nome = pendentes.pop()
+        if nome not in necessarias:
+            necessarias.add(nome)
+            pendentes.extend(dependencias[nome])
+    return necessarias
+
+def rodar(tamanhos, etapas=None, repeticoes=1, pasta=pasta_dados, memoria=True):
+    resultado = {'python': sys.version.split()[0], 'maquina': platform.platform(),
+                 'processador': platform.processor() or platform.machine(), 'tamanhos': {}}
+    for registros in tamanhos:
+        csv, parquet = preparar_dataset(registros, pasta)
+        print(f"— {registros} registros")
+        lista = _etapas(csv, parquet)
+        necessarias = _necessarias(lista, etapas)
+        ctx = {}
+        medidas = {}
+        for nome, funcao, _ in lista:
+            if nome not in necessarias:
+                continue
+            # Dependências que não foram pedidas rodam uma vez só e não entram no resultado
+            pedida = not etapas or nome in etapas
+            ctx[nome], medida = medir(lambda: funcao(ctx), repeticoes if pedida else 1)
+            if not pedida:
+                continue
+            if memoria:
+                medida['pico_mb'] = medir_memoria(csv, parquet, nome)
+            medidas[nome] = medida
+            print(f"  {nome:<20} {medida['segundos']:>9.3f}s"
+                  + (f" {medida['pico_mb']:>9.1f} MB" if memoria else ""))
+        resultado['tamanhos'][str(registros)] = medidas
+    return resultado
+
+# Etapas mais lentas que a base além da tolerância (ignora as que levam menos de `minimo` segundos)
+def comparar(base, atual, tolerancia=0.2, minimo=0.05):
+    regressoes = []
+    for registros, medidas in atual['tamanhos'].items():
+        for nome, medida in medidas.items():
+            anterior = base['tamanhos'].get(registros, {}).get(nome)
+            if anterior is None:
+                continue
+            razao = medida['segundos'] / max(anterior['segundos'], 1e-9)
+            lento = razao > 1 + tolerancia and medida['segundos'] - anterior['segundos'] > minimo
+            marca = "⚠️ " if lento else "   "
+            memoria = ""
+            if 'pico_mb' in medida and 'pico_mb' in anterior:
+                memoria = f", memória {medida['pico_mb'] / max(anterior['pico_mb'], 1e-9):.2f}×"
+            print(f"{marca}{registros:>8} {nome:<20} {anterior['segundos']:>9.3f}s → {medida['segundos']:>9.3f}s "
+                  f"({razao:.2f}×{memoria})")
+            if lento:
+                regressoes.append((registros, nome, razao))
+    return regressoes
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Suíte de desempenho (tempo e memória de pico por etapa)")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    parser_rodar = comandos.add_parser('rodar', help="mede as etapas e grava o JSON")
+    parser_rodar.add_argument('--tamanhos', type=int, nargs='+', default=tamanhos_padrao, help="quantidades de registros")
+    parser_rodar.add_argument('--etapas', nargs='*', help="só estas etapas (padrão: todas)")
+    parser_rodar.add_argument('--repeticoes', type=int, default=1, help="repetições por etapa (fica o menor tempo)")
+    parser_rodar.add_argument('--pasta', default=pasta_dados, help="pasta dos datasets gerados")
+    parser_rodar.add_argument('--saida', default=arquivo_base, help="arquivo JSON de resultado")
+    parser_rodar.add_argument('--sem-memoria', action='store_true', help="só o tempo (sem os processos de memória)")
+
+    parser_comparar = comandos.add_parser('comparar', help="aponta as etapas mais lentas que a base")
+    parser_comparar.add_argument('base', help="JSON de referência")
+    parser_comparar.add_argument('atual', help="JSON da rodada nova")
+    parser_comparar.add_argument('--tolerancia', type=float, default=0.2, help="aumento relativo tolerado")
+    parser_comparar.add_argument('--minimo', type=float, default=0.05, help="diferença mínima (s) para apontar")
+    # Uso interno de rodar(): memória de pico de uma etapa, num processo novo
+    parser_memoria = comandos.add_parser('memoria', help="(interno) memória de pico de uma etapa")
+    parser_memoria.add_argument('csv')
+    parser_memoria.add_argument('parquet')
+    parser_memoria.add_argument('etapa')
+    args = parser.parse_args()
+
+    if args.comando == 'memoria':
+        print(json.dumps(pico_etapa(args.csv, args.parquet, args.etapa)))
+    elif args.comando == 'rodar':
+        resultado = rodar(args.tamanhos, args.etapas, args.repeticoes, args.pasta, not args.sem_memoria)
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, indent=2)
+        print(f"✅ resultados gravados em '{args.saida}'")
+    else:
+        with open(args.base, encoding='utf-8') as arquivo:
+            base = json.load(arquivo)
+        with open(args.atual, encoding='utf-8') as arquivo:
+            atual = json.load(arquivo)
+        regressoes = comparar(base, atual, args.tolerancia, args.minimo)
+        print(f"{len(regressoes)} etapa(s) mais lenta(s) que a base" if regressoes else "✅ nenhuma regressão")
+        sys.exit(1 if regressoes else 0)
@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dados import carregar_compacto, versao_dados
+from grade import centro_celula, indices_celula
+from hotspots import focos_vazios, hotspots_grade
+
+# Tabela pré-calculada de focos para todas as combinações de
+# (hora, subconjunto de tipos de crime, tipo_dia), calculada num pool de processos.
+# As ocorrências são agregadas uma vez por (célula da grade, hora, tipo, tipo_dia);
+# esses vetores vão para memória compartilhada e cada processo só os lê, filtra a
+# combinação e agrupa as células com hotspots_grade.
+# No arquivo: hora -1 = "Geral", tipo_dia -1 = todos, `tipos` = máscara de bits na
+# ordem de categorias de `tipo_crime` (guardada nos metadados, junto com a versão dos dados).
+# Se houver ocorrências sem tipo, elas têm o último bit, com o rótulo `tipo_nulo` (o mesmo que o
+# app.py usa para o NaN da barra lateral, que vem selecionado por padrão).
+
+arquivo_focos = 'focos_por_hora.parquet'
+tipo_nulo = 'NaN'
+
+esquema = pa.schema([
+    ('hora', pa.int8()),
+    ('tipos', pa.int32()),
+    ('tipo_dia', pa.int8()),
+    ('ordem', pa.int16()),
+    ('latitude', pa.float32()),
+    ('longitude', pa.float32()),
+    ('contagem', pa.int32()),
+    ('peso', pa.float32()),
+])
+
+_compartilhado = {}
+
+# Ocorrências agregadas por (célula, hora, tipo, tipo_dia), com somas para os centroides exatos;
+# o tipo nulo vira o código logo depois da última categoria
+def agregar_celulas(df):
+    df = df.dropna(subset=['latitude', 'longitude'])
+    linha, coluna = indices_celula(df['latitude'], df['longitude'])
+    chaves = pd.DataFrame({
+        'linha': linha,
+        'coluna': coluna,
+        'hora': df['hora'].fillna(-1).to_numpy(np.int64),
+        'tipo': df['tipo_crime'].cat.codes.replace(-1, len(df['tipo_crime'].cat.categories)).to_numpy(np.int64),
+        'dia': df['tipo_dia'].cat.codes.to_numpy(np.int64),
+        'peso': df['peso'].to_numpy(np.float64),
+        'soma_lat': df['latitude'].to_numpy(np.float64),
+        'soma_lon': df['longitude'].to_numpy(np.float64),
+    })
+    agregado = chaves.groupby(['linha', 'coluna', 'hora', 'tipo', 'dia'], sort=False).agg(
+        contagem=('peso', 'size'), peso=('peso', 'sum'), soma_lat=('soma_lat', 'sum'), soma_lon=('soma_lon', 'sum'))
+    agregado = agregado.reset_index()
+    largura = agregado['coluna'].max() - agregado['coluna'].min() + 1
+    agregado['celula'] = (agregado['linha'] - agregado['linha'].min()) * largura + agregado['coluna'] - agregado['coluna'].min()
+    return agregado
+
+def _compartilhar(vetores):
+    blocos, descricao = [], {}
+    for nome, vetor in vetores.items():
+        vetor = np.ascontiguousarray(vetor)
+        bloco = shared_memory.SharedMemory(create=True, size=max(vetor.nbytes, 1))
+        np.ndarray(vetor.shape, vetor.dtype, buffer=bloco.buf)[:] = vetor
+        blocos.append(bloco)
+        descricao[nome] = (bloco.name, vetor.dtype.str, vetor.shape)
+    return blocos, descricao
+
+# Inicializador do processo: abre os blocos compartilhados como arrays somente leitura
+def _abrir(descricao):
+    for nome, (bloco, tipo, forma) in descricao.items():
+        memoria = shared_memory.SharedMemory(name=bloco)
+        vetor = np.ndarray(forma, np.dtype(tipo), buffer=memoria.buf)
+        vetor.flags.writeable = False
+        _compartilhado[nome] = (memoria, vetor)
+
+def _focos_combinacao(selecao):
+    v = {nome: vetor for nome, (_, vetor) in _compartilhado.items()}
+    celulas, inverso = np.unique(v['celula'][selecao], return_inverse=True)
+    contagem = np.bincount(inverso, weights=v['contagem'][selecao])
+    primeira = np.zeros(len(celulas), np.int64)
+    primeira[inverso] = np.flatnonzero(selecao)
+    lat, lon = centro_celula(v['linha'][primeira], v['coluna'][primeira])
+    grade = pd.DataFrame({
+        'linha': v['linha'][primeira],
+        'coluna': v['coluna'][primeira],
+        'latitude': lat,
+        'longitude': lon,
+        'contagem': contagem,
+        'peso': np.bincount(inverso, weights=v['peso'][selecao]),
+        'lat_media': np.bincount(inverso, weights=v['soma_lat'][selecao]) / contagem,
+        'lon_media': np.bincount(inverso, weights=v['soma_lon'][selecao]) / contagem,
+    })
+    return hotspots_grade(grade)
+
+# Todas as combinações de uma hora (tarefa de um processo)
+def focos_da_hora(hora, n_tipos, n_dias):
+    v = {nome: vetor for nome, (_, vetor) in _compartilhado.items()}
+    na_hora = np.ones(len(v['hora']), bool) if hora == -1 else v['hora'] == hora
+    bit_tipo = np.left_shift(1, v['tipo'])
+    partes = []
+    for mascara in range(1, 2 ** n_tipos):
+        nos_tipos = na_hora & ((bit_tipo & mascara) > 0)
+        for dia in range(-1, n_dias):
+            selecao = nos_tipos if dia == -1 else nos_tipos & (v['dia'] == dia)
+            if not selecao.any():
+                continue
+            focos = _focos_combinacao(selecao)
+            if focos.empty:
+                continue
+            focos.insert(0, 'ordem', np.arange(len(focos)))
+            focos.insert(0, 'tipo_dia', dia)
+            focos.insert(0, 'tipos', mascara)
+            focos.insert(0, 'hora', hora)
+            partes.append(focos)
+    if not partes:
+        return hora, pd.DataFrame(columns=esquema.names)
+    return hora, pd.concat(partes, ignore_index=True)
+
+def gerar_tabela_focos(destino=arquivo_focos, processos=None):
+    inicio = time.perf_counter()
+    df = carregar_compacto()
+    tipos = list(df['tipo_crime'].cat.categories)
+    if df['tipo_crime'].isna().any():
+        tipos.append(tipo_nulo)
+    dias = list(df['tipo_dia'].cat.categories)
+    agregado = agregar_celulas(df)
+    vetores = {c: agregado[c].to_numpy(np.float64 if c in ('peso', 'soma_lat', 'soma_lon') else np.int64)
+               for c in ['celula', 'linha', 'coluna', 'hora', 'tipo', 'dia', 'contagem', 'peso', 'soma_lat', 'soma_lon']}
+
+    blocos, descricao = _compartilhar(vetores)
+    partes = []
+    try:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_abrir, initargs=(descricao,)) as executor:
+            tarefas = [executor.submit(focos_da_hora, hora, len(tipos), len(dias)) for hora in range(-1, 24)]
+            for concluidos, tarefa in enumerate(as_completed(tarefas), start=1):
+                hora, focos = tarefa.result()
+                partes.append(focos)
+                print(f"hora {'Geral' if hora == -1 else f'{hora:02d}'}: {len(focos)} focos ({concluidos}/{len(tarefas)})")
+    finally:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+
+    tabela = pd.concat(partes, ignore_index=True).sort_values(['hora', 'tipos', 'tipo_dia', 'ordem'])
+    tabela = tabela.astype({campo.name: campo.type.to_pandas_dtype() for campo in esquema})
+    tabela = pa.Table.from_pandas(tabela[esquema.names], schema=esquema, preserve_index=False)
+    tabela = tabela.replace_schema_metadata({'versao': versao_dados(), 'tipos': json.dumps(tipos),
+                                             'tipos_dia': json.dumps(dias)})
+    pq.write_table(tabela, destino, compression='zstd')
+    print(f"✅ {tabela.num_rows} focos gravados em '{destino}' em {time.perf_counter() - inicio:.1f}s")
+    return tabela.num_rows
+
+# Tabela indexada por (hora, tipos, tipo_dia); None se não existir ou for de outra versão dos dados
+def ler_tabela_focos(caminho=arquivo_focos, versao=None):
+    if not os.path.exists(caminho):
+        return None
+    tabela = pq.read_table(caminho)
+    metadados = {k.decode(): v.decode() for k, v in (tabela.schema.metadata or {}).items()}
+    if versao is not None and metadados.get('versao') != versao:
+        return None
+    focos = tabela.to_pandas(ignore_metadata=True).set_index(['hora', 'tipos', 'tipo_dia']).sort_index()
+    return {'focos': focos, 'tipos': json.loads(metadados['tipos']), 'tipos_dia': json.loads(metadados['tipos_dia'])}
+
+# Focos de um estado dos filtros (hora "Geral" ou 0–23, tipos selecionados, tipo_dia ou None).
+# O tipo nulo pode vir como NaN ou como `tipo_nulo`. Devolve None se a combinação não puder ser
+# respondida pela tabela (ex.: tipo que não existia quando ela foi gerada).
+def consultar_focos(tabela, hora, tipos, tipo_dia=None):
+    tipos = [tipo_nulo if pd.isna(t) else t for t in tipos]
+    if any(t not in tabela['tipos'] for t in tipos):
+        return None
+    mascara = sum(1 << tabela['tipos'].index(t) for t in set(tipos))
+    chave = (-1 if hora == "Geral" else int(hora), mascara,
+             -1 if tipo_dia is None else tabela['tipos_dia'].index(tipo_dia))
+    if chave not in tabela['focos'].index:
+        return focos_vazios()
+    focos = tabela['focos'].loc[[chave]].reset_index(drop=True)
+    return focos.sort_values('ordem')[['latitude', 'longitude', 'contagem', 'peso']].reset_index(drop=True)
+
+# O filtro padrão do dashboard (todos os tipos da barra lateral, inclusive o nulo) tem de sair da
+# tabela, com os mesmos focos do cálculo ao vivo sobre a grade
+def verificar_filtro_padrao(caminho=arquivo_focos):
+    from grade import agregar_grade
+
+    df = carregar_compacto()
+    tabela = ler_tabela_focos(caminho, versao=versao_dados())
+    assert tabela is not None, f"'{caminho}' não existe ou é de outra versão dos dados"
+    filtro = tuple(sorted(tipo_nulo if pd.isna(t) else t for t in df['tipo_crime'].unique()))
+    for hora in ("Geral", 22):
+        focos = consultar_focos(tabela, hora, filtro)
+        assert focos is not None, f"hora {hora}: o filtro padrão não é respondido pela tabela"
+        linhas = df if hora == "Geral" else df[df['hora'] == hora]
+        ao_vivo = hotspots_grade(agregar_grade(linhas['latitude'], linhas['longitude'], linhas['peso']))
+        assert focos['contagem'].tolist() == ao_vivo['contagem'].tolist(), f"hora {hora}: focos diferentes"
+    print(f"✅ filtro padrão ({len(filtro)} tipos) respondido pela tabela")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pré-calcula os focos por hora, tipos de crime e tipo de dia")
+    parser.add_argument('--destino', default=arquivo_focos, help="arquivo Parquet de saída")
+    parser.add_argument('--processos', type=int, default=None, help="processos no pool (padrão: núcleos da máquina)")
+    parser.add_argument('--verificar', action='store_true', help="só confere o filtro padrão na tabela existente")
+    args = parser.parse_args()
+
+    if args.verificar:
+        verificar_filtro_padrao(args.destino)
+    else:
+        gerar_tabela_focos(args.destino, args.processos)
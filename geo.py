@@ -0,0 +1,126 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+# Distâncias geográficas do projeto, num só lugar (erro do modelo em metros, focos,
+# grade do mapa, zonas proibidas dos geradores e rotas).
+#   haversine / equiretangular: distância ponto a ponto (pares), com broadcasting;
+#   matriz:                     distâncias N×M;
+#   projetar / desprojetar:     lat/lon ↔ metros num plano local (equiretangular).
+# As entradas grandes são processadas em blocos, para a memória temporária não passar
+# de `limite_mb`; com dtype=np.float32 a saída ocupa metade.
+
+raio_terra = 6_371_000.0
+metros_por_grau = np.pi * raio_terra / 180   # um grau de latitude, em metros
+limite_mb = 256
+
+# Arrays temporários (float64) por elemento, para dimensionar os blocos
+_temporarios = 8
+
+def _tamanho_bloco(limite=limite_mb, colunas=1):
+    return max(1, int(limite * 2 ** 20 // (_temporarios * 8 * colunas)))
+
+def _haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * raio_terra * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def _equiretangular(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, np.float64)) for v in (lat1, lon1, lat2, lon2))
+    x = (lon2 - lon1) * np.cos((lat1 + lat2) / 2)
+    return raio_terra * np.hypot(x, lat2 - lat1)
+
+_kernels = {'haversine': _haversine, 'equiretangular': _equiretangular}
+
+def _pares(kernel, lat1, lon1, lat2, lon2, dtype, limite):
+    valores = np.broadcast_arrays(*(np.asarray(v, np.float64) for v in (lat1, lon1, lat2, lon2)))
+    if valores[0].ndim == 0:
+        return dtype(kernel(*valores))
+    forma = valores[0].shape
+    valores = [v.ravel() for v in valores]
+    saida = np.empty(len(valores[0]), dtype)
+    passo = _tamanho_bloco(limite)
+    for inicio in range(0, len(saida), passo):
+        fatia = slice(inicio, inicio + passo)
+        saida[fatia] = kernel(*(v[fatia] for v in valores))
+    return saida.reshape(forma)
+
+def haversine(lat1, lon1, lat2, lon2, dtype=np.float64, limite=limite_mb):
+    return _pares(_haversine, lat1, lon1, lat2, lon2, dtype, limite)
+
+# Aproximação plana: mais rápida e com erro desprezível nas distâncias de uma cidade
+def equiretangular(lat1, lon1, lat2, lon2, dtype=np.float64, limite=limite_mb):
+    return _pares(_equiretangular, lat1, lon1, lat2, lon2, dtype, limite)
+
+# Distâncias de cada ponto de (lat1, lon1) para cada ponto de (lat2, lon2), em blocos de linhas
+def matriz(lat1, lon1, lat2, lon2, metodo='haversine', dtype=np.float32, limite=limite_mb):
+    lat1, lon1 = np.asarray(lat1, np.float64).ravel(), np.asarray(lon1, np.float64).ravel()
+    lat2, lon2 = np.asarray(lat2, np.float64).ravel(), np.asarray(lon2, np.float64).ravel()
+    saida = np.empty((len(lat1), len(lat2)), dtype)
+    passo = _tamanho_bloco(limite, max(len(lat2), 1))
+    kernel = _kernels[metodo]
+    for inicio in range(0, len(lat1), passo):
+        fatia = slice(inicio, inicio + passo)
+        saida[fatia] = kernel(lat1[fatia, None], lon1[fatia, None], lat2[None, :], lon2[None, :])
+    return saida
+
+# lat/lon → (x, y) em metros a partir de `origem` (lat, lon), e o caminho de volta
+def projetar(lat, lon, origem):
+    y = (np.asarray(lat, np.float64) - origem[0]) * metros_por_grau
+    x = (np.asarray(lon, np.float64) - origem[1]) * metros_por_grau * np.cos(np.radians(origem[0]))
+    return x, y
+
+def desprojetar(x, y, origem):
+    lat = origem[0] + np.asarray(y, np.float64) / metros_por_grau
+    lon = origem[1] + np.asarray(x, np.float64) / (metros_por_grau * np.cos(np.radians(origem[0])))
+    return lat, lon
+
+def graus_para_metros(graus):
+    return np.asarray(graus, np.float64) * metros_por_grau
+
+def metros_para_graus(metros):
+    return np.asarray(metros, np.float64) / metros_por_grau
+
+# Pontos dentro de alguma zona circular (lat, lon, raio em graus de latitude), como `zonas_proibidas`
+def em_zonas(lat, lon, zonas):
+    centros = np.array([(z[0], z[1]) for z in zonas], np.float64)
+    raios = graus_para_metros([z[2] for z in zonas])
+    escalar = np.ndim(lat) == 0
+    distancias = matriz(np.atleast_1d(lat), np.atleast_1d(lon), centros[:, 0], centros[:, 1], dtype=np.float64)
+    dentro = (distancias < raios[None, :]).any(axis=1)
+    return bool(dentro[0]) if escalar else dentro
+
+# Mesma regra de em_zonas para um único ponto, em floats do Python: nos laços linha a linha dos geradores
+# o em_zonas vetorizado custa ~45 µs por chamada só de montar os arrays
+def em_zona(lat, lon, zonas):
+    for zona in zonas:
+        a = (math.sin(math.radians(zona[0] - lat) / 2) ** 2 + math.cos(math.radians(lat))
+             * math.cos(math.radians(zona[0])) * math.sin(math.radians(zona[1] - lon) / 2) ** 2)
+        if 2 * raio_terra * math.asin(math.sqrt(min(a, 1.0))) < zona[2] * metros_por_grau:
+            return True
+    return False
+
+def benchmark(pares, seed=42):
+    rng = np.random.default_rng(seed)
+    lat1, lat2 = rng.uniform(-15.85, -15.78, (2, pares))
+    lon1, lon2 = rng.uniform(-47.93, -47.87, (2, pares))
+    for nome, funcao in (('haversine', haversine), ('equiretangular', equiretangular)):
+        for dtype in (np.float64, np.float32):
+            inicio = time.perf_counter()
+            funcao(lat1, lon1, lat2, lon2, dtype=dtype)
+            segundos = time.perf_counter() - inicio
+            print(f"{nome} ({np.dtype(dtype).name}): {pares / segundos / 1e6:.1f} M pares/s ({segundos:.2f}s)")
+    lado = int(np.sqrt(pares))
+    inicio = time.perf_counter()
+    matriz(lat1[:lado], lon1[:lado], lat2[:lado], lon2[:lado])
+    segundos = time.perf_counter() - inicio
+    print(f"matriz {lado}×{lado} (float32): {lado * lado / segundos / 1e6:.1f} M pares/s ({segundos:.2f}s)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Vazão dos kernels de distância geográfica")
+    parser.add_argument('--pares', type=int, default=10_000_000, help="quantidade de pares de pontos")
+    args = parser.parse_args()
+
+    benchmark(args.pares)
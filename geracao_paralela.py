@@ -0,0 +1,88 @@
+import argparse
+import importlib.util
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# Geração paralela e particionada dos dados sintéticos.
+# O total de registros é dividido em shards de tamanho fixo; cada shard tem a sua
+# própria semente (derivada da semente global e do número do shard), então o
+# resultado de um shard é sempre o mesmo, independente do número de processos.
+# Cada shard grava direto os seus arquivos em <saida>/ano=<ano>/parte-<shard>.csv,
+# assim a memória de pico fica limitada ao tamanho do shard.
+
+# Geradores disponíveis: nome → script com gerar_lote()
+geradores = {
+    'asa_sul': 'dados_asa_sul.py',
+    'geral': 'Dados Fake.py'
+}
+
+_modulos = {}
+_pools_pii = {}
+
+# Carrega o script do gerador como módulo ("Dados Fake.py" tem espaço no nome)
+def carregar_gerador(nome):
+    if nome not in _modulos:
+        caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), geradores[nome])
+        spec = importlib.util.spec_from_file_location(f"gerador_{nome}", caminho)
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        _modulos[nome] = modulo
+    return _modulos[nome]
+
+def seed_do_shard(seed, shard):
+    return int(np.random.SeedSequence([seed, shard]).generate_state(1)[0])
+
+# Gera um shard e grava uma partição por ano
+def gerar_shard(shard, registros, seed, gerador='asa_sul', saida='crime_segunda_area', pii=True):
+    modulo = carregar_gerador(gerador)
+    pool = None
+    if pii:
+        # O pool de PII depende só da semente global: é o mesmo em todos os shards
+        if (gerador, seed) not in _pools_pii:
+            _pools_pii[(gerador, seed)] = modulo.gerar_pool_pii(seed=seed)
+        pool = _pools_pii[(gerador, seed)]
+
+    df = modulo.gerar_lote(registros, seed=seed_do_shard(seed, shard), pii=pii, pool_pii=pool)
+    df["__ERRO__"] = "ERRO_404"
+    df["null"] = np.nan
+
+    for ano, parte in df.groupby('ano', sort=True):
+        pasta = os.path.join(saida, f"ano={ano}")
+        os.makedirs(pasta, exist_ok=True)
+        parte.to_csv(os.path.join(pasta, f"parte-{shard:05d}.csv"), index=False)
+    return shard, len(df)
+
+def gerar_particionado(num_registros, saida='crime_segunda_area', seed=42, processos=None,
+                       tamanho_shard=1_000_000, gerador='asa_sul', pii=True):
+    tamanhos = [tamanho_shard] * (num_registros // tamanho_shard)
+    if num_registros % tamanho_shard:
+        tamanhos.append(num_registros % tamanho_shard)
+
+    total = 0
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        tarefas = [executor.submit(gerar_shard, shard, registros, seed, gerador, saida, pii)
+                   for shard, registros in enumerate(tamanhos)]
+        for concluidos, tarefa in enumerate(as_completed(tarefas), start=1):
+            shard, linhas = tarefa.result()
+            total += linhas
+            print(f"shard {shard:05d}: {linhas} registros ({concluidos}/{len(tarefas)})")
+    print(f"✅ {total} registros gravados em '{saida}' em {time.perf_counter() - inicio:.1f}s")
+    return total
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Geração paralela e particionada por ano dos dados sintéticos")
+    parser.add_argument('--registros', type=int, default=30000, help="quantidade total de registros")
+    parser.add_argument('--saida', default='crime_segunda_area', help="pasta de saída das partições")
+    parser.add_argument('--seed', type=int, default=42, help="semente global (cada shard deriva a sua)")
+    parser.add_argument('--processos', type=int, default=None, help="processos no pool (padrão: núcleos da máquina)")
+    parser.add_argument('--tamanho-shard', type=int, default=1_000_000, help="registros por shard")
+    parser.add_argument('--gerador', choices=sorted(geradores), default='asa_sul', help="script gerador")
+    parser.add_argument('--sem-pii', action='store_true', help="não gera nome, cpf, email e telefone")
+    args = parser.parse_args()
+
+    gerar_particionado(args.registros, saida=args.saida, seed=args.seed, processos=args.processos,
+                       tamanho_shard=args.tamanho_shard, gerador=args.gerador, pii=not args.sem_pii)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from geo import desprojetar, projetar
+
+# Grade espacial fixa, em metros, para o mapa de calor.
+# Cada ponto vira (linha, coluna) de uma célula quadrada de `tamanho` metros, numa
+# projeção equiretangular com origem fixa no Plano Piloto (as células são as mesmas
+# em qualquer filtro e versão dos dados). O mapa recebe só as células ocupadas,
+# com a contagem e a soma de `peso` de cada uma, em vez de um ponto por ocorrência.
+
+origem = (-15.90, -47.98)      # canto sudoeste da grade (lat, lon)
+tamanho_celula = 50            # metros
+
+colunas_grade = ['linha', 'coluna', 'latitude', 'longitude', 'contagem', 'peso', 'lat_media', 'lon_media']
+
+def indices_celula(lat, lon, tamanho=tamanho_celula):
+    x, y = projetar(lat, lon, origem)
+    return np.floor(y / tamanho).astype(np.int64), np.floor(x / tamanho).astype(np.int64)
+
+# Coordenadas do centro das células
+def centro_celula(linha, coluna, tamanho=tamanho_celula):
+    return desprojetar((np.asarray(coluna) + 0.5) * tamanho, (np.asarray(linha) + 0.5) * tamanho, origem)
+
+# Contagem e soma de `peso` por célula ocupada (sem peso, soma 1 por ocorrência).
+# `lat_media`/`lon_media` são a média dos pontos da célula (centroides exatos ao agrupar células).
+def agregar_grade(lat, lon, peso=None, tamanho=tamanho_celula):
+    lat = np.asarray(lat, np.float64)
+    lon = np.asarray(lon, np.float64)
+    peso = np.ones_like(lat) if peso is None else np.asarray(peso, np.float64)
+    validos = ~(np.isnan(lat) | np.isnan(lon))
+    if not validos.any():
+        return pd.DataFrame(columns=colunas_grade)
+    lat, lon, peso = lat[validos], lon[validos], peso[validos]
+
+    linha, coluna = indices_celula(lat, lon, tamanho)
+    linha_min, coluna_min = linha.min(), coluna.min()
+    largura = coluna.max() - coluna_min + 1
+    celulas, inverso = np.unique((linha - linha_min) * largura + (coluna - coluna_min), return_inverse=True)
+    linhas = celulas // largura + linha_min
+    colunas = celulas % largura + coluna_min
+    centro_lat, centro_lon = centro_celula(linhas, colunas, tamanho)
+    contagem = np.bincount(inverso, minlength=len(celulas))
+    return pd.DataFrame({
+        'linha': linhas,
+        'coluna': colunas,
+        'latitude': centro_lat,
+        'longitude': centro_lon,
+        'contagem': contagem,
+        'peso': np.bincount(inverso, weights=np.nan_to_num(peso), minlength=len(celulas)),
+        'lat_media': np.bincount(inverso, weights=lat, minlength=len(celulas)) / contagem,
+        'lon_media': np.bincount(inverso, weights=lon, minlength=len(celulas)) / contagem,
+    })
@@ -0,0 +1,139 @@
+from cubo import consultar, contagem_por, total
+
+# Gráficos da análise exploratória, sem Streamlit: os dados de cada gráfico saem do cubo
+# (ver cubo.py) e cada função `desenhar_*` devolve uma matplotlib.figure.Figure, que é o que
+# cache_graficos.py rasteriza. Usado pela aba 1 (painel_eda.py) e pelo relatório (relatorio.py).
+# `tipos`/`horas` None = sem filtro nesse eixo.
+
+horas_noturnas = list(range(19, 24)) + list(range(0, 5))
+tipos_graves = ['homicídio', 'tráfico']
+
+# Figura própria de cada gráfico, sem o pyplot: a "figura atual" do pyplot é uma só por processo,
+# e as sessões do dashboard desenham em threads ao mesmo tempo
+def _figura(largura, altura):
+    import seaborn as sns
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(largura, altura))
+    return fig, fig.add_subplot(), sns
+
+def crimes_por_tipo(cubo, tipos=None, horas=None):
+    crimes = contagem_por(cubo, 'tipo_crime', tipo_crime=tipos, hora=horas).reset_index()
+    crimes.columns = ['tipo_crime', 'quantidade']
+    crimes['porcentagem'] = (crimes['quantidade'] / total(cubo, tipo_crime=tipos, hora=horas)) * 100
+    return crimes
+
+def crimes_por_hora(cubo):
+    por_hora = consultar(cubo, 'hora')
+    return por_hora[por_hora > 0]
+
+def top_regioes(cubo, tipos=None, horas=None, n=10):
+    crimes_por_rua = contagem_por(cubo, 'rua', tipo_crime=tipos, hora=horas).reset_index()
+    crimes_por_rua.columns = ['rua', 'quantidade']
+    return crimes_por_rua.head(n)
+
+def risco_por_regiao(cubo, tipos=None, horas=None, n=5):
+    risco_por_rua = consultar(cubo, 'rua', medida='peso', tipo_crime=tipos, hora=horas)
+    ocorrencias_rua = consultar(cubo, 'rua', tipo_crime=tipos, hora=horas)
+    risco_por_rua = risco_por_rua[ocorrencias_rua > 0].rename_axis('rua').reset_index(name='risco_total')
+    return risco_por_rua.sort_values(by='risco_total', ascending=False).head(n)
+
+def horarios_graves(cubo, horas=None):
+    graves = consultar(cubo, 'hora', tipo_crime=tipos_graves, hora=horas)
+    return graves[graves > 0]
+
+# (frequência por tipo entre 19h e 04h, total noturno)
+def crimes_noturnos(cubo, tipos=None):
+    return crimes_por_tipo(cubo, tipos, horas_noturnas), total(cubo, tipo_crime=tipos, hora=horas_noturnas)
+
+def crimes_por_ano(cubo, tipos=None, horas=None):
+    por_ano = consultar(cubo, 'ano', tipo_crime=tipos, hora=horas)
+    return por_ano[por_ano > 0]
+
+def desenhar_barras_tipo(crimes, titulo="Frequência de Tipos de Crime"):
+    fig, ax, sns = _figura(8, 4)
+    sns.barplot(data=crimes, x='quantidade', y='tipo_crime', palette='viridis', dodge=False, ax=ax)
+    ax.set_title(titulo, fontsize=12)
+    ax.set_xlabel("Quantidade", fontsize=10)
+    ax.set_ylabel("Tipo de Crime", fontsize=10)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+def desenhar_pizza_tipo(crimes, titulo="Distribuição de Crimes por Tipo"):
+    fig, ax, _ = _figura(6, 4)
+    ax.pie(crimes['quantidade'], labels=crimes['tipo_crime'], autopct='%1.1f%%', startangle=90)
+    ax.set_title(titulo, fontsize=12)
+    ax.axis('equal')
+    fig.tight_layout()
+    return fig
+
+def desenhar_hora(por_hora):
+    colors = ['orange' if h >= 19 or h <= 4 else 'skyblue' for h in por_hora.index]
+    fig, ax, sns = _figura(10, 4)
+    sns.barplot(x=por_hora.index, y=por_hora.values, palette=colors, ax=ax)
+    ax.set_title("Quantidade de Crimes por Hora do Dia", fontsize=12)
+    ax.set_xlabel("Hora", fontsize=10)
+    ax.set_ylabel("Quantidade", fontsize=10)
+    ax.set_xticks(range(0, 24))
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+def desenhar_regiao(top_ruas):
+    fig, ax, sns = _figura(10, 4)
+    sns.barplot(data=top_ruas, x='quantidade', y='rua', palette='viridis', dodge=False, ax=ax)
+    ax.set_title("Top 10 Regiões com Mais Crimes", fontsize=12)
+    ax.set_xlabel("Quantidade", fontsize=10)
+    ax.set_ylabel("Região", fontsize=10)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+def desenhar_risco(risco_por_rua):
+    fig, ax, sns = _figura(10, 4)
+    sns.barplot(data=risco_por_rua, x='risco_total', y='rua', palette='viridis', dodge=False, ax=ax)
+    ax.set_title("Risco por Região (Gravidade Acumulada)", fontsize=12)
+    ax.set_xlabel("Risco Total", fontsize=10)
+    ax.set_ylabel("Região", fontsize=10)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+def desenhar_graves(graves):
+    fig, ax, sns = _figura(10, 4)
+    sns.barplot(x=graves.index, y=graves.values, palette='coolwarm', dodge=False, ax=ax)
+    ax.set_title("Horários com Mais Crimes Graves", fontsize=12)
+    ax.set_xlabel("Hora", fontsize=10)
+    ax.set_ylabel("Quantidade", fontsize=10)
+    ax.set_xticks(range(0, 24, 2))
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+# `idades` em linhas (aba 1) ou já contadas, com a contagem em `pesos` (relatório)
+def desenhar_idade(idades, pesos=None):
+    fig, ax, sns = _figura(10, 4)
+    sns.histplot(x=idades, weights=pesos, bins=20, kde=True, color='teal', ax=ax)
+    ax.set_title("Distribuição de Crimes por Idade", fontsize=12)
+    ax.set_xlabel("Idade", fontsize=10)
+    ax.set_ylabel("Quantidade", fontsize=10)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+def desenhar_ano(por_ano):
+    fig, ax, sns = _figura(10, 4)
+    sns.lineplot(x=por_ano.index, y=por_ano.values, marker='o', color='skyblue', ax=ax)
+    ax.set_title("Tendência de Crimes por Ano", fontsize=12)
+    ax.set_xlabel("Ano", fontsize=10)
+    ax.set_ylabel("Quantidade", fontsize=10)
+    ax.grid(linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+def desenhar_correlacao(correlacao):
+    fig, ax, sns = _figura(8, 6)
+    sns.heatmap(correlacao, annot=True, cmap='coolwarm', fmt='.2f', ax=ax)
+    ax.set_title("Mapa de Calor de Correlação (Numéricas e Categóricas)")
+    fig.tight_layout()
+    return fig
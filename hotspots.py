@@ -0,0 +1,176 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from geo import raio_terra
+from grade import agregar_grade, tamanho_celula
+
+# Focos de crime (hotspots) do mapa por agrupamento de densidade.
+# Duas formas, com os mesmos centroides e contagens dos popups do mapa:
+#   hotspots_pontos — DBSCAN sobre os pontos com distância haversine (ball tree), raio em metros;
+#                     o sklearn guarda a vizinhança de cada ponto, então a memória cresce com o
+#                     quadrado da densidade: só até `limite_pontos` (acima disso, vai para a grade);
+#   hotspots_grade  — DBSCAN sobre as células de 50 m já agregadas por grade.py (dbscan_grade):
+#                     a densidade de cada célula é a soma das contagens das células vizinhas a até
+#                     `raio` metros, achadas por busca nas chaves ordenadas; a memória é proporcional
+#                     ao número de células ocupadas, não de ocorrências nem de pares de vizinhos.
+# O raio padrão equivale ao antigo eps=0.003 grau em latitude.
+
+raio_padrao = 334            # metros
+min_amostras_padrao = 5
+limite_pontos = 20_000       # acima disso (medido: ~770 MB a 30 mil pontos) os focos saem da grade
+
+colunas_focos = ['latitude', 'longitude', 'contagem', 'peso']
+
+# Sem focos: mesmas colunas e tipos da saída de _resumir (com DataFrame(columns=...) tudo seria object)
+def focos_vazios():
+    return pd.DataFrame({coluna: np.empty(0, np.int64 if coluna == 'contagem' else np.float64)
+                         for coluna in colunas_focos})
+
+# Centroide, contagem e peso de cada rótulo (ignora o ruído, rótulo -1), do maior foco para o menor
+def _resumir(rotulos, lat, lon, contagem, peso):
+    validos = rotulos >= 0
+    if not validos.any():
+        return focos_vazios()
+    rotulos = rotulos[validos]
+    n = np.bincount(rotulos, weights=contagem[validos])
+    presentes = n > 0
+    focos = pd.DataFrame({
+        'latitude': np.bincount(rotulos, weights=lat[validos] * contagem[validos])[presentes] / n[presentes],
+        'longitude': np.bincount(rotulos, weights=lon[validos] * contagem[validos])[presentes] / n[presentes],
+        'contagem': n[presentes].astype(np.int64),
+        'peso': np.bincount(rotulos, weights=peso[validos])[presentes],
+    })
+    return focos.sort_values('contagem', ascending=False, kind='stable').reset_index(drop=True)
+
+def _dbscan(lat, lon, raio, min_amostras):
+    from sklearn.cluster import DBSCAN
+    coords = np.radians(np.column_stack([lat, lon]))
+    modelo = DBSCAN(eps=raio / raio_terra, min_samples=min_amostras, metric='haversine', algorithm='ball_tree')
+    return modelo.fit(coords).labels_
+
+# Deslocamentos (linha, coluna) das células a até `raio` metros, centro a centro (inclui a própria)
+def _vizinhanca(raio, tamanho=tamanho_celula):
+    r = int(raio // tamanho)
+    dl, dc = np.mgrid[-r:r + 1, -r:r + 1]
+    dentro = (dl ** 2 + dc ** 2) * tamanho ** 2 <= raio ** 2
+    return list(zip(dl[dentro].tolist(), dc[dentro].tolist()))
+
+# União-busca vetorizada: cada célula aponta direto para a raiz do seu grupo
+def _raizes(pai):
+    while True:
+        avo = pai[pai]
+        if np.array_equal(avo, pai):
+            return pai
+        pai = avo
+
+# DBSCAN sobre as células ocupadas, com a contagem como peso (mesma regra do DBSCAN com sample_weight
+# nos centros das células): núcleo = soma das contagens a até `raio` ≥ `min_amostras`; núcleos vizinhos
+# entram no mesmo foco; células não núcleo vizinhas de um núcleo são borda; as demais, ruído (-1)
+def dbscan_grade(linha, coluna, contagem, raio=raio_padrao, min_amostras=min_amostras_padrao,
+                 tamanho=tamanho_celula):
+    linha = np.asarray(linha, np.int64)
+    coluna = np.asarray(coluna, np.int64)
+    contagem = np.asarray(contagem, np.float64)
+    n = len(linha)
+    deslocamentos = _vizinhanca(raio, tamanho)
+    r = max(abs(dc) for _, dc in deslocamentos)
+    largura = int(coluna.max() - coluna.min()) + 2 * r + 1
+    chave = (linha - linha.min()) * largura + (coluna - coluna.min())
+    ordem = np.argsort(chave, kind='stable')
+    ordenadas = chave[ordem]
+
+    # (i, j): células i que têm a célula j no deslocamento (dl, dc)
+    def vizinhos(dl, dc):
+        alvo = chave + dl * largura + dc
+        posicao = np.minimum(np.searchsorted(ordenadas, alvo), n - 1)
+        achou = ordenadas[posicao] == alvo
+        return np.flatnonzero(achou), ordem[posicao[achou]]
+
+    densidade = np.zeros(n)
+    for dl, dc in deslocamentos:
+        i, j = vizinhos(dl, dc)
+        densidade[i] += contagem[j]
+    nucleo = densidade >= min_amostras
+
+    # Vizinhança simétrica: metade dos deslocamentos basta para ligar os núcleos
+    pai = np.arange(n)
+    for dl, dc in deslocamentos:
+        if (dl, dc) <= (0, 0):
+            continue
+        i, j = vizinhos(dl, dc)
+        par = nucleo[i] & nucleo[j]
+        i, j = i[par], j[par]
+        while len(i):
+            pai = _raizes(pai)
+            raiz_i, raiz_j = pai[i], pai[j]
+            diferentes = raiz_i != raiz_j
+            if not diferentes.any():
+                break
+            raiz_i, raiz_j = raiz_i[diferentes], raiz_j[diferentes]
+            pai[np.maximum(raiz_i, raiz_j)] = np.minimum(raiz_i, raiz_j)
+    pai = _raizes(pai)
+
+    rotulos = np.full(n, -1, np.int64)
+    rotulos[nucleo] = np.unique(pai[nucleo], return_inverse=True)[1]
+    for dl, dc in deslocamentos:
+        i, j = vizinhos(dl, dc)
+        borda = (rotulos[i] == -1) & nucleo[j]
+        rotulos[i[borda]] = rotulos[j[borda]]
+    return rotulos
+
+def hotspots_pontos(lat, lon, peso=None, raio=raio_padrao, min_amostras=min_amostras_padrao):
+    lat = np.asarray(lat, np.float64)
+    lon = np.asarray(lon, np.float64)
+    peso = np.ones_like(lat) if peso is None else np.asarray(peso, np.float64)
+    if len(lat) < min_amostras:
+        return focos_vazios()
+    if len(lat) > limite_pontos:
+        return hotspots_grade(agregar_grade(lat, lon, peso), raio, min_amostras)
+    rotulos = _dbscan(lat, lon, raio, min_amostras)
+    return _resumir(rotulos, lat, lon, np.ones_like(lat), peso)
+
+# `grade` é a saída de agregar_grade; o centroide usa a média real dos pontos de cada célula
+def hotspots_grade(grade, raio=raio_padrao, min_amostras=min_amostras_padrao):
+    if grade.empty or grade['contagem'].sum() < min_amostras:
+        return focos_vazios()
+    contagem = grade['contagem'].to_numpy(np.float64)
+    rotulos = dbscan_grade(grade['linha'].to_numpy(), grade['coluna'].to_numpy(), contagem, raio, min_amostras)
+    return _resumir(rotulos, grade['lat_media'].to_numpy(np.float64), grade['lon_media'].to_numpy(np.float64),
+                    contagem, grade['peso'].to_numpy(np.float64))
+
+# Comparação com a chamada antiga do mapa: DBSCAN(eps=0.003, min_samples=5) em graus.
+# Os dois DBSCAN sobre pontos só rodam até `limite_pontos` (acima disso a memória estoura)
+def benchmark(registros, seed=42):
+    from geracao_paralela import carregar_gerador
+
+    df = carregar_gerador('asa_sul').gerar_lote(registros, seed=seed, pii=False)
+    lat, lon = df['latitude'].to_numpy(np.float64), df['longitude'].to_numpy(np.float64)
+
+    if registros <= limite_pontos:
+        from sklearn.cluster import DBSCAN
+
+        inicio = time.perf_counter()
+        rotulos = DBSCAN(eps=0.003, min_samples=5).fit(np.column_stack([lat, lon])).labels_
+        print(f"DBSCAN em graus (atual): {time.perf_counter() - inicio:.2f}s, "
+              f"{len(set(rotulos) - {-1})} focos")
+
+        inicio = time.perf_counter()
+        focos = hotspots_pontos(lat, lon)
+        print(f"hotspots_pontos (haversine): {time.perf_counter() - inicio:.2f}s, {len(focos)} focos")
+    else:
+        print(f"DBSCAN sobre pontos pulado: {registros} > limite_pontos ({limite_pontos})")
+
+    inicio = time.perf_counter()
+    focos = hotspots_grade(agregar_grade(lat, lon))
+    print(f"hotspots_grade (grade + pesos): {time.perf_counter() - inicio:.2f}s, {len(focos)} focos")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark dos focos de crime contra o DBSCAN em graus")
+    parser.add_argument('--registros', type=int, default=30000, help="quantidade de registros gerados")
+    parser.add_argument('--seed', type=int, default=42, help="semente do gerador")
+    args = parser.parse_args()
+
+    benchmark(args.registros, args.seed)
@@ -0,0 +1,123 @@
+import argparse
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from compartilhado import Tabela, congelar_cubo
+from cubo import montar_cubo, somar_cubos
+from dados import carregar_tabela, colunas_dashboard, colunas_texto, preparar, versao_dados
+
+# Ingestão incremental de ocorrências novas, sem recarregar o dataset inteiro.
+# Cada lote novo vira um arquivo Parquet numa pasta só de acréscimo (nada é reescrito),
+# com uma coluna `hash` do conteúdo de cada linha; linhas já vistas (no dataset base ou
+# em lotes anteriores) são descartadas antes de gravar.
+# No dashboard, `Incremental` guarda a tabela e o cubo já carregados e, a cada
+# atualizar(), lê só os arquivos que ainda não viu: as linhas novas são escritas no fim da
+# tabela (compartilhado.Tabela, sem copiar as anteriores) e o cubo do lote novo é somado ao
+# atual (cubo.somar_cubos), então o custo é proporcional às linhas novas.
+# A tabela e o cubo são compartilhados por todas as sessões e ficam somente leitura (compartilhado.py).
+
+pasta_ingestao = 'novos_registros'
+
+# Mesmos tipos para qualquer origem (CSV, Parquet, categóricas), para o hash não depender deles
+def normalizar(df):
+    df = df[[c for c in colunas_dashboard if c in df.columns]].copy()
+    if 'hora' in df.columns and not pd.api.types.is_numeric_dtype(df['hora']):
+        df['hora'] = pd.to_numeric(df['hora'].astype('string').str.slice(0, 2), errors='coerce')
+    for coluna in df.columns:
+        if coluna in colunas_texto:
+            df[coluna] = df[coluna].astype(object)
+        else:
+            df[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype(np.float64)
+    return df
+
+def hash_linhas(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy(np.uint64)
+
+def _hashes_base(pasta):
+    versao = versao_dados()
+    caminho = os.path.join(pasta, f"base-{hashlib.sha1(versao.encode()).hexdigest()[:16]}.npy")
+    if not os.path.exists(caminho):
+        np.save(caminho, hash_linhas(normalizar(carregar_tabela())))
+    return np.load(caminho)
+
+def arquivos_lotes(pasta=pasta_ingestao):
+    if not os.path.isdir(pasta):
+        return []
+    return sorted(nome for nome in os.listdir(pasta) if nome.startswith('lote-') and nome.endswith('.parquet'))
+
+# Grava um lote novo; devolve quantas linhas eram de fato novas
+def acrescentar(df, pasta=pasta_ingestao):
+    os.makedirs(pasta, exist_ok=True)
+    df = normalizar(df)
+    df['hash'] = hash_linhas(df)
+    df = df.drop_duplicates('hash')
+
+    vistos = [_hashes_base(pasta)]
+    for nome in arquivos_lotes(pasta):
+        vistos.append(pd.read_parquet(os.path.join(pasta, nome), columns=['hash'])['hash'].to_numpy(np.uint64))
+    df = df[~np.isin(df['hash'].to_numpy(np.uint64), np.concatenate(vistos))]
+    if df.empty:
+        return 0
+
+    # Nome ordenável pelo horário; escrito num temporário e renomeado, o dashboard nunca lê pela metade
+    nome = f"lote-{time.time_ns():020d}-{os.getpid()}.parquet"
+    temporario = os.path.join(pasta, f".{nome}.tmp")
+    df.to_parquet(temporario, index=False)
+    os.replace(temporario, os.path.join(pasta, nome))
+    return len(df)
+
+class Incremental:
+    def __init__(self, df, cubo, versao_base, pasta=pasta_ingestao):
+        self.tabela = Tabela(df)
+        self.cubo = cubo
+        self.versao_base = versao_base
+        self.pasta = pasta
+        self.lidos = []
+        self._trava = threading.Lock()
+
+    @property
+    def df(self):
+        return self.tabela.df
+
+    # Versão dos dados vistos pelo dashboard: a base + quantos lotes já entraram
+    @property
+    def versao(self):
+        return f"{self.versao_base}+{len(self.lidos)}" if self.lidos else self.versao_base
+
+    # (versao, df, cubo) do mesmo momento: lidos sob a trava, um atualizar() não fica pela metade
+    def instantaneo(self):
+        with self._trava:
+            return self.versao, self.df, self.cubo
+
+    def tem_novos(self):
+        return len(arquivos_lotes(self.pasta)) > len(self.lidos)
+
+    # Lê os lotes ainda não vistos; df e cubo são trocados por objetos novos, os antigos não mudam
+    def atualizar(self):
+        with self._trava:
+            lidos = set(self.lidos)
+            novos = [nome for nome in arquivos_lotes(self.pasta) if nome not in lidos]
+            if not novos:
+                return 0
+            lote = pd.concat([pd.read_parquet(os.path.join(self.pasta, nome)) for nome in novos], ignore_index=True)
+            lote = preparar(lote.drop(columns=['hash']))
+            self.cubo = congelar_cubo(somar_cubos(self.cubo, montar_cubo(lote)))
+            self.tabela.acrescentar(lote)
+            self.lidos = self.lidos + novos
+            return len(lote)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Acrescenta ocorrências novas sem regravar o dataset")
+    parser.add_argument('arquivos', nargs='+', help="arquivos CSV ou Parquet com as ocorrências novas")
+    parser.add_argument('--pasta', default=pasta_ingestao, help="pasta dos lotes acrescentados")
+    args = parser.parse_args()
+
+    for arquivo in args.arquivos:
+        novos = pd.read_parquet(arquivo) if arquivo.endswith('.parquet') else pd.read_csv(arquivo)
+        gravadas = acrescentar(novos, args.pasta)
+        print(f"✅ '{arquivo}': {gravadas} de {len(novos)} linhas novas")
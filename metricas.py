@@ -0,0 +1,220 @@
+import functools
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Métricas do dashboard em produção, sem serviço externo: contadores, histogramas de
+# latência e medidores (gauges), num coletor do processo, expostos no formato de texto
+# do Prometheus. Duas saídas, ligadas por variável de ambiente (ver iniciar()):
+#   METRICAS_PORTA=9600            → GET http://127.0.0.1:9600/metrics
+#   METRICAS_ARQUIVO=dashboard.prom → o arquivo é regravado a cada METRICAS_INTERVALO segundos
+#                                     (formato do textfile collector do node_exporter)
+# Sem nenhuma das duas, o coletor continua contando e `texto()` fica disponível.
+
+limites_padrao = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+sessao_ativa_segundos = 300     # sessão sem rerun por mais tempo que isso deixa de contar como ativa
+
+def _rotulos(rotulos):
+    if not rotulos:
+        return ''
+    return '{' + ','.join(f'{chave}="{str(valor)}"' for chave, valor in sorted(rotulos)) + '}'
+
+def _numero(valor):
+    return repr(float(valor)) if valor != float('inf') else '+Inf'
+
+# Memória residente atual do processo (Linux); fora dele, o pico (ru_maxrss)
+def memoria_rss():
+    try:
+        with open('/proc/self/statm') as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class Coletor:
+    def __init__(self, limites=limites_padrao):
+        self.limites = limites
+        self._contadores = {}
+        self._histogramas = {}
+        self._medidores = {}
+        self._funcoes = {}
+        self._ajuda = {}
+        self._sessoes = {}
+        self._trava = threading.Lock()
+
+    def contar(self, nome, valor=1, ajuda=None, **rotulos):
+        chave = (nome, tuple(rotulos.items()))
+        with self._trava:
+            self._ajuda.setdefault(nome, ajuda)
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def observar(self, nome, valor, ajuda=None, **rotulos):
+        chave = (nome, tuple(rotulos.items()))
+        with self._trava:
+            self._ajuda.setdefault(nome, ajuda)
+            if chave not in self._histogramas:
+                self._histogramas[chave] = [[0] * (len(self.limites) + 1), 0.0, 0]
+            baldes, _, _ = histograma = self._histogramas[chave]
+            for i, limite in enumerate(self.limites):
+                if valor <= limite:
+                    baldes[i] += 1
+                    break
+            else:
+                baldes[-1] += 1
+            histograma[1] += valor
+            histograma[2] += 1
+
+    def definir(self, nome, valor, ajuda=None, **rotulos):
+        with self._trava:
+            self._ajuda.setdefault(nome, ajuda)
+            self._medidores[(nome, tuple(rotulos.items()))] = valor
+
+    # Medidor calculado na hora da coleta (ex.: acertos do cache de gráficos)
+    def medir_com(self, nome, funcao, ajuda=None):
+        with self._trava:
+            self._ajuda.setdefault(nome, ajuda)
+            self._funcoes[nome] = funcao
+
+    @contextmanager
+    def cronometro(self, nome, ajuda=None, **rotulos):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nome, time.perf_counter() - inicio, ajuda, **rotulos)
+
+    def sessao_vista(self, sessao):
+        with self._trava:
+            self._sessoes[sessao] = time.monotonic()
+
+    def sessoes_ativas(self):
+        limite = time.monotonic() - sessao_ativa_segundos
+        with self._trava:
+            self._sessoes = {sessao: visto for sessao, visto in self._sessoes.items() if visto >= limite}
+            return len(self._sessoes)
+
+    def texto(self):
+        sessoes = self.sessoes_ativas()
+        rss = memoria_rss()
+        self.definir('dashboard_sessoes_ativas', sessoes, "Sessões com rerun nos últimos minutos")
+        self.definir('dashboard_memoria_rss_bytes', rss, "Memória residente do processo")
+        self.definir('dashboard_memoria_por_sessao_bytes', rss / max(sessoes, 1),
+                     "Memória residente dividida pelas sessões ativas")
+        with self._trava:
+            funcoes = dict(self._funcoes)
+        valores_funcoes = {}
+        for nome, funcao in funcoes.items():
+            try:
+                valores_funcoes[nome] = float(funcao())
+            except Exception:
+                continue  # uma função com erro não derruba a coleta das outras
+
+        linhas = []
+        with self._trava:
+            def cabecalho(nome, tipo):
+                if self._ajuda.get(nome):
+                    linhas.append(f"# HELP {nome} {self._ajuda[nome]}")
+                linhas.append(f"# TYPE {nome} {tipo}")
+
+            for tipo, itens in (('counter', self._contadores), ('gauge', self._medidores)):
+                vistos = set()
+                for (nome, rotulos), valor in sorted(itens.items()):
+                    if nome not in vistos:
+                        cabecalho(nome, tipo)
+                        vistos.add(nome)
+                    linhas.append(f"{nome}{_rotulos(rotulos)} {_numero(valor)}")
+            for nome, valor in sorted(valores_funcoes.items()):
+                cabecalho(nome, 'gauge')
+                linhas.append(f"{nome} {_numero(valor)}")
+            vistos = set()
+            for (nome, rotulos), (baldes, soma, contagem) in sorted(self._histogramas.items()):
+                if nome not in vistos:
+                    cabecalho(nome, 'histogram')
+                    vistos.add(nome)
+                acumulado = 0
+                for limite, quantidade in zip(self.limites + (float('inf'),), baldes):
+                    acumulado += quantidade
+                    linhas.append(f"{nome}_bucket{_rotulos(rotulos + (('le', _numero(limite)),))} {acumulado}")
+                linhas.append(f"{nome}_sum{_rotulos(rotulos)} {_numero(soma)}")
+                linhas.append(f"{nome}_count{_rotulos(rotulos)} {contagem}")
+        return '\n'.join(linhas) + '\n'
+
+# Coletor único do processo (todas as sessões do Streamlit rodam no mesmo processo)
+coletor = Coletor()
+
+def criar_servidor(coletor=coletor, host='127.0.0.1', porta=9600):
+    class Manipulador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            dados = coletor.texto().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def log_message(self, formato, *args):
+            pass
+
+    return ThreadingHTTPServer((host, porta), Manipulador)
+
+def gravar(caminho, coletor=coletor):
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(coletor.texto())
+    os.replace(temporario, caminho)  # quem lê o arquivo nunca pega a metade
+
+def _gravar_sempre(caminho, intervalo):
+    while True:
+        time.sleep(intervalo)
+        try:
+            gravar(caminho)
+        except OSError:
+            pass
+
+_iniciado = False
+_trava_inicio = threading.Lock()
+
+# Sobe o endpoint e/ou a gravação periódica uma vez por processo, conforme as variáveis de ambiente
+def iniciar():
+    global _iniciado
+    with _trava_inicio:
+        if _iniciado:
+            return
+        _iniciado = True
+        porta = os.environ.get('METRICAS_PORTA')
+        if porta:
+            servidor = criar_servidor(coletor, os.environ.get('METRICAS_HOST', '127.0.0.1'), int(porta))
+            threading.Thread(target=servidor.serve_forever, daemon=True, name='metricas-http').start()
+        arquivo = os.environ.get('METRICAS_ARQUIVO')
+        if arquivo:
+            intervalo = float(os.environ.get('METRICAS_INTERVALO', 15))
+            threading.Thread(target=_gravar_sempre, args=(arquivo, intervalo), daemon=True,
+                             name='metricas-arquivo').start()
+
+# Aplica `cache` (st.cache_data ou st.cache_resource) contando chamadas, faltas e o tempo de cada falta.
+# A função guardada no cache mantém nome, assinatura e código da original (functools.wraps),
+# então a chave do cache e os parâmetros com "_" continuam como antes.
+def medir_cache(nome, cache):
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        def calcular(*args, **kwargs):
+            coletor.contar('dashboard_cache_faltas_total', ajuda="Chamadas que executaram a função", cache=nome)
+            with coletor.cronometro('dashboard_cache_calculo_segundos', ajuda="Tempo das faltas de cache",
+                                    cache=nome):
+                return funcao(*args, **kwargs)
+
+        guardada = cache(calcular)
+
+        @functools.wraps(funcao)
+        def chamar(*args, **kwargs):
+            coletor.contar('dashboard_cache_chamadas_total', ajuda="Chamadas das funções com cache", cache=nome)
+            return guardada(*args, **kwargs)
+
+        chamar.clear = guardada.clear
+        return chamar
+    return decorar
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from xgboost import DMatrix, XGBRegressor
+
+# Registro em disco dos modelos da aba "Teste de Modelo".
+# Cada entrada guarda o ColumnTransformer ajustado, o modelo, as métricas e as
+# predições do conjunto de teste, com a chave = hash do dataset + features + hiperparâmetros.
+# Mesma chave → carrega do disco; só treina quando a combinação ainda não existe.
+
+pasta_registro = 'modelos'
+arquivo_hiperparametros = 'hiperparametros.json'
+
+categorical_features = ['tipo_crime', 'tipo_dia']
+numeric_features = ['hora', 'idade', 'risco']
+features = numeric_features + categorical_features
+alvos = ['latitude', 'longitude']
+
+hiperparametros = {
+    "Random Forest": {
+        'n_estimators': 287,
+        'max_depth': 10,
+        'min_samples_split': 9,
+        'min_samples_leaf': 1,
+        'random_state': 42
+    },
+    "XGBoost": {
+        'n_estimators': 289,
+        'max_depth': 3,
+        'learning_rate': 0.0971,
+        'subsample': 0.8934,
+        'colsample_bytree': 0.9926,
+        'random_state': 42
+    }
+}
+
+# Hiperparâmetros acima, trocados pelos vencedores da busca (ajuste.py) quando o arquivo existe
+def carregar_hiperparametros(caminho=arquivo_hiperparametros):
+    params = {nome: dict(valores) for nome, valores in hiperparametros.items()}
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as arquivo:
+            params.update(json.load(arquivo))
+    return params
+
+classes_modelo = {
+    "Random Forest": RandomForestRegressor,
+    "XGBoost": XGBRegressor
+}
+
+def hash_dados(df, colunas=features + alvos):
+    valores = pd.util.hash_pandas_object(df[colunas], index=False).to_numpy()
+    return hashlib.sha256(valores.tobytes()).hexdigest()
+
+def chave_registro(hash_df, nome, params):
+    descricao = json.dumps({'dados': hash_df, 'modelo': nome, 'features': features, 'alvos': alvos,
+                            'parametros': params}, sort_keys=True)
+    return hashlib.sha256(descricao.encode()).hexdigest()[:24]
+
+def criar_preprocessor():
+    return ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), numeric_features),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
+        ])
+
+# Mesma conta do StandardScaler.transform, com média e escala já calculadas (treino_externo.py guarda
+# isso num FunctionTransformer; a função fica aqui para o modelo salvo ser carregado de qualquer script)
+def padronizar(X, media, escala):
+    return (np.asarray(X, np.float64) - media) / escala
+
+# Booster do treino_externo.py com o predict dos regressores do registro (uma coluna por alvo),
+# para previsao.py servir o modelo externo como qualquer outra entrada
+class ModeloBooster:
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict(self, X):
+        return self.booster.predict(DMatrix(X)).reshape(-1, len(alvos))
+
+# Mesmo treino da aba: ajusta o pré-processamento em X inteiro, separa 20% para teste
+def treinar(df, nome, params):
+    preprocessor = criar_preprocessor()
+    X_processed = preprocessor.fit_transform(df[features])
+    y = df[alvos]
+    X_train, X_test, y_train, y_test = train_test_split(X_processed, y, test_size=0.2, random_state=42)
+
+    inicio = time.perf_counter()
+    model = classes_modelo[nome](**params)
+    model.fit(X_train, y_train)
+    preds = model.predict(X_test)
+
+    resultados = pd.DataFrame({
+        'real_lat': y_test.iloc[:, 0].to_numpy(),
+        'real_lon': y_test.iloc[:, 1].to_numpy(),
+        'pred_lat': preds[:, 0],
+        'pred_lon': preds[:, 1]
+    }, index=y_test.index)
+    metricas = {
+        'mse': mean_squared_error(y_test, preds),
+        'mae': mean_absolute_error(y_test, preds),
+        'r2': r2_score(y_test, preds),
+        'segundos_treino': time.perf_counter() - inicio
+    }
+    return {'modelo': nome, 'parametros': params, 'preprocessor': preprocessor, 'model': model,
+            'metricas': metricas, 'resultados': resultados}
+
+def caminho_registro(chave, pasta=pasta_registro):
+    return os.path.join(pasta, f"{chave}.joblib")
+
+# Devolve (entrada, veio_do_registro)
+def obter_modelo(df, nome, params=None, hash_df=None, pasta=pasta_registro):
+    params = carregar_hiperparametros()[nome] if params is None else params
+    hash_df = hash_dados(df) if hash_df is None else hash_df
+    caminho = caminho_registro(chave_registro(hash_df, nome, params), pasta)
+    if os.path.exists(caminho):
+        return joblib.load(caminho), True
+
+    entrada = treinar(df, nome, params)
+    entrada['hash_dados'] = hash_df
+    os.makedirs(pasta, exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"  # sessões são threads do mesmo processo
+    joblib.dump(entrada, temporario)
+    os.replace(temporario, caminho)  # outra sessão nunca lê um arquivo pela metade
+    return entrada, False
@@ -0,0 +1,107 @@
+import time
+
+import streamlit as st
+
+from compartilhado import congelar, congelar_cubo
+from cubo import montar_cubo
+from dados import carregar_compacto
+from ingestao import Incremental
+from metricas import coletor, medir_cache
+
+# Carregamentos com cache do dashboard (dados, cubo, grade, focos, risco, rotas e modelos).
+# Os módulos pesados (sklearn, xgboost, pyarrow, matplotlib) são importados dentro de cada
+# função, na primeira vez que ela roda de fato; um acerto de cache não importa nada.
+# medir_cache (ver metricas.py) conta chamadas e faltas de cada cache.
+
+# Cache dos gráficos renderizados (PNG da tela e de exportação), compartilhado entre sessões
+@medir_cache('cache_de_graficos', st.cache_resource)
+def cache_de_graficos():
+    from cache_graficos import CacheGraficos
+    return CacheGraficos(limite_bytes=64 * 1024 * 1024)
+
+# Carregar dados com cache
+# (lê o Parquet tipado se existir — ver dados.py — senão o CSV; só as colunas usadas)
+# e guarda no cache a versão compacta: float32, int8/int16 e categóricas de ordem fixa.
+# cache_resource + congelar (ver compartilhado.py): uma tabela somente leitura para todas as sessões,
+# em vez da cópia que cache_data desserializa a cada chamada
+@medir_cache('carregar_dados', st.cache_resource)
+def carregar_dados(versao):
+    return congelar(carregar_compacto())
+
+# Cubo de contagens e pesos (ver cubo.py), montado uma vez por versão dos dados
+@medir_cache('carregar_cubo', st.cache_resource)
+def carregar_cubo(versao):
+    return congelar_cubo(montar_cubo(carregar_dados(versao)))
+
+# Dados da base + lotes acrescentados por ingestao.py; a cada rerun só os lotes novos são lidos
+@medir_cache('estado_dados', st.cache_resource)
+def estado_dados(versao_base):
+    return Incremental(carregar_dados(versao_base), carregar_cubo(versao_base), versao_base)
+
+# Correlação mista do mapa de calor (ver correlacao.py), calculada uma vez por versão dos dados
+@medir_cache('carregar_correlacao', st.cache_data)
+def carregar_correlacao(versao, _df):
+    from correlacao import correlacao_mista
+    colunas = ["latitude", "longitude", 'tipo_crime', 'rua', 'tipo_dia', 'idade', 'ano', "hora"]
+    return correlacao_mista(_df[colunas])
+
+# Grade do mapa de calor (ver grade.py): contagem e peso por célula, uma vez por estado dos filtros
+@medir_cache('carregar_grade', st.cache_data)
+def carregar_grade(versao, tipos, hora, _df_filtrado):
+    from grade import agregar_grade
+    return agregar_grade(_df_filtrado['latitude'], _df_filtrado['longitude'], _df_filtrado['peso'])
+
+# Tabela pré-calculada (focos_por_hora.py), se existir e for desta versão dos dados: trocar de hora é uma consulta
+@medir_cache('carregar_tabela_focos', st.cache_data)
+def carregar_tabela_focos(versao):
+    from focos_por_hora import ler_tabela_focos
+    return ler_tabela_focos(versao=versao)
+
+# Focos do mapa (ver hotspots.py): pontos com haversine até `limite_pontos`, acima disso as células da grade
+@medir_cache('carregar_focos', st.cache_data)
+def carregar_focos(versao, tipos, hora, _df_filtrado):
+    tabela = carregar_tabela_focos(versao)
+    if tabela is not None:
+        from focos_por_hora import consultar_focos
+        focos = consultar_focos(tabela, hora, tipos)
+        if focos is not None:
+            return focos
+    from hotspots import hotspots_grade, hotspots_pontos, limite_pontos
+    if len(_df_filtrado) > limite_pontos:
+        return hotspots_grade(carregar_grade(versao, tipos, hora, _df_filtrado))
+    return hotspots_pontos(_df_filtrado['latitude'], _df_filtrado['longitude'], _df_filtrado['peso'])
+
+# Superfície de risco (ver risco.py), se existir e for desta versão da base
+@medir_cache('carregar_risco', st.cache_data)
+def carregar_risco(versao_base):
+    from risco import ler_risco
+    return ler_risco(versao=versao_base)
+
+# Rotas de patrulha fechadas (ver rotas.py) sobre os focos do estado dos filtros
+@medir_cache('carregar_rotas', st.cache_data)
+def carregar_rotas(versao, tipos, hora, bases, max_paradas, tempo_limite, _focos):
+    from rotas import otimizar_rotas
+    return otimizar_rotas(_focos, list(bases), tempo_limite=tempo_limite, max_paradas=max_paradas)
+
+# Dataset processado da aba 2 (ver processados.py), uma vez por versão dos dados.
+# cache_resource: a tabela é compartilhada sem cópia (cache_data desserializaria a cada rerun) e não é alterada
+@medir_cache('carregar_processado', st.cache_resource)
+def carregar_processado(versao, _df):
+    from processados import processar
+    return processar(_df)
+
+# Modelos da aba 3 (ver modelos.py): o registro em disco fica entre reinícios, este cache evita reler o arquivo
+@medir_cache('carregar_hash_dados', st.cache_data)
+def carregar_hash_dados(versao, _df):
+    from modelos import hash_dados
+    return hash_dados(_df)
+
+@medir_cache('carregar_modelo', st.cache_resource)
+def carregar_modelo(versao, nome, params, _df):
+    from modelos import obter_modelo
+    inicio = time.perf_counter()
+    entrada, do_registro = obter_modelo(_df, nome, params, hash_df=carregar_hash_dados(versao, _df))
+    coletor.observar('dashboard_modelo_carga_segundos', time.perf_counter() - inicio,
+                     ajuda="Tempo para obter o modelo (registro em disco ou treino)",
+                     modelo=nome, origem='registro' if do_registro else 'treino')
+    return entrada, do_registro
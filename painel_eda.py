@@ -0,0 +1,114 @@
+import streamlit as st
+
+import graficos_eda as g
+from cubo import total
+from painel_dados import cache_de_graficos, carregar_correlacao
+from perfil import secao
+
+# Aba 1 do dashboard: gráficos da análise exploratória, a partir do cubo (ver cubo.py).
+# Os dados e o desenho de cada gráfico ficam em graficos_eda.py (os mesmos do relatório semanal);
+# matplotlib e seaborn só são importados quando um gráfico precisa ser desenhado, isto é,
+# numa falta do cache de gráficos; com o cache quente a aba não passa por eles.
+
+# Imagem do gráfico com o botão de exportação (PNG já renderizado, vindo do cache)
+def _grafico(renderizar, grafico, desenhar, rotulo, hora_selecionada):
+    imagem = renderizar(grafico, desenhar)
+    st.image(imagem['tela'])
+    st.download_button(
+        label=f"📥 Exportar {rotulo}",
+        data=imagem['arquivo'],
+        file_name=f"{grafico}_{hora_selecionada}.png",
+        mime="image/png"
+    )
+
+# `renderizar(grafico, desenhar)` devolve o PNG do gráfico no estado atual dos filtros (ver app.py)
+def mostrar(df, df_filtrado, cubo, versao, tipos_selecionados, hora_selecionada, renderizar):
+    horas_filtro = None if hora_selecionada == "Geral" else [int(hora_selecionada)]
+
+    def grafico(nome, desenhar, rotulo):
+        _grafico(renderizar, nome, desenhar, rotulo, hora_selecionada)
+
+    st.header("🔍 Análise Exploratória de Dados (EDA)")
+
+    # 1. Tabela de dados
+    st.subheader("Primeras Linhas do Dataset")
+    st.dataframe(df.head(10))
+
+    # 2. Crimes por Tipo
+    with st.expander("🚨 Crimes por Tipo", expanded=True), secao("Crimes por Tipo"):
+        crimes_por_tipo = g.crimes_por_tipo(cubo, tipos_selecionados, horas_filtro)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            grafico('grafico_tipo', lambda: g.desenhar_barras_tipo(crimes_por_tipo), "Gráfico de Barras")
+        with col2:
+            grafico('grafico_tipo_pizza', lambda: g.desenhar_pizza_tipo(crimes_por_tipo), "Gráfico de Pizza")
+
+    # 3. Crimes por Hora do Dia
+    if hora_selecionada == "Geral":
+        with st.expander("⏰ Crimes por Hora do Dia", expanded=True), secao("Crimes por Hora do Dia"):
+            df_hora = g.crimes_por_hora(cubo)
+            grafico('grafico_hora', lambda: g.desenhar_hora(df_hora), "Gráfico de Hora")
+
+    # 4. Crimes por Região (Top 10)
+    with st.expander("🏠 Crimes por Região", expanded=True), secao("Crimes por Região"):
+        top_ruas = g.top_regioes(cubo, tipos_selecionados, horas_filtro)
+        grafico('grafico_regiao', lambda: g.desenhar_regiao(top_ruas), "Gráfico de Região")
+
+    # 5. Risco por Região
+    with st.expander("⚠️ Risco por Região", expanded=True), secao("Risco por Região"):
+        risco_por_rua = g.risco_por_regiao(cubo, tipos_selecionados, horas_filtro)
+        grafico('risco_regiao', lambda: g.desenhar_risco(risco_por_rua), "Gráfico de Risco")
+        st.dataframe(risco_por_rua.style.format({'risco_total': '{:.0f}'}))
+
+    # 6. Crimes Graves (Homicídio e Tráfico)
+    with st.expander("💀 Crimes Graves (Homicídio e Tráfico) por Hora", expanded=True), secao("Crimes Graves"):
+        horarios_risco = g.horarios_graves(cubo, horas_filtro)
+        grafico('grafico_graves', lambda: g.desenhar_graves(horarios_risco), "Gráfico de Crimes Graves")
+
+    # 7. Crimes Noturnos (19h–04h)
+    with st.expander("🌙 Crimes Noturnos (19h–04h)", expanded=True), secao("Crimes Noturnos (19h–04h)"):
+        frequencia_crimes, total_noturnos = g.crimes_noturnos(cubo, tipos_selecionados)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            grafico('grafico_noturno_barras',
+                    lambda: g.desenhar_barras_tipo(frequencia_crimes, "Frequência de Crimes Noturnos"),
+                    "Gráfico de Crimes Noturnos")
+        with col2:
+            grafico('grafico_noturno_pizza',
+                    lambda: g.desenhar_pizza_tipo(frequencia_crimes, "Distribuição de Crimes Noturnos"),
+                    "Gráfico de Pizza")
+
+        st.markdown(f"**Crimes noturnos:** {total_noturnos} ({(total_noturnos/total(cubo)*100):.2f}%)")
+        st.dataframe(frequencia_crimes[['tipo_crime', 'quantidade', 'porcentagem']].style.format({'porcentagem': '{:.2f}%'}))
+
+    # 8. Distribuição de Idade
+    with st.expander("👶 Distribuição de Crimes por Idade", expanded=True), secao("Distribuição de Crimes por Idade"):
+        # A coluna filtrada só é montada numa falta do cache de gráficos
+        grafico('grafico_idade', lambda: g.desenhar_idade(df_filtrado['idade'].dropna().astype(int)),
+                "Gráfico de Idade")
+
+    # 9. Tendência Anual de Crimes
+    with st.expander("📅 Tendência de Crimes por Ano", expanded=True), secao("Tendência de Crimes por Ano"):
+        crimes_por_ano = g.crimes_por_ano(cubo, tipos_selecionados, horas_filtro)
+        grafico('grafico_ano', lambda: g.desenhar_ano(crimes_por_ano), "Gráfico de Ano")
+    with st.expander("🌍 Mapa de Correlação", expanded=True), secao("Mapa de Correlação"):
+        with secao("correlacao_mista"):
+            mixed_corr = carregar_correlacao(versao, df)
+
+        # Usa a base inteira (não depende dos filtros): uma imagem por versão dos dados
+        with secao("correlacao"):
+            st.image(cache_de_graficos().obter((versao, 'correlacao'), lambda: g.desenhar_correlacao(mixed_corr))['tela'])
+
+def mostrar_insights():
+    st.markdown("### 🔍 **Insights Principais**")
+    st.markdown("- Crimes noturnos (19h–4h): 67.7% dos registros")
+    st.markdown("- Regiões de alto risco: Novo Setor 1, W3 Sul")
+    st.markdown("- Crimes graves (homicídio/tráfico) mais comuns entre 21h e 23h")
+    st.markdown("- Jovens (14–25 anos) mais envolvidos em tráfico e homicídio")
+    st.markdown("- Há dados nulos que precisam ser tratados")
+    st.markdown("- necessário tratar os valores de hora que eram string para numérico")
+    st.markdown("- necessário tratar vários valores strings para que a IA seja eficaz")
+    st.markdown("- Horário influencia na quantidade de crime e tipo de crime")
+    st.markdown("- uma área é a mais perigosa, a quadra 108 Sul")
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from painel_dados import carregar_focos, carregar_grade, carregar_risco, carregar_rotas
+from perfil import secao
+from risco import imagem_risco, superficie
+
+# Mapa de crimes e rotas de patrulha da aba 1.
+# folium e streamlit_folium só são importados aqui dentro, quando há um mapa para desenhar.
+
+centro_mapa = [-15.7942, -47.8825]
+
+def mostrar_mapa(df_filtrado, versao, versao_base, filtro_tipos, tipos_selecionados, hora_selecionada):
+    with st.expander("🗺️ Mapa de Crimes", expanded=True), secao("Mapa de Crimes"):
+        if df_filtrado.empty:
+            return
+        import folium
+        from folium.plugins import HeatMap, MarkerCluster
+        from streamlit_folium import folium_static
+
+        mapa = folium.Map(location=centro_mapa, zoom_start=13, tiles='CartoDB positron')
+
+        # Adicionar marcadores com cluster
+        with secao("marcadores"):
+            marker_cluster = MarkerCluster().add_to(mapa)
+            amostra = df_filtrado.sample(n=min(500, len(df_filtrado)), random_state=42)
+            for lat, lon, tipo, rua in zip(amostra['latitude'].tolist(), amostra['longitude'].tolist(),
+                                           amostra['tipo_crime'].tolist(), amostra['rua'].tolist()):
+                folium.Marker(
+                    location=[lat, lon],
+                    popup=f"{tipo} - {rua}",
+                    icon=folium.Icon(color='red', icon='info-sign')
+                ).add_to(marker_cluster)
+
+        # Adicionar heatmap (só as células ocupadas da grade, com a contagem como intensidade)
+        with secao("carregar_grade"):
+            grade = carregar_grade(versao, filtro_tipos, hora_selecionada, df_filtrado)
+        intensidade = grade['contagem'] / grade['contagem'].max()
+        heat_data = np.column_stack([grade['latitude'], grade['longitude'], intensidade]).tolist()
+        HeatMap(heat_data, radius=15, blur=20, max_zoom=16).add_to(mapa)
+
+        # Superfície de risco pré-calculada (risco.py), ponderada pela gravidade, como imagem sobre o mapa
+        risco = carregar_risco(versao_base)
+        if risco is not None and st.checkbox("Mostrar superfície de risco (KDE ponderado por gravidade)"):
+            imagem, limites = imagem_risco(risco, superficie(risco, hora_selecionada, tipos_selecionados))
+            folium.raster_layers.ImageOverlay(imagem, bounds=limites, name="Risco").add_to(mapa)
+
+        # Adicionar focos (clusters espaciais por densidade, ver hotspots.py)
+        with secao("carregar_focos (DBSCAN)"):
+            focos = carregar_focos(versao, filtro_tipos, hora_selecionada, df_filtrado)
+        for lat, lon, count in zip(focos['latitude'].tolist(), focos['longitude'].tolist(),
+                                   focos['contagem'].tolist()):
+            folium.CircleMarker(
+                location=[lat, lon],
+                radius=10,
+                color='darkred',
+                fill=True,
+                fill_color='darkred',
+                popup=f"Cluster com {count} crimes"
+            ).add_to(mapa)
+
+        # Mostrar hora no mapa (se não for Geral)
+        if hora_selecionada != "Geral":
+            folium.Marker(
+                location=centro_mapa,
+                icon=folium.DivIcon(html=f'<div style="font-weight: bold; color: red; font-size: 16px;">{hora_selecionada}h</div>')
+            ).add_to(mapa)
+        else:
+            folium.Marker(
+                location=centro_mapa,
+                icon=folium.DivIcon(html=f'<div style="font-weight: bold; color: red; font-size: 16px;">Todos os Horários</div>')
+            ).add_to(mapa)
+
+        with secao("folium_static"):
+            folium_static(mapa, width=1000, height=500)
+
+# Rota de Patrulha sobre os focos (ver rotas.py)
+def mostrar_rotas(df_filtrado, versao, filtro_tipos, hora_selecionada):
+    with st.expander("🚓 Rota de Patrulha", expanded=False), secao("Rota de Patrulha"):
+        bases_texto = st.text_input("Bases (lat, lon; lat, lon; ...)", "-15.7942, -47.8825")
+        col1, col2 = st.columns(2)
+        max_paradas = col1.number_input("Máximo de focos (maior peso)", min_value=2, value=50, step=10)
+        tempo_limite = col2.number_input("Tempo limite (s)", min_value=0.5, value=3.0, step=0.5)
+        try:
+            bases = tuple(tuple(float(v) for v in base.split(',')) for base in bases_texto.split(';') if base.strip())
+        except ValueError:
+            bases = ()
+        if not bases or any(len(base) != 2 for base in bases):
+            st.warning("Informe as bases como 'lat, lon', separadas por ';'.")
+            return
+        if df_filtrado.empty:
+            return
+        import folium
+        from streamlit_folium import folium_static
+
+        focos = carregar_focos(versao, filtro_tipos, hora_selecionada, df_filtrado)
+        with secao("carregar_rotas"):
+            rotas = carregar_rotas(versao, filtro_tipos, hora_selecionada, bases, int(max_paradas),
+                                   float(tempo_limite), focos)
+        mapa_rota = folium.Map(location=list(bases[0]), zoom_start=13, tiles='CartoDB positron')
+        cores = ['blue', 'darkred', 'green', 'purple', 'orange', 'black']
+        for i, rota in enumerate(rotas):
+            pontos = rota['paradas'][['latitude', 'longitude']].to_numpy().tolist()
+            folium.PolyLine(pontos + pontos[:1], color=cores[i % len(cores)], weight=3).add_to(mapa_rota)
+            for ordem, (lat, lon) in enumerate(pontos[1:], start=1):
+                folium.CircleMarker(location=[lat, lon], radius=4, color=cores[i % len(cores)], fill=True,
+                                    popup=f"Parada {ordem}").add_to(mapa_rota)
+            folium.Marker(location=pontos[0], popup=f"Base {i + 1}",
+                          icon=folium.Icon(color='blue', icon='home')).add_to(mapa_rota)
+        folium_static(mapa_rota, width=1000, height=500)
+        st.dataframe(pd.DataFrame({
+            'base': [f"Base {i + 1}" for i in range(len(rotas))],
+            'paradas': [len(rota['paradas']) - 1 for rota in rotas],
+            'distancia_km': [rota['distancia_m'] / 1000 for rota in rotas],
+            'peso_coberto': [rota['peso'] for rota in rotas],
+        }).style.format({'distancia_km': '{:.2f}', 'peso_coberto': '{:.0f}'}))
@@ -0,0 +1,84 @@
+import streamlit as st
+
+from geo import haversine
+from painel_dados import carregar_modelo
+from perfil import secao
+
+# Aba 3 do dashboard: treino (ou registro em disco) e avaliação dos modelos.
+# modelos.py traz sklearn e xgboost; só é importado quando o botão é clicado.
+
+def mostrar(df, versao):
+    st.header("🧪 Teste de Modelo")
+
+    # Seletor de modelo
+    modelo_selecionado = st.selectbox(
+        "Selecione o Modelo", 
+        ["Random Forest", "XGBoost"]
+    )
+
+    # Botão para treinamento (evita executar automático)
+    if st.button("Treinar e Avaliar Modelo"):
+        # Modelo do registro em disco (ver modelos.py); só treina se esta combinação ainda não existir
+        with st.spinner("Carregando modelo..."), secao("carregar_modelo (treino)"):
+            from modelos import carregar_hiperparametros
+            params = carregar_hiperparametros()[modelo_selecionado]  # hiperparametros.json, se houver (ajuste.py)
+            registro, do_registro = carregar_modelo(versao, modelo_selecionado, params, df)
+        if do_registro:
+            st.caption("Modelo carregado do registro (mesmos dados, features e hiperparâmetros).")
+        mse, mae, r2 = registro['metricas']['mse'], registro['metricas']['mae'], registro['metricas']['r2']
+
+        # Exibir métricas
+        st.subheader("Métricas do Modelo")
+        st.markdown(f"**Modelo**: {modelo_selecionado}")
+        st.markdown(f"**MSE (Erro Quadrático Médio)**: {mse:.6f}")
+        st.markdown(f"**MAE (Erro Absoluto Médio)**: {mae:.6f}")
+        st.markdown(f"**R² (Coeficiente de Determinação)**: {r2:.4f}")
+
+        # Resultados do conjunto de teste (guardados no registro junto com o modelo)
+        df_resultados = registro['resultados'].copy()
+
+        # Calcular erro em metros (haversine, ver geo.py)
+        df_resultados['distancia_metros'] = haversine(
+            df_resultados['real_lat'], df_resultados['real_lon'],
+            df_resultados['pred_lat'], df_resultados['pred_lon']
+        )
+
+        # Exibir amostra dos resultados
+        st.subheader("📊 Predições vs Reais")
+        st.dataframe(df_resultados.head(10))
+
+        # Estatísticas do erro
+        st.markdown(f"**Erro Médio**: {df_resultados['distancia_metros'].mean():.2f} m")
+        st.markdown(f"**Erro Máximo**: {df_resultados['distancia_metros'].max():.2f} m")
+
+        # Botão para download do CSV
+        st.download_button(
+            label="📥 Exportar Predições como CSV",
+            data=df_resultados.to_csv(index=False).encode('utf-8'),
+            file_name=f"previsoes_{modelo_selecionado.lower().replace(' ', '_')}.csv",
+            mime="text/csv"
+        )
+
+        # Gráfico de dispersão (Latitude Real vs Preditos)
+        st.subheader("📈 Dispersão de Predições")
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(figsize=(6, 4))
+        ax.scatter(df_resultados['real_lat'], df_resultados['pred_lat'], alpha=0.6, color='blue')
+        ax.plot([df_resultados['real_lat'].min(), df_resultados['real_lat'].max()],
+                [df_resultados['real_lat'].min(), df_resultados['real_lat'].max()], 
+                'r--', label='Ideal')
+        ax.set_xlabel("Latitude Real")
+        ax.set_ylabel("Latitude Preditos")
+        ax.legend()
+        st.pyplot(fig)
+
+        # Gráfico de dispersão (Longitude Real vs Preditos)
+        fig, ax = plt.subplots(figsize=(6, 4))
+        ax.scatter(df_resultados['real_lon'], df_resultados['pred_lon'], alpha=0.6, color='green')
+        ax.plot([df_resultados['real_lon'].min(), df_resultados['real_lon'].max()],
+                [df_resultados['real_lon'].min(), df_resultados['real_lon'].max()], 
+                'r--', label='Ideal')
+        ax.set_xlabel("Longitude Real")
+        ax.set_ylabel("Longitude Preditos")
+        ax.legend()
+        st.pyplot(fig)
@@ -0,0 +1,107 @@
+import streamlit as st
+
+from painel_dados import cache_de_graficos, carregar_processado
+from perfil import secao
+from processados import exportar, formatos, numeric_features
+
+# Aba 2 do dashboard: tratamento de ausentes, codificação e normalização, passo a passo.
+# O dataset processado é calculado uma vez por versão dos dados (ver processados.py);
+# a aba só mostra partes dele. As exportações são gravadas quando o botão é clicado.
+
+# Botões "preparar" por formato; o download só aparece no rerun em que o arquivo foi pedido,
+# para o arquivo não ser lido de novo a cada interação
+def botoes_exportacao(df, nome, versao, rotulo):
+    colunas = st.columns(len(formatos))
+    for coluna, formato in zip(colunas, formatos):
+        if coluna.button(f"📦 Preparar {formato.upper()}", key=f"exportar_{nome}_{formato}"):
+            with st.spinner(f"Gravando {formato.upper()}..."), secao(f"exportar {formato}"):
+                caminho = exportar(df, nome, versao, formato)
+            with open(caminho, 'rb') as arquivo:
+                coluna.download_button(label=f"📥 {rotulo} ({formato.upper()})", data=arquivo,
+                                       file_name=f"{nome}{formatos[formato][0]}", mime=formatos[formato][1])
+
+def mostrar(df, versao):
+    st.header("🧹 Pré-processamento de Dados")
+    st.markdown("""
+    ### **Estratégias Adotadas**
+    - **Remoção de Colunas Irrelevantes**:  
+      - `__ERRO__` e `null` excluídas pois não possuem informações úteis.
+    - **Tratamento de Valores Ausentes**:
+      - `tipo_crime`: Preenchidos com a **moda** (`furto`, ~1% ausentes).
+      - `idade`: Preenchida com a **mediana** (24 anos).
+      - `endereco`: Substituído por `"Desconhecido"` (2709 ausências).
+      - `email` e `telefone`: Mantidos como `NaN` (~20% e ~7% ausentes).
+    - **Codificação de Variáveis Categóricas**:
+      - `tipo_crime` e `tipo_dia`: Convertidos via **One-Hot Encoding**.
+    - **Normalização de Variáveis Numéricas**:
+      - `hora`, `idade`, `risco`: Normalizados com **StandardScaler**.
+    - **Objetivo**: Garantir dados limpos e padronizados para modelos de regressão espacial e detecção de padrões.
+    """)
+
+    # Mostrar dados brutos
+    st.subheader("Primeras Linhas do Dataset Bruto")
+    st.dataframe(df.head(10))
+
+    # Tratamento de valores ausentes, one-hot, normalização e códigos (uma vez por versão dos dados)
+    with secao("carregar_processado"):
+        processado = carregar_processado(versao, df)
+    df_processado = processado['tabela']
+
+    # Valores ausentes antes do tratamento
+    st.subheader("Valores Ausentes (Bruto)")
+    st.write(processado['nulos_antes'])
+
+    # Valores após tratamento (moda em tipo_crime, mediana em idade, "Desconhecido" em endereco)
+    st.subheader("Valores Ausentes (Após Tratamento)")
+    st.write(processado['nulos_depois'])
+
+    # Codificação de variáveis categóricas (One-Hot Encoding)
+    st.subheader("Codificação de Variáveis Categóricas")
+    st.code("""
+    df = pd.get_dummies(df, columns=['tipo_crime', 'tipo_dia'], drop_first=True)
+    """, language='python')
+    st.markdown("#### Exemplo das variáveis codificadas:")
+    st.dataframe(df_processado[[col for col in df_processado.columns if 'tipo_crime' in col or 'tipo_dia' in col]].head(10))
+
+    # Normalização de variáveis numéricas
+    st.subheader("Normalização de Variáveis Numéricas")
+    st.code("""
+    from sklearn.preprocessing import StandardScaler
+    df[numeric_features] = StandardScaler().fit_transform(df[numeric_features])
+    """, language='python')
+    st.markdown("#### Exemplo das variáveis normalizadas:")
+    st.dataframe(df_processado[numeric_features].head(10).style.format("{:.2f}"))
+
+    # Codificação de `endereco` (alta cardinalidade) usando factorize
+    st.subheader("Codificação de Variáveis com Alta Cardinalidade")
+    st.markdown("""
+    Para variáveis como `endereco`, que têm alta cardinalidade, usamos codificação numérica simples:
+    ```python
+    df['endereco_code'] = df['endereco'].astype('category').cat.codes
+    ```
+    Isso evita explosão dimensional com One-Hot Encoding.
+    """)
+    st.markdown("#### Exemplo da nova feature codificada:")
+    st.dataframe(df_processado[['endereco_code']].head(10))
+
+    # Mapa de correlação entre features (uma imagem por versão dos dados, no cache de gráficos)
+    st.subheader("Matriz de Correlação entre Features")
+    def desenhar():
+        import seaborn as sns
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(10, 8))
+        ax = fig.add_subplot()
+        sns.heatmap(processado['correlacao'], annot=True, cmap='coolwarm', fmt='.2f', ax=ax)
+        ax.set_title("Mapa de Calor de Correlação entre Features")
+        fig.tight_layout()
+        return fig
+    with secao("correlação entre features"):
+        st.image(cache_de_graficos().obter((versao, 'correlacao_features'), desenhar)['tela'])
+
+    # Estatísticas descritivas
+    st.subheader("Estatísticas Descritivas")
+    st.write(processado['descricao'])
+
+    # Exportação de dados processados (CSV, CSV compactado ou Parquet com zstd)
+    st.subheader("Exportar Dados Processados")
+    botoes_exportacao(df_processado, "crimes_processados", versao, "Exportar Dados Processados")
@@ -0,0 +1,73 @@
+import os
+
+import streamlit as st
+
+from perfil import secao
+from relatorio import caminhos, extensoes, gravar_agregados, iniciar_em_segundo_plano, ler_progresso, montar_agregados
+
+# Relatório semanal na aba 1: todos os gráficos da EDA para cada hora × tipo de crime, num .zip ou PDF.
+# O pacote é desenhado por relatorio.py num processo separado; o rerun só grava os agregados
+# (uma vez por versão dos dados) e dispara o processo. O progresso é lido do JSON do relatório
+# por um fragmento que roda a cada segundo, só enquanto o pacote está sendo desenhado.
+
+nomes_formatos = {'zip': "ZIP de PNGs", 'pdf': "PDF"}
+
+# Popen de cada relatório disparado por este servidor, por arquivo de progresso: um dicionário por
+# processo, visto por todas as sessões. O poll() diz se o processo terminou e o colhe (sem zumbi)
+@st.cache_resource
+def processos_relatorio():
+    return {}
+
+# (progresso, situação); "renderizando" só vale enquanto o processo disparado daqui está rodando
+def _situacao(caminho):
+    progresso = ler_progresso(caminho)
+    if progresso is None or progresso['estado'] != 'renderizando':
+        return progresso, progresso['estado'] if progresso else None
+    processo = processos_relatorio().get(caminho)
+    if processo is None:
+        return progresso, 'erro'  # disparado antes de o servidor reiniciar
+    if processo.poll() is None:
+        return progresso, 'renderizando'
+    # Terminou entre a leitura e o poll(): vale o último progresso que ele gravou
+    progresso = ler_progresso(caminho) or progresso
+    return progresso, 'erro' if progresso['estado'] == 'renderizando' else progresso['estado']
+
+def mostrar(df, cubo, versao):
+    with st.expander("🗂️ Relatório Semanal (todas as horas × tipos de crime)", expanded=False), \
+            secao("Relatório Semanal"):
+        formato = st.radio("Formato", list(extensoes), format_func=nomes_formatos.get, horizontal=True,
+                           key='relatorio_formato')
+        arquivos = caminhos(versao, formato)
+        progresso, situacao = _situacao(arquivos['progresso'])
+        if situacao == 'concluido' and not os.path.exists(arquivos['destino']):
+            situacao = None
+
+        if situacao == 'erro':
+            st.error(f"O relatório anterior não terminou: {progresso.get('erro', 'processo interrompido')}")
+        if situacao in (None, 'erro') and st.button("🗂️ Gerar relatório", key='relatorio_gerar'):
+            with secao("gravar agregados do relatório"):
+                if not os.path.exists(arquivos['agregados']):
+                    gravar_agregados(montar_agregados(df, cubo, versao), arquivos['agregados'])
+            processos_relatorio()[arquivos['progresso']] = iniciar_em_segundo_plano(
+                arquivos['agregados'], arquivos['destino'], formato, arquivos['progresso'])
+            situacao = 'renderizando'
+
+        if situacao == 'renderizando':
+            @st.fragment(run_every="1s")
+            def acompanhar():
+                progresso, situacao = _situacao(arquivos['progresso'])
+                if situacao != 'renderizando':
+                    st.rerun()  # concluído ou com erro: o rerun completo mostra o resultado
+                concluidos, total = progresso.get('concluidos', 0), progresso.get('total', 0)
+                st.progress(concluidos / total if total else 0.0,
+                            text=f"Desenhando: {concluidos}/{total} células, {progresso.get('graficos', 0)} gráficos")
+            acompanhar()
+
+        # Mesmo padrão das exportações da aba 2: o arquivo só é lido no rerun em que o download é pedido
+        if situacao == 'concluido':
+            st.success(f"{progresso['graficos']} gráficos desenhados em {progresso['segundos']:.1f}s")
+            if st.button(f"📦 Preparar {nomes_formatos[formato]}", key='relatorio_preparar'):
+                with open(arquivos['destino'], 'rb') as arquivo:
+                    st.download_button(label=f"📥 Baixar Relatório ({formato.upper()})", data=arquivo,
+                                       file_name=f"relatorio_semanal{extensoes[formato]}",
+                                       mime='application/zip' if formato == 'zip' else 'application/pdf')
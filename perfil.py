@@ -0,0 +1,95 @@
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import streamlit as st
+
+# Modo de perfil do dashboard (opcional): tempo de cada aba, expander e chamada pesada do rerun.
+# Liga com a variável de ambiente PERFIL_DASHBOARD=1 ou com ?perfil=1 na URL;
+# com "cprofile" no lugar de 1, o rerun inteiro também passa pelo cProfile.
+# Cada rerun perfilado grava um JSON (e o .prof, se houver) em `pasta_perfis` e
+# mostra a tabela de tempos na barra lateral. Desligado, `secao` não mede nada.
+
+pasta_perfis = 'perfis'
+variavel_ambiente = 'PERFIL_DASHBOARD'
+
+_nulo = nullcontext()
+# Cada sessão roda o script na sua própria thread: o perfil do rerun fica na thread
+_local = threading.local()
+
+class Perfil:
+    def __init__(self, cprofile=False):
+        self.inicio = time.perf_counter()
+        self.horario = time.time()
+        self.secoes = []
+        self._caminho = []
+        self.cprofile = cProfile.Profile() if cprofile else None
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+    @contextmanager
+    def secao(self, nome):
+        self._caminho.append(nome)
+        registro = {'nome': nome, 'caminho': ' / '.join(self._caminho), 'profundidade': len(self._caminho) - 1,
+                    'inicio_ms': (time.perf_counter() - self.inicio) * 1000}
+        self.secoes.append(registro)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            registro['ms'] = (time.perf_counter() - inicio) * 1000
+            self._caminho.pop()
+
+    def total_ms(self):
+        return (time.perf_counter() - self.inicio) * 1000
+
+    def gravar(self, pasta=pasta_perfis):
+        os.makedirs(pasta, exist_ok=True)
+        nome = os.path.join(pasta, f"rerun-{time.time_ns():020d}-{threading.get_ident()}")
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(f"{nome}.prof")
+        with open(f"{nome}.json", 'w', encoding='utf-8') as arquivo:
+            json.dump({'horario': self.horario, 'total_ms': self.total_ms(), 'secoes': self.secoes,
+                       'cprofile': f"{nome}.prof" if self.cprofile is not None else None}, arquivo, indent=2)
+        return nome
+
+def _modo():
+    modo = os.environ.get(variavel_ambiente) or st.query_params.get('perfil')
+    return None if modo in (None, '', '0') else modo
+
+# Começo do rerun: cria o perfil se o modo estiver ligado (ou se pediram um cProfile pelo painel)
+def iniciar():
+    modo = _modo()
+    pedido = st.session_state.pop('_perfil_cprofile', False)
+    _local.perfil = Perfil(cprofile=modo == 'cprofile' or pedido) if modo else None
+    return _local.perfil
+
+def atual():
+    return getattr(_local, 'perfil', None)
+
+# Mede o bloco no perfil do rerun; sem perfil ativo é um contexto vazio
+def secao(nome):
+    perfil = atual()
+    return _nulo if perfil is None else perfil.secao(nome)
+
+# Fim do rerun: grava o traço e mostra a tabela de tempos na barra lateral
+def finalizar():
+    perfil = atual()
+    if perfil is None:
+        return
+    _local.perfil = None
+    total = perfil.total_ms()
+    nome = perfil.gravar()
+    with st.sidebar.expander("⏱️ Perfil do rerun", expanded=True):
+        st.markdown(f"**Total**: {total:.0f} ms")
+        st.dataframe([{'seção': ' ' * s['profundidade'] + s['nome'], 'ms': round(s['ms'], 1),
+                       '%': round(100 * s['ms'] / total, 1)} for s in perfil.secoes],
+                     hide_index=True)
+        st.caption(f"Traço: {nome}.json" + (f" · cProfile: {nome}.prof" if perfil.cprofile is not None else ""))
+        if perfil.cprofile is None and st.button("Capturar cProfile do próximo rerun"):
+            st.session_state['_perfil_cprofile'] = True
+            st.rerun()
@@ -0,0 +1,133 @@
+import argparse
+import io
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import pandas as pd
+
+from modelos import features, hiperparametros, obter_modelo
+
+# Serviço de previsão das coordenadas (latitude, longitude) de ocorrências.
+# O pré-processamento e o modelo são carregados uma única vez (do registro de
+# modelos.py) e cada lote é pontuado de forma vetorizada: um transform + um predict.
+# Entrada: linhas com hora, idade, risco, tipo_crime e tipo_dia, em CSV, Parquet ou JSON
+# (lista de objetos ou lista de listas nessa ordem).
+#   CLI:  python previsao.py --modelo XGBoost --entrada consultas.csv --saida previsoes.csv
+#   HTTP: python previsao.py --modelo XGBoost --servir --porta 8600   (POST /prever, GET /saude)
+
+class Previsor:
+    def __init__(self, preprocessor, model, nome=None):
+        self.preprocessor = preprocessor
+        self.model = model
+        self.nome = nome
+
+    # Arquivo do registro (--registro) ou o modelo dos dados atuais (treina só se não estiver no registro)
+    @classmethod
+    def carregar(cls, nome="XGBoost", registro=None):
+        if registro is not None:
+            entrada = joblib.load(registro)
+        else:
+            from dados import carregar_compacto
+            entrada, _ = obter_modelo(carregar_compacto(), nome)
+        return cls(entrada['preprocessor'], entrada['model'], entrada['modelo'])
+
+    def prever(self, df):
+        preds = self.model.predict(self.preprocessor.transform(df[features]))
+        return pd.DataFrame({'latitude': preds[:, 0], 'longitude': preds[:, 1]}, index=df.index)
+
+def ler_consultas(dados, formato):
+    if formato == 'parquet':
+        return pd.read_parquet(io.BytesIO(dados))
+    if formato == 'csv':
+        return pd.read_csv(io.BytesIO(dados))
+    linhas = json.loads(dados)
+    if not isinstance(linhas, list):
+        raise ValueError("o corpo JSON deve ser uma lista de consultas")
+    if linhas and not isinstance(linhas[0], dict):
+        return pd.DataFrame(linhas, columns=features)
+    return pd.DataFrame(linhas)
+
+def formato_do_arquivo(caminho):
+    extensao = os.path.splitext(caminho)[1].lower()
+    return {'.parquet': 'parquet', '.csv': 'csv'}.get(extensao, 'json')
+
+def formato_do_conteudo(tipo):
+    tipo = (tipo or '').split(';')[0].strip()
+    if tipo in ('text/csv', 'application/csv'):
+        return 'csv'
+    if tipo in ('application/vnd.apache.parquet', 'application/x-parquet', 'application/octet-stream'):
+        return 'parquet'
+    return 'json'
+
+def criar_servidor(previsor, host='127.0.0.1', porta=8600):
+    class Manipulador(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _responder(self, status, corpo):
+            dados = json.dumps(corpo).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def do_GET(self):
+            if self.path == '/saude':
+                self._responder(200, {'status': 'ok', 'modelo': previsor.nome})
+            else:
+                self._responder(404, {'erro': 'rota não encontrada'})
+
+        def do_POST(self):
+            if self.path != '/prever':
+                self._responder(404, {'erro': 'rota não encontrada'})
+                return
+            dados = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            try:
+                consultas = ler_consultas(dados, formato_do_conteudo(self.headers.get('Content-Type')))
+                preds = previsor.prever(consultas)
+            except (ValueError, KeyError, TypeError) as erro:
+                self._responder(400, {'erro': str(erro)})
+                return
+            self._responder(200, {'latitude': preds['latitude'].tolist(), 'longitude': preds['longitude'].tolist()})
+
+        def log_message(self, formato, *args):
+            pass  # uma linha por requisição atrapalha a medição de latência
+
+    return ThreadingHTTPServer((host, porta), Manipulador)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Previsão em lote das coordenadas de ocorrências")
+    parser.add_argument('--modelo', choices=sorted(hiperparametros), default="XGBoost", help="modelo do registro")
+    parser.add_argument('--registro', default=None, help="arquivo .joblib do registro (padrão: modelo dos dados atuais)")
+    parser.add_argument('--entrada', help="arquivo de consultas (.csv, .parquet ou .json)")
+    parser.add_argument('--saida', default='previsoes.csv', help="arquivo de saída (.csv ou .parquet)")
+    parser.add_argument('--servir', action='store_true', help="sobe o endpoint HTTP em vez de pontuar um arquivo")
+    parser.add_argument('--host', default='127.0.0.1', help="endereço do endpoint HTTP")
+    parser.add_argument('--porta', type=int, default=8600, help="porta do endpoint HTTP")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    previsor = Previsor.carregar(args.modelo, args.registro)
+    print(f"Modelo {previsor.nome} carregado em {time.perf_counter() - inicio:.1f}s")
+
+    if args.servir:
+        servidor = criar_servidor(previsor, args.host, args.porta)
+        print(f"Servindo em http://{args.host}:{args.porta}/prever")
+        servidor.serve_forever()
+    else:
+        if args.entrada is None:
+            parser.error("--entrada é obrigatório sem --servir")
+        with open(args.entrada, 'rb') as arquivo:
+            consultas = ler_consultas(arquivo.read(), formato_do_arquivo(args.entrada))
+        inicio = time.perf_counter()
+        resultado = pd.concat([consultas, previsor.prever(consultas).add_prefix('pred_')], axis=1)
+        segundos = time.perf_counter() - inicio
+        if formato_do_arquivo(args.saida) == 'parquet':
+            resultado.to_parquet(args.saida, index=False)
+        else:
+            resultado.to_csv(args.saida, index=False)
+        print(f"✅ {len(resultado)} previsões em {segundos:.2f}s ({len(resultado) / max(segundos, 1e-9):.0f}/s) "
+              f"gravadas em '{args.saida}'")
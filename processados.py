@@ -0,0 +1,87 @@
+import gzip
+import hashlib
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Dataset processado da aba "Pré-processamento" como artefato versionado.
+# processar() faz uma vez, por versão dos dados, o que a aba mostra passo a passo
+# (ausentes, one-hot, StandardScaler, códigos de `endereco`, correlação e describe).
+# As exportações só são gravadas quando pedidas, em blocos de linhas (a tabela nunca vira
+# uma string inteira na memória), num arquivo por versão em `pasta_exportacoes`:
+# pedir de novo a mesma versão só reabre o arquivo.
+
+pasta_exportacoes = 'exportacoes'
+linhas_por_bloco = 200_000
+
+numeric_features = ['hora', 'idade', 'risco']
+categorical_cols = ['tipo_crime', 'tipo_dia']
+
+formatos = {
+    'csv': ('.csv', 'text/csv'),
+    'csv.gz': ('.csv.gz', 'application/gzip'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+}
+
+def processar(df):
+    from sklearn.preprocessing import StandardScaler
+
+    nulos_antes = df.isna().sum()
+    df_processado = df.drop(columns=["__ERRO__", "null"], errors='ignore')
+
+    # Preencher nulos com moda ou mediana
+    df_processado['tipo_crime'] = df_processado['tipo_crime'].fillna(df_processado['tipo_crime'].mode()[0])
+    df_processado['idade'] = df_processado['idade'].fillna(df_processado['idade'].median())
+    df_processado['endereco'] = df_processado['endereco'].astype(object).fillna("Desconhecido")
+    nulos_depois = df_processado.isna().sum()
+
+    df_processado = pd.get_dummies(df_processado, columns=categorical_cols, drop_first=True)
+    df_processado[numeric_features] = StandardScaler().fit_transform(df_processado[numeric_features])
+    df_processado['endereco_code'] = df_processado['endereco'].astype('category').cat.codes
+    df_processado.drop(columns=['endereco'], inplace=True)
+
+    return {'tabela': df_processado, 'nulos_antes': nulos_antes, 'nulos_depois': nulos_depois,
+            'correlacao': df_processado.corr(numeric_only=True), 'descricao': df_processado.describe()}
+
+def caminho_exportacao(nome, versao, formato, pasta=pasta_exportacoes):
+    sufixo = hashlib.sha1(versao.encode()).hexdigest()[:16]
+    return os.path.join(pasta, f"{nome}-{sufixo}{formatos[formato][0]}")
+
+def _blocos(df, tamanho):
+    for inicio in range(0, len(df), tamanho):
+        yield df.iloc[inicio:inicio + tamanho]
+
+def gravar_csv(df, destino, comprimir=False, tamanho=linhas_por_bloco):
+    abrir = gzip.open if comprimir else open
+    with abrir(destino, 'wt', encoding='utf-8', newline='') as arquivo:
+        for i, bloco in enumerate(_blocos(df, tamanho)):
+            bloco.to_csv(arquivo, header=i == 0, index=False)
+
+def gravar_parquet(df, destino, tamanho=linhas_por_bloco):
+    escritor = None
+    try:
+        for bloco in _blocos(df, tamanho):
+            tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+            if escritor is None:
+                escritor = pq.ParquetWriter(destino, tabela.schema, compression='zstd')
+            escritor.write_table(tabela.cast(escritor.schema))
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+# Caminho do arquivo exportado; grava só se esta versão ainda não foi exportada neste formato
+def exportar(df, nome, versao, formato, pasta=pasta_exportacoes):
+    destino = caminho_exportacao(nome, versao, formato, pasta)
+    if os.path.exists(destino):
+        return destino
+    os.makedirs(pasta, exist_ok=True)
+    temporario = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"  # sessões são threads do mesmo processo
+    if formato == 'parquet':
+        gravar_parquet(df, temporario)
+    else:
+        gravar_csv(df, temporario, comprimir=formato == 'csv.gz')
+    os.replace(temporario, destino)  # outra sessão nunca serve um arquivo pela metade
+    return destino
@@ -0,0 +1,275 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
+import numpy as np
+
+import graficos_eda as g
+from cubo import total
+
+# Pacote semanal com os gráficos da aba 1 para todas as horas ("Geral" e 0–23) × todos os tipos
+# de crime ("todos" e cada tipo), num .zip de PNGs (<tipo>/<hora>/<gráfico>.png) ou num PDF de
+# várias páginas. Os processos do pool não leem as linhas: recebem só os agregados (o cubo,
+# ver cubo.py, e as contagens por tipo × hora × idade), gravados uma vez num arquivo .pkl.
+# Cada tarefa desenha os gráficos de uma célula (tipo, hora); gráficos que não dependem de um dos
+# eixos (ex.: "por hora", "noturnos", "graves") só são desenhados uma vez nesse eixo.
+# O progresso vai para um JSON regravado a cada célula; o dashboard roda este script em segundo
+# plano (iniciar_em_segundo_plano) e só lê esse arquivo.
+
+pasta_relatorios = 'relatorios'
+dpi_relatorio = 100
+extensoes = {'zip': '.zip', 'pdf': '.pdf'}
+
+_agregados = {}
+
+# Contagens por tipo (NaN na última posição, como no cubo) × hora × idade, para o histograma de idade
+def agregar_idades(df, rotulos_tipo):
+    df = df.dropna(subset=['idade', 'hora'])
+    idade = df['idade'].to_numpy().astype(np.int64)
+    idades = np.unique(idade)
+    codigos = df['tipo_crime'].cat.codes.to_numpy().astype(np.int64)
+    codigos = np.where(codigos < 0, len(rotulos_tipo) - 1, codigos)
+    forma = (len(rotulos_tipo), 24, len(idades))
+    indice = np.ravel_multi_index([codigos, df['hora'].to_numpy().astype(np.int64), np.searchsorted(idades, idade)], forma)
+    return {'idades': idades, 'contagem': np.bincount(indice, minlength=np.prod(forma)).reshape(forma)}
+
+def montar_agregados(df, cubo, versao):
+    return {'versao': versao, 'cubo': cubo, 'idades': agregar_idades(df, cubo['rotulos']['tipo_crime'])}
+
+def caminhos(versao, formato, pasta=pasta_relatorios):
+    sufixo = hashlib.sha1(versao.encode()).hexdigest()[:16]
+    base = os.path.join(pasta, f"relatorio-{sufixo}")
+    return {'destino': f"{base}{extensoes[formato]}", 'progresso': f"{base}-{formato}.json",
+            'agregados': f"{base}.pkl"}
+
+def _gravar_atomico(caminho, dados, modo='wb'):
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"  # sessões são threads do mesmo processo
+    with open(temporario, modo) as arquivo:
+        arquivo.write(dados)
+    os.replace(temporario, caminho)
+
+def gravar_agregados(agregados, caminho):
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    _gravar_atomico(caminho, pickle.dumps(agregados, protocol=pickle.HIGHEST_PROTOCOL))
+
+def gravar_progresso(caminho, **estado):
+    if caminho:
+        _gravar_atomico(caminho, json.dumps(estado, ensure_ascii=False), 'w')
+
+# Estado do último pedido ({'estado': 'renderizando' | 'concluido' | 'erro', ...}), ou None
+def ler_progresso(caminho):
+    try:
+        with open(caminho, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+# Células da matriz: tipo None = todos, hora None = "Geral"
+def celulas(cubo):
+    tipos = [None] + [t for t in cubo['rotulos']['tipo_crime'] if isinstance(t, str)]
+    return [(tipo, hora) for tipo in tipos for hora in [None] + list(range(24))]
+
+def _nome_celula(tipo, hora):
+    return f"{tipo or 'todos'}/{'geral' if hora is None else f'{hora:02d}'}"
+
+# Inicializador do processo: lê os agregados uma vez e fixa o backend sem janela
+def _abrir(caminho_agregados):
+    import matplotlib
+    matplotlib.use('Agg')
+    with open(caminho_agregados, 'rb') as arquivo:
+        _agregados.update(pickle.load(arquivo))
+
+def _idades(tipo, hora):
+    idades, contagem = _agregados['idades']['idades'], _agregados['idades']['contagem']
+    if tipo is not None:
+        contagem = contagem[_agregados['cubo']['rotulos']['tipo_crime'].index(tipo)][None]
+    if hora is not None:
+        contagem = contagem[:, hora][:, None]
+    contagem = contagem.sum(axis=(0, 1))
+    return idades[contagem > 0], contagem[contagem > 0]
+
+# (id, desenhar) de cada gráfico da célula, com os mesmos dados que a aba 1 mostraria nesse filtro
+def graficos_da_celula(tipo, hora):
+    cubo = _agregados['cubo']
+    tipos = None if tipo is None else [tipo]
+    horas = None if hora is None else [hora]
+    if total(cubo, tipo_crime=tipos, hora=horas) == 0:
+        return []
+    graficos = []
+    if tipo is None:
+        crimes = g.crimes_por_tipo(cubo, None, horas)
+        graves = g.horarios_graves(cubo, horas)
+        graficos += [('grafico_tipo', lambda: g.desenhar_barras_tipo(crimes)),
+                     ('grafico_tipo_pizza', lambda: g.desenhar_pizza_tipo(crimes))]
+        if not graves.empty:
+            graficos.append(('grafico_graves', lambda: g.desenhar_graves(graves)))
+        if hora is None:
+            por_hora = g.crimes_por_hora(cubo)
+            graficos.append(('grafico_hora', lambda: g.desenhar_hora(por_hora)))
+    top_ruas = g.top_regioes(cubo, tipos, horas)
+    risco = g.risco_por_regiao(cubo, tipos, horas)
+    graficos += [('grafico_regiao', lambda: g.desenhar_regiao(top_ruas)),
+                 ('risco_regiao', lambda: g.desenhar_risco(risco))]
+    if hora is None:
+        noturnos, total_noturnos = g.crimes_noturnos(cubo, tipos)
+        if total_noturnos:
+            graficos += [('grafico_noturno_barras',
+                          lambda: g.desenhar_barras_tipo(noturnos, "Frequência de Crimes Noturnos")),
+                         ('grafico_noturno_pizza',
+                          lambda: g.desenhar_pizza_tipo(noturnos, "Distribuição de Crimes Noturnos"))]
+    idades, pesos = _idades(tipo, hora)
+    if len(idades):
+        graficos.append(('grafico_idade', lambda: g.desenhar_idade(idades, pesos)))
+    por_ano = g.crimes_por_ano(cubo, tipos, horas)
+    graficos.append(('grafico_ano', lambda: g.desenhar_ano(por_ano)))
+    return graficos
+
+# Tarefa de um processo: [(caminho no pacote, imagem, (largura, altura) em pixels)] da célula.
+# No PDF cada página é um JPEG (entra no arquivo sem ser decodificado de novo)
+def renderizar_celula(tipo, hora, formato):
+    from PIL import Image
+
+    nome = _nome_celula(tipo, hora)
+    rotulo = f"Tipo: {tipo or 'todos'} — Hora: {'Geral' if hora is None else f'{hora:02d}h'}"
+    imagens = []
+    for grafico, desenhar in graficos_da_celula(tipo, hora):
+        fig = desenhar()
+        fig.suptitle(rotulo, x=0.01, y=1.02, ha='left', fontsize=9, color='dimgray')
+        buf = BytesIO()
+        if formato == 'pdf':
+            fig.savefig(buf, format='jpeg', dpi=dpi_relatorio, bbox_inches='tight', pil_kwargs={'quality': 90})
+        else:
+            fig.savefig(buf, format='png', dpi=dpi_relatorio, bbox_inches='tight')
+        imagem = buf.getvalue()
+        imagens.append((f"{nome}/{grafico}.png", imagem, Image.open(BytesIO(imagem)).size))
+    return imagens
+
+# PDF mínimo com uma imagem JPEG por página, gravado à medida que as páginas chegam
+# (fora de ordem); a ordem das páginas só é fixada no fim, na lista /Kids
+class PdfImagens:
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.posicoes = {}
+        self.paginas = []
+        self.proximo = 3  # 1 = catálogo, 2 = árvore de páginas
+        arquivo.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _objeto(self, numero, dicionario, fluxo=None):
+        self.posicoes[numero] = self.arquivo.tell()
+        self.arquivo.write(f"{numero} 0 obj\n{dicionario}".encode('latin-1'))
+        if fluxo is not None:
+            self.arquivo.write(b"\nstream\n" + fluxo + b"\nendstream")
+        self.arquivo.write(b"\nendobj\n")
+
+    def adicionar(self, ordem, jpeg, largura, altura, dpi=dpi_relatorio):
+        imagem, desenho, pagina = self.proximo, self.proximo + 1, self.proximo + 2
+        self.proximo += 3
+        pontos_l, pontos_a = largura * 72 / dpi, altura * 72 / dpi
+        self._objeto(imagem, f"<< /Type /XObject /Subtype /Image /Width {largura} /Height {altura} "
+                             f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode "
+                             f"/Length {len(jpeg)} >>", jpeg)
+        conteudo = f"q {pontos_l:.2f} 0 0 {pontos_a:.2f} 0 0 cm /Im0 Do Q".encode('latin-1')
+        self._objeto(desenho, f"<< /Length {len(conteudo)} >>", conteudo)
+        self._objeto(pagina, f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {pontos_l:.2f} {pontos_a:.2f}] "
+                             f"/Resources << /XObject << /Im0 {imagem} 0 R >> >> /Contents {desenho} 0 R >>")
+        self.paginas.append((ordem, pagina))
+
+    def fechar(self):
+        filhos = ' '.join(f"{pagina} 0 R" for _, pagina in sorted(self.paginas))
+        self._objeto(2, f"<< /Type /Pages /Kids [{filhos}] /Count {len(self.paginas)} >>")
+        self._objeto(1, "<< /Type /Catalog /Pages 2 0 R >>")
+        inicio_xref = self.arquivo.tell()
+        linhas = [f"xref\n0 {self.proximo}\n", "0000000000 65535 f \n"]
+        linhas += [f"{self.posicoes[numero]:010d} 00000 n \n" for numero in range(1, self.proximo)]
+        linhas.append(f"trailer\n<< /Size {self.proximo} /Root 1 0 R >>\nstartxref\n{inicio_xref}\n%%EOF\n")
+        self.arquivo.write(''.join(linhas).encode('latin-1'))
+
+# Desenha a matriz inteira no pool e empacota em `destino` (.zip ou .pdf); devolve o número de gráficos
+def gerar_relatorio(caminho_agregados, destino, formato='zip', processos=None, progresso=None):
+    inicio = time.perf_counter()
+    with open(caminho_agregados, 'rb') as arquivo:
+        cubo = pickle.load(arquivo)['cubo']
+    matriz = celulas(cubo)
+    gravar_progresso(progresso, estado='renderizando', concluidos=0, total=len(matriz), graficos=0,
+                     pid=os.getpid())
+
+    os.makedirs(os.path.dirname(destino) or '.', exist_ok=True)
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    graficos = 0
+    try:
+        with open(temporario, 'wb') as saida, \
+                ProcessPoolExecutor(max_workers=processos, initializer=_abrir,
+                                    initargs=(caminho_agregados,)) as executor:
+            pacote = PdfImagens(saida) if formato == 'pdf' else zipfile.ZipFile(saida, 'w', zipfile.ZIP_STORED)
+            tarefas = {executor.submit(renderizar_celula, tipo, hora, formato): ordem
+                       for ordem, (tipo, hora) in enumerate(matriz)}
+            for concluidos, tarefa in enumerate(as_completed(tarefas), start=1):
+                for posicao, (caminho, imagem, (largura, altura)) in enumerate(tarefa.result()):
+                    if formato == 'pdf':
+                        pacote.adicionar((tarefas[tarefa], posicao), imagem, largura, altura)
+                    else:
+                        pacote.writestr(caminho, imagem)  # PNG já é comprimido
+                    graficos += 1
+                gravar_progresso(progresso, estado='renderizando', concluidos=concluidos, total=len(matriz),
+                                 graficos=graficos, pid=os.getpid())
+            if formato == 'pdf':
+                pacote.fechar()
+            else:
+                pacote.close()
+        os.replace(temporario, destino)  # quem baixa nunca pega o pacote pela metade
+    except BaseException as erro:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        gravar_progresso(progresso, estado='erro', erro=repr(erro), pid=os.getpid())
+        raise
+
+    segundos = time.perf_counter() - inicio
+    gravar_progresso(progresso, estado='concluido', concluidos=len(matriz), total=len(matriz), graficos=graficos,
+                     arquivo=destino, segundos=segundos, pid=os.getpid())
+    print(f"✅ {graficos} gráficos ({len(matriz)} células) em '{destino}' em {segundos:.1f}s")
+    return graficos
+
+# Roda este script num processo separado (o rerun do dashboard não espera); o progresso sai em `progresso`.
+# Devolve o Popen: quem dispara guarda e usa poll() para saber se o processo terminou (e colhê-lo)
+def iniciar_em_segundo_plano(caminho_agregados, destino, formato, progresso, processos=None):
+    gravar_progresso(progresso, estado='renderizando', concluidos=0, total=0, graficos=0)
+    comando = [sys.executable, os.path.abspath(__file__), '--agregados', caminho_agregados,
+               '--destino', destino, '--formato', formato, '--progresso', progresso]
+    if processos:
+        comando += ['--processos', str(processos)]
+    return subprocess.Popen(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pacote com os gráficos da EDA para todas as horas e tipos de crime")
+    parser.add_argument('--formato', choices=list(extensoes), default='zip', help="zip de PNGs ou PDF de várias páginas")
+    parser.add_argument('--agregados', default=None,
+                        help="arquivo .pkl com os agregados (padrão: calcula a partir dos dados atuais)")
+    parser.add_argument('--destino', default=None, help="arquivo de saída (padrão: relatorios/relatorio-<versão>)")
+    parser.add_argument('--progresso', default=None, help="JSON regravado a cada célula concluída")
+    parser.add_argument('--processos', type=int, default=None, help="processos no pool (padrão: núcleos da máquina)")
+    args = parser.parse_args()
+
+    agregados = args.agregados
+    destino = args.destino
+    if agregados is None:
+        from cubo import montar_cubo
+        from dados import carregar_compacto, versao_dados
+        versao = versao_dados()
+        df = carregar_compacto()
+        agregados = caminhos(versao, args.formato)['agregados']
+        gravar_agregados(montar_agregados(df, montar_cubo(df), versao), agregados)
+        destino = destino or caminhos(versao, args.formato)['destino']
+    if destino is None:
+        with open(agregados, 'rb') as arquivo:
+            destino = caminhos(pickle.load(arquivo)['versao'], args.formato)['destino']
+
+    gerar_relatorio(agregados, destino, args.formato, args.processos, args.progresso)
@@ -0,0 +1,121 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from geo import desprojetar, projetar
+
+# Superfície de risco pré-calculada: KDE (núcleo gaussiano) ponderado por `peso`,
+# numa grade fixa em metros sobre a caixa da Asa Sul, uma camada por (hora, tipo de crime).
+# A soma de `peso` por célula é montada com um único bincount e suavizada com convolução
+# por FFT (todas as camadas de uma hora de uma vez). Como a KDE é linear, a superfície de
+# vários tipos ou do dia inteiro é só a soma das camadas.
+# O arquivo (.npz) guarda as camadas em float16, a geometria da grade e a versão dos dados.
+
+arquivo_risco = 'risco_kde.npz'
+
+origem = (-15.850, -47.930)    # canto sudoeste (lat, lon)
+extremo = (-15.775, -47.865)   # canto nordeste
+tamanho_celula = 25            # metros
+largura_banda = 150            # desvio padrão do núcleo, em metros
+
+def forma_grade(tamanho=tamanho_celula):
+    x, y = projetar(extremo[0], extremo[1], origem)
+    return int(np.ceil(y / tamanho)), int(np.ceil(x / tamanho))
+
+def _nucleo(tamanho, banda):
+    raio = int(np.ceil(3 * banda / tamanho))
+    eixo = np.arange(-raio, raio + 1) * tamanho
+    g = np.exp(-0.5 * (eixo / banda) ** 2)
+    nucleo = np.outer(g, g)
+    return nucleo / nucleo.sum(), raio
+
+# lat/lon/hora/tipo (código 0..n_tipos-1)/peso → camadas [24, n_tipos, linhas, colunas]
+def calcular_camadas(lat, lon, hora, tipo, peso, n_tipos, tamanho=tamanho_celula, banda=largura_banda):
+    linhas, colunas = forma_grade(tamanho)
+    x, y = projetar(lat, lon, origem)
+    coluna = np.floor(x / tamanho)
+    linha = np.floor(y / tamanho)
+    hora = np.asarray(hora, np.float64)
+    tipo = np.asarray(tipo, np.int64)
+    dentro = ((coluna >= 0) & (coluna < colunas) & (linha >= 0) & (linha < linhas) &
+              (hora >= 0) & (hora < 24) & (tipo >= 0) & (tipo < n_tipos))
+    indice = (((hora[dentro].astype(np.int64) * n_tipos + tipo[dentro]) * linhas + linha[dentro].astype(np.int64))
+              * colunas + coluna[dentro].astype(np.int64))
+    somas = np.bincount(indice, weights=np.asarray(peso, np.float64)[dentro],
+                        minlength=24 * n_tipos * linhas * colunas).reshape(24, n_tipos, linhas, colunas)
+
+    nucleo, raio = _nucleo(tamanho, banda)
+    forma_fft = (linhas + 2 * raio, colunas + 2 * raio)  # convolução linear, sem dar a volta nas bordas
+    nucleo_fft = np.fft.rfft2(nucleo, s=forma_fft)
+    camadas = np.empty((24, n_tipos, linhas, colunas), np.float32)
+    for h in range(24):
+        suavizado = np.fft.irfft2(np.fft.rfft2(somas[h], s=forma_fft) * nucleo_fft, s=forma_fft)
+        camadas[h] = np.maximum(suavizado[:, raio:raio + linhas, raio:raio + colunas], 0)
+    return camadas
+
+def gerar_risco(destino=arquivo_risco, tamanho=tamanho_celula, banda=largura_banda):
+    from dados import carregar_compacto, versao_dados
+
+    inicio = time.perf_counter()
+    df = carregar_compacto()
+    tipos = list(df['tipo_crime'].cat.categories)
+    camadas = calcular_camadas(df['latitude'], df['longitude'], df['hora'], df['tipo_crime'].cat.codes,
+                               df['peso'], len(tipos), tamanho, banda)
+    np.savez_compressed(destino, camadas=camadas.astype(np.float16), tipos=np.array(tipos),
+                        origem=np.array(origem), tamanho=tamanho, banda=banda, versao=versao_dados())
+    print(f"✅ {camadas.shape[0] * camadas.shape[1]} camadas {camadas.shape[2]}×{camadas.shape[3]} "
+          f"gravadas em '{destino}' em {time.perf_counter() - inicio:.1f}s")
+    return camadas
+
+# Superfície gravada; None se não existir ou for de outra versão dos dados
+def ler_risco(caminho=arquivo_risco, versao=None):
+    if not os.path.exists(caminho):
+        return None
+    with np.load(caminho) as arquivo:
+        if versao is not None and str(arquivo['versao']) != versao:
+            return None
+        return {'camadas': arquivo['camadas'], 'tipos': arquivo['tipos'].tolist(),
+                'origem': tuple(arquivo['origem']), 'tamanho': float(arquivo['tamanho'])}
+
+# Soma das camadas: hora "Geral"/None = todas, tipos None = todos
+def superficie(risco, hora=None, tipos=None):
+    camadas = risco['camadas']
+    if hora is not None and hora != "Geral":
+        camadas = camadas[int(hora):int(hora) + 1]
+    if tipos is not None:
+        camadas = camadas[:, [risco['tipos'].index(t) for t in tipos if t in risco['tipos']]]
+    return camadas.sum(axis=(0, 1), dtype=np.float32)
+
+# Valor da superfície em cada ponto (0 fora da grade)
+def risco_no_ponto(risco, lat, lon, hora=None, tipos=None):
+    camada = superficie(risco, hora, tipos)
+    x, y = projetar(lat, lon, risco['origem'])
+    linha = np.floor(np.atleast_1d(y) / risco['tamanho']).astype(np.int64)
+    coluna = np.floor(np.atleast_1d(x) / risco['tamanho']).astype(np.int64)
+    dentro = (linha >= 0) & (linha < camada.shape[0]) & (coluna >= 0) & (coluna < camada.shape[1])
+    valores = np.zeros(len(linha), np.float32)
+    valores[dentro] = camada[linha[dentro], coluna[dentro]]
+    return valores if np.ndim(lat) else float(valores[0])
+
+# Imagem RGBA (norte em cima) e limites [[lat_sul, lon_oeste], [lat_norte, lon_leste]] para um ImageOverlay
+def imagem_risco(risco, camada, mapa_cores='inferno'):
+    from matplotlib import colormaps
+
+    normalizada = camada / camada.max() if camada.max() > 0 else camada
+    rgba = colormaps[mapa_cores](normalizada)
+    rgba[..., 3] = np.clip(normalizada * 1.5, 0, 0.8)  # células sem risco ficam transparentes
+    linhas, colunas = camada.shape
+    lat_norte, lon_leste = desprojetar(colunas * risco['tamanho'], linhas * risco['tamanho'], risco['origem'])
+    limites = [[risco['origem'][0], risco['origem'][1]], [float(lat_norte), float(lon_leste)]]
+    return (np.flipud(rgba) * 255).astype(np.uint8), limites
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pré-calcula a superfície de risco (KDE ponderado por peso)")
+    parser.add_argument('--destino', default=arquivo_risco, help="arquivo .npz de saída")
+    parser.add_argument('--tamanho-celula', type=float, default=tamanho_celula, help="lado da célula (m)")
+    parser.add_argument('--banda', type=float, default=largura_banda, help="largura de banda do núcleo (m)")
+    args = parser.parse_args()
+
+    gerar_risco(args.destino, args.tamanho_celula, args.banda)
@@ -0,0 +1,190 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from geo import matriz
+
+# Rotas de patrulha fechadas sobre os focos de crime.
+# Cada foco vai para a base (depósito) mais próxima; para cada base, a rota começa e
+# termina nela e é montada em duas etapas, dentro de um tempo limite:
+#   construção: inserção do mais próximo (nearest insertion), vetorizada com NumPy;
+#   busca local: 2-opt e Or-opt (trechos de 1 a 3 paradas, também invertidos),
+#                testando só os k vizinhos mais próximos de cada parada.
+# As distâncias são em metros (haversine de geo.py), numa matriz float32.
+# Com `max_paradas`, só os focos de maior `peso` entram nas rotas.
+
+vizinhos_padrao = 8
+
+def comprimento(rota, d):
+    return float(d[rota, np.roll(rota, -1)].sum(dtype=np.float64))
+
+# Inserção do mais próximo a partir do nó 0 (a base)
+def insercao_mais_proximo(d):
+    n = len(d)
+    rota = [0]
+    distancia_rota = d[0].astype(np.float64)
+    distancia_rota[0] = np.inf
+    for _ in range(n - 1):
+        k = int(np.argmin(distancia_rota))
+        atual = np.array(rota)
+        proximo = np.roll(atual, -1)
+        custo = d[atual, k] + d[k, proximo] - d[atual, proximo]
+        rota.insert(int(np.argmin(custo)) + 1, k)
+        distancia_rota = np.minimum(distancia_rota, d[k])
+        distancia_rota[np.array(rota)] = np.inf
+    return np.array(rota)
+
+def k_vizinhos(d, k):
+    k = min(k, len(d) - 1)
+    if k <= 0:
+        return np.empty((len(d), 0), np.int64)
+    sem_diagonal = d.copy()
+    np.fill_diagonal(sem_diagonal, np.inf)
+    return np.argpartition(sem_diagonal, k - 1, axis=1)[:, :k]
+
+def dois_opt(rota, d, vizinhos, prazo):
+    n = len(rota)
+    pos = np.empty(n, np.int64)
+    pos[rota] = np.arange(n)
+    melhorou = False
+    for i in range(n):
+        if time.perf_counter() > prazo:
+            break
+        a, sa = rota[i], rota[(i + 1) % n]
+        for c in vizinhos[a]:
+            j = pos[c]
+            sc = rota[(j + 1) % n]
+            if c == sa or sc == a:
+                continue
+            if d[a, sa] + d[c, sc] - d[a, c] - d[sa, sc] > 1e-3:
+                # Inverte o trecho entre as duas arestas; a posição 0 (base) nunca se move
+                inicio, fim = sorted((i, j))
+                rota[inicio + 1:fim + 1] = rota[inicio + 1:fim + 1][::-1].copy()
+                pos[rota[inicio + 1:fim + 1]] = np.arange(inicio + 1, fim + 1)
+                melhorou = True
+                break
+    return rota, melhorou
+
+def or_opt(rota, d, vizinhos, prazo, max_trecho=3):
+    n = len(rota)
+    melhorou = False
+    for tamanho in range(1, max_trecho + 1):
+        i = 1
+        while i + tamanho <= n and n > tamanho + 2:
+            if time.perf_counter() > prazo:
+                return rota, melhorou
+            trecho = rota[i:i + tamanho]
+            anterior, seguinte = rota[i - 1], rota[(i + tamanho) % n]
+            primeiro, ultimo = trecho[0], trecho[-1]
+            retirada = d[anterior, primeiro] + d[ultimo, seguinte] - d[anterior, seguinte]
+            pos = np.empty(n, np.int64)
+            pos[rota] = np.arange(n)
+            movido = False
+            for c in vizinhos[primeiro]:
+                sc = rota[(pos[c] + 1) % n]
+                if c in trecho or sc in trecho:
+                    continue
+                direto = d[c, primeiro] + d[ultimo, sc] - d[c, sc]
+                invertido = d[c, ultimo] + d[primeiro, sc] - d[c, sc]
+                if retirada - min(direto, invertido) > 1e-3:
+                    novo_trecho = trecho if direto <= invertido else trecho[::-1]
+                    resto = np.delete(rota, np.arange(i, i + tamanho))
+                    k = pos[c] if pos[c] < i else pos[c] - tamanho
+                    rota = np.concatenate([resto[:k + 1], novo_trecho, resto[k + 1:]])
+                    melhorou = movido = True
+                    break
+            if not movido:
+                i += 1
+    return rota, melhorou
+
+def otimizar_rota(d, tempo_limite=2.0, vizinhos=vizinhos_padrao):
+    prazo = time.perf_counter() + tempo_limite
+    rota = insercao_mais_proximo(d)
+    if len(rota) < 4:
+        return rota
+    proximos = k_vizinhos(d, vizinhos)
+    melhorou = True
+    while melhorou and time.perf_counter() < prazo:
+        rota, melhorou_2opt = dois_opt(rota, d, proximos, prazo)
+        rota, melhorou_or = or_opt(rota, d, proximos, prazo)
+        melhorou = melhorou_2opt or melhorou_or
+    return rota
+
+# `focos`: DataFrame com latitude, longitude e peso; `bases`: lista de (lat, lon).
+# Devolve uma rota por base, com as paradas na ordem (a primeira linha é a base).
+# Sem focos (filtro vazio), cada rota é só a base
+def otimizar_rotas(focos, bases, tempo_limite=5.0, max_paradas=None, vizinhos=vizinhos_padrao):
+    if focos.empty:
+        return [{'base': (float(lat), float(lon)),
+                 'paradas': pd.DataFrame({'ordem': [0], 'latitude': [float(lat)], 'longitude': [float(lon)],
+                                          'peso': [0.0]}),
+                 'distancia_m': 0.0, 'peso': 0.0}
+                for lat, lon in np.asarray(bases, np.float64).reshape(-1, 2)]
+    if max_paradas is not None:
+        focos = focos.nlargest(max_paradas, 'peso')
+    focos = focos.reset_index(drop=True)
+    bases = np.asarray(bases, np.float64).reshape(-1, 2)
+    base_de = np.argmin(matriz(focos['latitude'], focos['longitude'], bases[:, 0], bases[:, 1]), axis=1)
+
+    rotas = []
+    for b, (lat_base, lon_base) in enumerate(bases):
+        grupo = focos[base_de == b]
+        lat = np.concatenate([[lat_base], grupo['latitude'].to_numpy(np.float64)])
+        lon = np.concatenate([[lon_base], grupo['longitude'].to_numpy(np.float64)])
+        d = matriz(lat, lon, lat, lon)
+        rota = otimizar_rota(d, tempo_limite * max(len(grupo), 1) / max(len(focos), 1), vizinhos)
+        paradas = pd.DataFrame({
+            'latitude': lat[rota],
+            'longitude': lon[rota],
+            'peso': np.concatenate([[0.0], grupo['peso'].to_numpy(np.float64)])[rota],
+        })
+        paradas.insert(0, 'ordem', np.arange(len(paradas)))
+        rotas.append({'base': (lat_base, lon_base), 'paradas': paradas, 'distancia_m': comprimento(rota, d),
+                      'peso': float(grupo['peso'].sum())})
+    return rotas
+
+# Pontos aleatórios na caixa da Asa Sul: construção sozinha × construção + busca local
+def benchmark(paradas, tempo_limite, seed=42):
+    rng = np.random.default_rng(seed)
+    lat = np.concatenate([[-15.7942], rng.uniform(-15.845, -15.790, paradas)])
+    lon = np.concatenate([[-47.8825], rng.uniform(-47.925, -47.875, paradas)])
+
+    inicio = time.perf_counter()
+    d = matriz(lat, lon, lat, lon)
+    print(f"matriz {len(d)}×{len(d)}: {time.perf_counter() - inicio:.2f}s")
+
+    inicio = time.perf_counter()
+    construida = insercao_mais_proximo(d)
+    print(f"inserção do mais próximo: {comprimento(construida, d) / 1000:.1f} km em {time.perf_counter() - inicio:.2f}s")
+
+    inicio = time.perf_counter()
+    rota = otimizar_rota(d, tempo_limite)
+    print(f"+ 2-opt/Or-opt (limite {tempo_limite:.0f}s): {comprimento(rota, d) / 1000:.1f} km "
+          f"em {time.perf_counter() - inicio:.2f}s")
+
+# Filtro sem focos (ex.: um tipo raro numa hora sem ocorrências): o painel recebe só as bases
+def verificar_sem_focos():
+    from hotspots import focos_vazios, hotspots_pontos
+
+    bases = [(-15.7942, -47.8825), (-15.82, -47.90)]
+    for focos in (focos_vazios(), hotspots_pontos([], [])):
+        rotas = otimizar_rotas(focos, bases, tempo_limite=0.1, max_paradas=50)
+        assert len(rotas) == len(bases)
+        assert all(len(rota['paradas']) == 1 and rota['distancia_m'] == 0.0 for rota in rotas)
+    print("✅ sem focos: uma rota vazia por base")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark do otimizador de rotas de patrulha")
+    parser.add_argument('--paradas', type=int, nargs='+', default=[100, 1000, 5000], help="quantidades de paradas")
+    parser.add_argument('--tempo', type=float, default=10.0, help="tempo limite da otimização (s)")
+    parser.add_argument('--verificar', action='store_true', help="só confere o caso sem focos e sai")
+    args = parser.parse_args()
+
+    if args.verificar:
+        verificar_sem_focos()
+    else:
+        for paradas in args.paradas:
+            print(f"— {paradas} paradas")
+            benchmark(paradas, args.tempo)
@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import numpy as np
+
+# Memória do dashboard com N sessões abertas ao mesmo tempo, cada app num processo Python novo.
+# As sessões são AppTest do Streamlit no mesmo processo (como no servidor: os caches são do processo),
+# alternando entre algumas horas na barra lateral, e ficam todas vivas até o fim da medida.
+# As primeiras sessões (uma por hora) aquecem os caches de dados e de gráficos; depois delas o
+# tracemalloc começa a contar, e cada sessão nova tem a sua alocação medida (memória rastreada
+# depois menos antes, com gc). O custo por sessão é a mediana dessas diferenças, comparada com o
+# tamanho da tabela compartilhada: uma cópia da tabela por sessão aparece inteira no tracemalloc
+# (os arrays do numpy são rastreados), enquanto a RSS varia com o alocador e só é mostrada.
+# Com `--registros`, os dados são um dataset gerado desse tamanho (desempenho.preparar_dataset),
+# para a tabela ser grande perto do resto do processo.
+# No fim, tenta escrever no lugar (loc, iloc, categórica) na tabela que as sessões compartilham:
+# cada escrita tem de falhar, senão uma sessão alteraria os dados de todas (ver compartilhado.py).
+# Sai com código 1 se alguma sessão der exceção, se alguma escrita passar ou se o custo por sessão
+# passar de `--limite` × tabela.
+# Para comparar com a versão antiga do app:
+#   git show <commit>:app.py > app_antigo.py; python sessoes_simuladas.py --apps app.py app_antigo.py
+
+horas_padrao = ["Geral", 22, 3]
+
+def medir_sessoes(arquivo, sessoes, horas, paralelas, timeout, dataset=None):
+    codigo = f"""
+import gc, json, resource, tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.testing.v1 import AppTest
+import dados
+from metricas import memoria_rss
+
+if {dataset!r} is not None:
+    dados.arquivo_csv, dados.arquivo_parquet = {dataset!r}
+horas = {horas!r}
+
+def sessao(i):
+    at = AppTest.from_file({arquivo!r}, default_timeout={timeout})
+    at.run()
+    if horas[i % len(horas)] != "Geral":
+        at.sidebar.selectbox[0].set_value(horas[i % len(horas)]).run()
+    return at
+
+abertas = [sessao(i) for i in range(len(horas))]
+gc.collect()
+tracemalloc.start()
+rss = [memoria_rss()]
+rastreada = [tracemalloc.get_traced_memory()[0]]
+with ThreadPoolExecutor(max_workers={paralelas}) as executor:
+    for at in executor.map(sessao, range(len(horas), {sessoes})):
+        abertas.append(at)
+        gc.collect()
+        rss.append(memoria_rss())
+        rastreada.append(tracemalloc.get_traced_memory()[0])
+tracemalloc.stop()
+pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+excecoes = sum(len(at.exception) for at in abertas)
+
+from painel_dados import estado_dados
+compartilhada = estado_dados(dados.versao_dados()).df
+tabela = int(compartilhada.memory_usage(deep=True).sum())
+
+def escrever_loc():
+    compartilhada.loc[compartilhada.index[0], 'idade'] = 0
+
+def escrever_iloc():
+    compartilhada.iloc[0, compartilhada.columns.get_loc('latitude')] = 0
+
+def escrever_categoria():
+    compartilhada.loc[compartilhada.index[0], 'tipo_crime'] = compartilhada['tipo_crime'].iloc[-1]
+
+escritas = []
+for escrever in (escrever_loc, escrever_iloc, escrever_categoria):
+    try:
+        escrever()
+        escritas.append(escrever.__name__)
+    except (ValueError, TypeError):
+        pass
+print(json.dumps({{'rss': rss, 'rastreada': rastreada, 'pico': pico, 'tabela': tabela,
+                  'excecoes': excecoes, 'escritas': escritas}}))
+"""
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+def verificar(apps, sessoes, horas, paralelas, timeout, limite, registros=None):
+    dataset = None
+    if registros:
+        from desempenho import preparar_dataset
+        dataset = tuple(os.path.abspath(caminho) for caminho in preparar_dataset(registros))
+    ok = True
+    for arquivo in apps:
+        medida = medir_sessoes(arquivo, sessoes, horas, paralelas, timeout, dataset)
+        rss, tabela = medida['rss'], medida['tabela']
+        por_sessao = statistics.median(np.diff(medida['rastreada']))
+        rss_por_sessao = statistics.median(np.diff(rss))
+        print(f"{arquivo}: tabela {tabela / 2 ** 20:.1f} MB | RSS com {len(horas)} sessões {rss[0] / 2 ** 20:.1f} MB, "
+              f"com {len(horas) + len(rss) - 1} {rss[-1] / 2 ** 20:.1f} MB (pico {medida['pico'] / 2 ** 20:.1f} MB) | "
+              f"por sessão (mediana de {len(rss) - 1}) {por_sessao / 2 ** 20:.2f} MB alocados "
+              f"({por_sessao / tabela:.1%} da tabela), RSS {rss_por_sessao / 2 ** 20:.2f} MB"
+              + (f" | {medida['excecoes']} exceções" if medida['excecoes'] else "")
+              + (f" | escritas na tabela compartilhada: {', '.join(medida['escritas'])}" if medida['escritas'] else ""))
+        if medida['excecoes'] or medida['escritas'] or por_sessao > limite * tabela:
+            ok = False
+    return ok
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Memória do dashboard com várias sessões simultâneas")
+    parser.add_argument('--apps', nargs='*', default=['app.py'], help="scripts Streamlit a medir")
+    parser.add_argument('--sessoes', type=int, default=20, help="sessões abertas ao mesmo tempo")
+    parser.add_argument('--horas', nargs='+', default=horas_padrao,
+                        type=lambda hora: hora if hora == "Geral" else int(hora),
+                        help="horas escolhidas pelas sessões, em rodízio (\"Geral\" ou 0–23)")
+    parser.add_argument('--paralelas', type=int, default=1, help="sessões executando ao mesmo tempo (threads)")
+    parser.add_argument('--timeout', type=float, default=600, help="tempo máximo de cada execução (s)")
+    parser.add_argument('--limite', type=float, default=0.1,
+                        help="custo máximo por sessão, em fração do tamanho da tabela")
+    parser.add_argument('--registros', type=int, default=None,
+                        help="usa um dataset gerado com esse número de linhas (padrão: os dados atuais)")
+    args = parser.parse_args()
+
+    sys.exit(0 if verificar(args.apps, args.sessoes, args.horas, args.paralelas, args.timeout, args.limite,
+                            args.registros) else 1)
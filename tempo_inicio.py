@@ -0,0 +1,73 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Tempo de início do dashboard, cada medida num processo Python novo (sem nada em sys.modules):
+#   importações: o que o app importava no topo antes da divisão em módulos × o que importa agora,
+#                isto é, o que roda antes do primeiro elemento aparecer na tela;
+#   reruns:      primeira execução do script (com a carga dos dados) e reruns seguintes, pelo
+#                AppTest do Streamlit. Para comparar com a versão antiga do app:
+#                git show <commit>:app.py > app_antigo.py; python tempo_inicio.py --apps app.py app_antigo.py
+
+importacoes_antes = [
+    'streamlit', 'pandas', 'folium', 'folium.plugins', 'numpy', 'matplotlib.pyplot', 'seaborn',
+    'streamlit_folium', 'sklearn.preprocessing', 'dados', 'cubo', 'ingestao', 'correlacao', 'grade',
+    'hotspots', 'focos_por_hora', 'rotas', 'geo', 'risco', 'modelos', 'cache_graficos',
+]
+importacoes_agora = [
+    'streamlit', 'pandas', 'painel_eda', 'painel_mapa', 'painel_modelo', 'painel_preprocessamento',
+    'painel_relatorio', 'compartilhado', 'dados', 'painel_dados', 'perfil', 'metricas',
+]
+pesados = ['folium', 'sklearn', 'xgboost', 'matplotlib', 'seaborn', 'pyarrow', 'scipy']
+
+def _rodar(codigo):
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+def tempo_importacao(modulos):
+    codigo = "import json, sys, time\ninicio = time.perf_counter()\n"
+    codigo += "".join(f"import {modulo}\n" for modulo in modulos)
+    codigo += (f"print(json.dumps({{'segundos': time.perf_counter() - inicio, "
+               f"'pesados': sorted(p for p in {pesados!r} if p in sys.modules)}}))")
+    return _rodar(codigo)
+
+def tempo_reruns(arquivo, reruns, timeout):
+    codigo = f"""
+import json, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({arquivo!r}, default_timeout={timeout})
+inicio = time.perf_counter()
+at.run()
+primeira = time.perf_counter() - inicio
+tempos = []
+for _ in range({reruns}):
+    inicio = time.perf_counter()
+    at.run()
+    tempos.append(time.perf_counter() - inicio)
+print(json.dumps({{'primeira': primeira, 'reruns': tempos, 'excecoes': len(at.exception)}}))
+"""
+    return _rodar(codigo)
+
+def benchmark(repeticoes, apps, reruns, timeout):
+    for nome, modulos in (('antes', importacoes_antes), ('agora', importacoes_agora)):
+        medidas = [tempo_importacao(modulos) for _ in range(repeticoes)]
+        mediana = statistics.median(m['segundos'] for m in medidas)
+        print(f"importações ({nome}): {mediana * 1000:.0f} ms (mediana de {repeticoes}), "
+              f"pesados carregados: {', '.join(medidas[0]['pesados']) or 'nenhum'}")
+    for arquivo in apps:
+        medida = tempo_reruns(arquivo, reruns, timeout)
+        print(f"{arquivo}: primeira execução {medida['primeira']:.2f}s, "
+              f"rerun {statistics.median(medida['reruns']) * 1000:.0f} ms (mediana de {reruns})"
+              + (f", {medida['excecoes']} exceções" if medida['excecoes'] else ""))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tempo de início e de rerun do dashboard")
+    parser.add_argument('--repeticoes', type=int, default=5, help="processos novos por medida de importação")
+    parser.add_argument('--apps', nargs='*', default=['app.py'], help="scripts Streamlit para medir os reruns")
+    parser.add_argument('--reruns', type=int, default=5, help="reruns depois da primeira execução")
+    parser.add_argument('--timeout', type=float, default=600, help="tempo máximo de cada execução (s)")
+    args = parser.parse_args()
+
+    benchmark(args.repeticoes, args.apps, args.reruns, args.timeout)
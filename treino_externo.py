@@ -0,0 +1,182 @@
+import argparse
+import glob
+import os
+import resource
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import xgboost as xgb
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+
+from dados import categorias_fixas
+from modelos import (ModeloBooster, alvos, carregar_hiperparametros, categorical_features, features,
+                     numeric_features, padronizar)
+
+# Treino do XGBoost fora da memória, sobre dados particionados (pastas de geracao_paralela.py,
+# CSV ou Parquet). Os lotes são lidos um de cada vez:
+#   1ª passada: StandardScaler.partial_fit nas colunas numéricas; média e escala vão para o
+#              ColumnTransformer como FunctionTransformer (as categorias do OneHotEncoder são as
+#              listas fixas de dados.py, então não precisam de passada);
+#   treino:    um xgboost.DataIter entrega lote a lote X já transformado para um DMatrix em
+#              memória externa (cache em disco), então a memória de pico depende do tamanho do lote;
+#   avaliação: mais uma passada acumulando os erros das linhas de teste.
+# Cada linha vai para teste com probabilidade `fracao_teste`, sorteada por lote com semente fixa.
+
+def arquivos_da_fonte(fonte):
+    if os.path.isdir(fonte):
+        return sorted(glob.glob(os.path.join(fonte, '**', '*.parquet'), recursive=True) +
+                      glob.glob(os.path.join(fonte, '**', '*.csv'), recursive=True))
+    return [fonte]
+
+def ler_lotes(fonte, tamanho_lote):
+    colunas = features + alvos
+    for arquivo in arquivos_da_fonte(fonte):
+        if arquivo.endswith('.parquet'):
+            for lote in pq.ParquetFile(arquivo).iter_batches(batch_size=tamanho_lote, columns=colunas):
+                yield lote.to_pandas()
+        else:
+            for lote in pd.read_csv(arquivo, usecols=colunas, chunksize=tamanho_lote):
+                # "HH:MM" → hora inteira, como em dados.py
+                lote['hora'] = pd.to_numeric(lote['hora'].astype('string').str.slice(0, 2), errors='coerce')
+                yield lote
+
+# Lotes com a marcação de teste (mesma a cada passada)
+def lotes_marcados(fonte, tamanho_lote, seed=42, fracao_teste=0.2):
+    for i, lote in enumerate(ler_lotes(fonte, tamanho_lote)):
+        lote = lote.dropna(subset=alvos)
+        for coluna in categorical_features:
+            lote[coluna] = lote[coluna].astype(object)
+        teste = np.random.default_rng([seed, i]).random(len(lote)) < fracao_teste
+        yield lote, teste
+
+def ajustar_preprocessor(fonte, tamanho_lote):
+    escalador = StandardScaler()
+    primeiro = None
+    for lote in ler_lotes(fonte, tamanho_lote):
+        escalador.partial_fit(lote[numeric_features])
+        if primeiro is None:
+            primeiro = lote
+    # As estatísticas da passada completa entram como parâmetros de um FunctionTransformer (sem estado
+    # para ajustar), então o fit do ColumnTransformer no primeiro lote não as recalcula
+    numericas = FunctionTransformer(padronizar, kw_args={'media': escalador.mean_, 'escala': escalador.scale_},
+                                    feature_names_out='one-to-one')
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('num', numericas, numeric_features),
+            ('cat', OneHotEncoder(categories=[categorias_fixas[c] for c in categorical_features],
+                                  handle_unknown='ignore'), categorical_features)
+        ])
+    preprocessor.fit(primeiro[features].astype({c: object for c in categorical_features}))
+    return preprocessor
+
+class IteradorLotes(xgb.DataIter):
+    def __init__(self, fonte, preprocessor, tamanho_lote, seed, cache):
+        self.fonte = fonte
+        self.preprocessor = preprocessor
+        self.tamanho_lote = tamanho_lote
+        self.seed = seed
+        self._lotes = None
+        super().__init__(cache_prefix=cache)
+
+    def reset(self):
+        self._lotes = None
+
+    def next(self, input_data):
+        if self._lotes is None:
+            self._lotes = lotes_marcados(self.fonte, self.tamanho_lote, self.seed)
+        for lote, teste in self._lotes:
+            treino = lote[~teste]
+            if len(treino):
+                input_data(data=np.asarray(self.preprocessor.transform(treino[features]), np.float32),
+                           label=treino[alvos].to_numpy(np.float32))
+                return 1
+        return 0
+
+# MSE, MAE e R² (média das duas saídas, como no sklearn) acumulados lote a lote
+def avaliar(booster, preprocessor, fonte, tamanho_lote, seed):
+    n = 0
+    soma_erro2 = np.zeros(len(alvos))
+    soma_erro = np.zeros(len(alvos))
+    soma_y = np.zeros(len(alvos))
+    soma_y2 = np.zeros(len(alvos))
+    for lote, teste in lotes_marcados(fonte, tamanho_lote, seed):
+        lote = lote[teste]
+        if not len(lote):
+            continue
+        X = np.asarray(preprocessor.transform(lote[features]), np.float32)
+        y = lote[alvos].to_numpy(np.float64)
+        erro = booster.predict(xgb.DMatrix(X)).reshape(y.shape) - y
+        n += len(y)
+        soma_erro2 += (erro ** 2).sum(axis=0)
+        soma_erro += np.abs(erro).sum(axis=0)
+        soma_y += y.sum(axis=0)
+        soma_y2 += (y ** 2).sum(axis=0)
+    variancia_total = soma_y2 - soma_y ** 2 / n
+    return {
+        'mse': float(soma_erro2.sum() / (n * len(alvos))),
+        'mae': float(soma_erro.sum() / (n * len(alvos))),
+        'r2': float(np.mean(1 - soma_erro2 / variancia_total)),
+        'linhas_teste': n
+    }
+
+def treinar_externo(fonte, tamanho_lote=500_000, seed=42, params=None, cache=None):
+    params = carregar_hiperparametros()["XGBoost"] if params is None else params
+    inicio = time.perf_counter()
+    preprocessor = ajustar_preprocessor(fonte, tamanho_lote)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        iterador = IteradorLotes(fonte, preprocessor, tamanho_lote, seed, cache or os.path.join(pasta, 'cache'))
+        dtrain = xgb.DMatrix(iterador)
+        booster = xgb.train({
+            'objective': 'reg:squarederror',
+            'tree_method': 'hist',
+            'max_depth': params['max_depth'],
+            'eta': params['learning_rate'],
+            'subsample': params['subsample'],
+            'colsample_bytree': params['colsample_bytree'],
+            'seed': params['random_state'],
+        }, dtrain, num_boost_round=params['n_estimators'])
+        del dtrain
+
+    metricas = avaliar(booster, preprocessor, fonte, tamanho_lote, seed)
+    metricas['segundos'] = time.perf_counter() - inicio
+    metricas['memoria_pico_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    # Mesmo formato das entradas do registro de modelos.py: previsao.py --registro carrega o arquivo
+    return {'modelo': "XGBoost", 'parametros': params, 'preprocessor': preprocessor,
+            'model': ModeloBooster(booster), 'metricas': metricas}
+
+# Mesmo dataset pelo caminho em memória (modelos.treinar), para comparar as métricas
+def comparar_em_memoria(fonte):
+    from dados import carregar_csv, carregar_parquet, compactar
+    from modelos import treinar
+
+    arquivo = arquivos_da_fonte(fonte)
+    if len(arquivo) != 1:
+        raise ValueError("a comparação em memória usa um único arquivo (ex.: o CSV de 30k linhas)")
+    carregar = carregar_parquet if arquivo[0].endswith('.parquet') else carregar_csv
+    df = compactar(carregar(arquivo[0], colunas=features + alvos, categorias=True).dropna(subset=alvos))
+    inicio = time.perf_counter()
+    metricas = treinar(df, "XGBoost", carregar_hiperparametros()["XGBoost"])['metricas']
+    metricas['segundos'] = time.perf_counter() - inicio
+    return metricas
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Treino do XGBoost fora da memória sobre dados particionados")
+    parser.add_argument('--fonte', default='crime_segunda_area', help="arquivo ou pasta com partições (CSV/Parquet)")
+    parser.add_argument('--tamanho-lote', type=int, default=500_000, help="linhas por lote")
+    parser.add_argument('--seed', type=int, default=42, help="semente da separação treino/teste")
+    parser.add_argument('--destino', default='modelo_externo.joblib', help="arquivo com pré-processamento e modelo")
+    parser.add_argument('--comparar', action='store_true', help="treina também em memória e compara as métricas")
+    args = parser.parse_args()
+
+    resultado = treinar_externo(args.fonte, args.tamanho_lote, args.seed)
+    joblib.dump(resultado, args.destino)
+    print(f"Fora da memória: {resultado['metricas']}")
+    if args.comparar:
+        print(f"Em memória:      {comparar_em_memoria(args.fonte)}")
+    print(f"✅ Modelo gravado em '{args.destino}'")